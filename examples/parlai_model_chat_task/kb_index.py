@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Building and loading the persisted FAISS index over the knowledge base.
+
+The index and its document store are written next to `docs.csv`, named by a hash
+of the csv contents and the embedding model, so a changed knowledge base or model
+never loads a stale index. Where the installed FAISS supports it, loading maps the
+flat index's vectors from the file (`IO_FLAG_MMAP_IFC`), so runner processes on the
+same machine share them through the page cache instead of each holding their own copy.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import Optional, Tuple
+
+import faiss
+import pandas as pd
+from langchain_community.document_loaders import DataFrameLoader
+from langchain_community.embeddings import HuggingFaceBgeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+MODEL_NAME = "BAAI/bge-small-en"
+MODEL_KWARGS = {"device": "cpu"}
+ENCODE_KWARGS = {"normalize_embeddings": True}
+
+INDEX_DIR_NAME = "docs_index"
+INDEX_NAME_LENGTH = 16
+# Files written by FAISS.save_local for an index named by get_kb_index_location
+INDEX_FILE_PATTERN = re.compile(rf"[0-9a-f]{{{INDEX_NAME_LENGTH}}}\.(faiss|pkl)")
+
+
+def get_kb_embeddings() -> HuggingFaceBgeEmbeddings:
+    """Return the embedding model used for both the documents and the queries"""
+    return HuggingFaceBgeEmbeddings(
+        model_name=MODEL_NAME, model_kwargs=MODEL_KWARGS, encode_kwargs=ENCODE_KWARGS
+    )
+
+
+def get_kb_index_location(kb_path: Path) -> Tuple[Path, str]:
+    """Return the directory and name of the index for the current knowledge base"""
+    content_hash = hashlib.sha256()
+    with open(kb_path, "rb") as kb_file:
+        for chunk in iter(lambda: kb_file.read(1 << 20), b""):
+            content_hash.update(chunk)
+    content_hash.update(json.dumps([MODEL_NAME, ENCODE_KWARGS], sort_keys=True).encode())
+    return kb_path.parent / INDEX_DIR_NAME, content_hash.hexdigest()[:INDEX_NAME_LENGTH]
+
+
+def build_kb_index(kb_path: Path, embeddings: Embeddings) -> FAISS:
+    """Embed every document in the knowledge base and persist the resulting index"""
+    index_dir, index_name = get_kb_index_location(kb_path)
+    df = pd.read_csv(kb_path).fillna("")
+    docs = DataFrameLoader(df, page_content_column="text").load()
+    logging.info(f"Embedding {len(docs)} documents from {kb_path}")
+    db = FAISS.from_documents(docs, embeddings)
+
+    db.save_local(str(index_dir), index_name=index_name)
+    # Indexes of previous versions of the knowledge base can't be loaded anymore. Only
+    # older ones are removed, as another runner may be saving a newer one meanwhile
+    saved_time = (index_dir / f"{index_name}.faiss").stat().st_mtime
+    for old_file in index_dir.iterdir():
+        if not INDEX_FILE_PATTERN.fullmatch(old_file.name) or old_file.stem == index_name:
+            continue
+        try:
+            if old_file.stat().st_mtime < saved_time:
+                old_file.unlink()
+        except FileNotFoundError:
+            pass  # Already removed by another runner
+    logging.info(f"Saved index {index_name} to {index_dir}")
+    return db
+
+
+def _is_file_mapped(path: Path) -> Optional[bool]:
+    """Return whether the file is memory-mapped into this process, or None if that can't be told"""
+    try:
+        with open("/proc/self/maps") as maps_file:
+            real_path = os.path.realpath(path)
+            return any(line.rstrip("\n").endswith(real_path) for line in maps_file)
+    except OSError:
+        return None
+
+
+def load_kb_index(kb_path: Path, embeddings: Embeddings) -> FAISS:
+    """Load the persisted index for the knowledge base, memory-mapping its vectors if possible"""
+    index_dir, index_name = get_kb_index_location(kb_path)
+    index_path = index_dir / f"{index_name}.faiss"
+    if not index_path.exists():
+        raise FileNotFoundError(
+            f"No index for the current {kb_path} in {index_dir}, run "
+            f"`python -m examples.parlai_model_chat_task.prepare_kb_data --index-only`"
+        )
+    # IO_FLAG_MMAP only maps the inverted lists of IVF indexes, the flat index
+    # built by `FAISS.from_documents` needs the flat codes flag of newer versions
+    mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+    index = None
+    if mmap_flag is not None:
+        try:
+            index = faiss.read_index(str(index_path), mmap_flag | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            pass
+    if index is None:
+        index = faiss.read_index(str(index_path))
+    if mmap_flag is None or _is_file_mapped(index_path) is False:
+        logging.info(f"Index {index_path} isn't memory-mapped, it's read into memory instead")
+    with open(index_dir / f"{index_name}.pkl", "rb") as docstore_file:
+        docstore, index_to_docstore_id = pickle.load(docstore_file)
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+
+def load_or_build_kb_index(kb_path: Path, embeddings: Embeddings) -> FAISS:
+    """Load the persisted index, building it first if the knowledge base wasn't indexed yet"""
+    try:
+        return load_kb_index(kb_path, embeddings)
+    except FileNotFoundError as e:
+        logging.warning(f"{e}. Building it now, this can take a few minutes.")
+        return build_kb_index(kb_path, embeddings)
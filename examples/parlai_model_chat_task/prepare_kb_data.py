@@ -1,3 +1,4 @@
+import argparse
 import sys
 import logging
 import os
@@ -14,6 +15,8 @@ from unstructured.documents.html import HTMLListItem, HTMLNarrativeText, HTMLTit
 from unstructured.partition.html import partition_html
 from unstructured.partition.text_type import sentence_count
 
+from examples.parlai_model_chat_task.kb_index import build_kb_index, get_kb_embeddings
+
 load_dotenv()
 
 # Configure logging
@@ -286,8 +289,25 @@ def save_docs_as_json(df: pd.DataFrame, path: Path) -> None:
 
     logging.info(f"Saved {len(df)} documents to {path}")
 
+def index_docs(kb_path: Path) -> None:
+    # embed the documents once, so task runners can load the persisted index
+    build_kb_index(kb_path, get_kb_embeddings())
+
+
 # Main function
 def main():
+    parser = argparse.ArgumentParser(description="Scrape and index the knowledge base")
+    parser.add_argument(
+        "--index-only",
+        action="store_true",
+        help="Skip scraping and only (re)build the index for the existing docs.csv",
+    )
+    args = parser.parse_args()
+
+    KB_PATH = DATA_DIR / "kb" / "docs.csv"
+    if args.index_only:
+        index_docs(KB_PATH)
+        return 0
 
     SAVE_PATH = DATA_DIR / "kb" / "docs"
 
@@ -305,7 +325,9 @@ def main():
         save_docs_as_json(docs_df[docs_df["issue"] == issue], SAVE_PATH / issue)
         save_docs_as_md(docs_df[docs_df["issue"] == issue], SAVE_PATH / issue)
 
-    docs_df.to_csv(DATA_DIR / "kb" / "docs.csv", index=False)
+    docs_df.to_csv(KB_PATH, index=False)
+
+    index_docs(KB_PATH)
 
     return 0
 
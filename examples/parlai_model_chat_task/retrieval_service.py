@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Knowledge base retrieval shared by every conversation in the process.
+
+Query embeddings are cached by normalized dialogue history, and queries that miss
+the cache are put on a queue that a single thread drains in batches, so concurrent
+conversations share one forward pass of the embedding model.
+"""
+
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+from mephisto.operations.worker_pool import EXTERNAL_FUNCTION_LATENCY
+from mephisto.utils.logger_core import get_logger
+
+logger = get_logger(name=__name__)
+
+EXTERNAL_FUNCTION_LATENCY.labels(function="retrieve_documents")
+EXTERNAL_FUNCTION_LATENCY.labels(function="embed_query_batch")
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_MAX_BATCH_SIZE = 32
+# How long the batching thread waits for more queries after the first one arrives
+DEFAULT_BATCH_WAIT_SECONDS = 0.01
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace, so histories that only differ in spacing share a cache entry"""
+    return " ".join(query.split())
+
+
+class RetrievalService:
+    """
+    Retrieves the knowledge base documents closest to a dialogue history.
+
+    The index is only loaded on the first retrieval. Call shutdown to stop the
+    batching thread.
+    """
+
+    def __init__(
+        self,
+        get_db: Callable[[], FAISS],
+        embeddings: Embeddings,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_wait_seconds: float = DEFAULT_BATCH_WAIT_SECONDS,
+    ):
+        self.get_db = get_db
+        self.embeddings = embeddings
+        self.cache_size = cache_size
+        self.max_batch_size = max_batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._batch_thread = threading.Thread(
+            target=self._run_batches, name="kb-query-embedder", daemon=True
+        )
+        self._batch_thread.start()
+
+    def retrieve(
+        self, query: str, top_k: int = 0, score_cutoff: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return up to top_k documents (all if 0) for the query, closest first,
+        leaving out any whose distance is above the score_cutoff
+        """
+        with EXTERNAL_FUNCTION_LATENCY.labels(function="retrieve_documents").time():
+            embedding = self.embed_query(query)
+            db = self.get_db()
+            k = db.index.ntotal if top_k <= 0 else min(top_k, db.index.ntotal)
+            search_kwargs = {} if score_cutoff is None else {"score_threshold": score_cutoff}
+            docs_and_scores = db.similarity_search_with_score_by_vector(
+                embedding, k=k, **search_kwargs
+            )
+        return [
+            {
+                "id": i,
+                "text": d.page_content,
+                "score": float(score),
+                **d.metadata,
+            }
+            for i, (d, score) in enumerate(docs_and_scores)
+        ]
+
+    def embed_query(self, query: str) -> List[float]:
+        """Return the embedding of the query, from the cache or the next batch"""
+        key = normalize_query(query)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        future: Future = Future()
+        self._queue.put((key, future))
+        return future.result()
+
+    def shutdown(self) -> None:
+        """Stop the batching thread once it finishes the queued queries"""
+        self._queue.put(None)
+        self._batch_thread.join()
+
+    def _next_batch(self) -> Optional[List[Tuple[str, Future]]]:
+        """Block for the next query, then gather any more that arrive shortly after"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get(timeout=self.batch_wait_seconds)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # Finish this batch before stopping
+                break
+            batch.append(item)
+        return batch
+
+    def _run_batches(self) -> None:
+        """Embed queued queries in batches until shut down"""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            queries = list(OrderedDict.fromkeys(key for key, _ in batch))
+            try:
+                with EXTERNAL_FUNCTION_LATENCY.labels(function="embed_query_batch").time():
+                    embeddings = self._embed_queries(queries)
+            except Exception as e:
+                logger.exception(f"Failed to embed a batch of {len(queries)} queries")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            query_embeddings = dict(zip(queries, embeddings))
+            with self._cache_lock:
+                for key, embedding in query_embeddings.items():
+                    self._cache[key] = embedding
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            for key, future in batch:
+                future.set_result(query_embeddings[key])
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed all queries in one forward pass of the model"""
+        # BGE models expect queries to carry their retrieval instruction, which
+        # embed_query adds, but embed_documents (the batched call) doesn't
+        query_instruction = getattr(self.embeddings, "query_instruction", "")
+        return self.embeddings.embed_documents([query_instruction + q for q in queries])
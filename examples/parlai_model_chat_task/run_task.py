@@ -15,6 +15,7 @@ from mephisto.abstractions.blueprints.parlai_chat.parlai_chat_blueprint import (
 
 from omegaconf import DictConfig
 from dataclasses import dataclass, field
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -43,6 +44,14 @@ class ParlAITaskConfig(build_default_task_config(DEFAULT_TASK_CONFIG)):
             "help": "Maximum response time before kicking " "a worker out, default 300 seconds"
         },
     )
+    kb_top_k: int = field(
+        default=0,
+        metadata={"help": "Number of knowledge base documents to retrieve per turn (0 is all)"},
+    )
+    kb_score_cutoff: Optional[float] = field(
+        default=None,
+        metadata={"help": "Leave out retrieved documents with a distance above this score"},
+    )
 
 
 @task_script(config=ParlAITaskConfig)
@@ -54,6 +63,8 @@ def main(operator: "Operator", cfg: DictConfig) -> None:
         "model_name": cfg.model_name,
         "model_params": cfg.model_params,
         "send_task_data": True,
+        "kb_top_k": cfg.kb_top_k,
+        "kb_score_cutoff": cfg.kb_score_cutoff,
     }
 
     custom_bundle_path = cfg.mephisto.blueprint.get("custom_source_bundle", None)
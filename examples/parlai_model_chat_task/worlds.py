@@ -5,37 +5,50 @@
 # LICENSE file in the root directory of this source tree.
 
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import pandas as pd
 from joblib import Parallel, delayed
-from langchain_community.document_loaders import DataFrameLoader
-from langchain_community.embeddings import FakeEmbeddings, HuggingFaceBgeEmbeddings
 from langchain_community.vectorstores import FAISS
 from parlai.core.agents import create_agent_from_shared
 from parlai.core.worlds import validate
 from parlai.crowdsourcing.utils.worlds import CrowdOnboardWorld, CrowdTaskWorld
 
 from examples.parlai_model_chat_task.bot_agent import TurkLikeAgent
+from examples.parlai_model_chat_task.kb_index import get_kb_embeddings, load_or_build_kb_index
+from examples.parlai_model_chat_task.retrieval_service import RetrievalService
 from dotenv import load_dotenv, find_dotenv
 
 load_dotenv()
 
 DATA_DIR = find_dotenv().replace(".env", "") / Path(os.getenv("DATA_DIR", "data"))
 KB_PATH = DATA_DIR / "kb" / "docs.csv"
-df = pd.read_csv(KB_PATH).fillna("")
-KB_DOCS = DataFrameLoader(df, page_content_column="text").load()
-KB_DOCS_NUM = len(KB_DOCS)
 
-MODEL_NAME = "BAAI/bge-small-en"
-MODEL_KWARGS = {"device": "cpu"}
-ENCODE_KWARGS = {"normalize_embeddings": True}
-embeddings = HuggingFaceBgeEmbeddings(
-    model_name=MODEL_NAME, model_kwargs=MODEL_KWARGS, encode_kwargs=ENCODE_KWARGS
-)
+# The knowledge base index is built by prepare_kb_data.py, and only
+# loaded once the first bot turn needs it
+_kb_db: Optional[FAISS] = None
+_kb_db_lock = threading.Lock()
+_retrieval_service: Optional[RetrievalService] = None
+_retrieval_service_lock = threading.Lock()
 
-db = FAISS.from_documents(KB_DOCS, embeddings)
+
+def get_kb_db() -> FAISS:
+    """Return the knowledge base index, loading it on first use"""
+    global _kb_db
+    with _kb_db_lock:
+        if _kb_db is None:
+            _kb_db = load_or_build_kb_index(KB_PATH, get_retrieval_service().embeddings)
+        return _kb_db
+
+
+def get_retrieval_service() -> RetrievalService:
+    """Return the retrieval service shared by all conversations in this process"""
+    global _retrieval_service
+    with _retrieval_service_lock:
+        if _retrieval_service is None:
+            _retrieval_service = RetrievalService(get_kb_db, get_kb_embeddings())
+        return _retrieval_service
 
 
 class MultiAgentDialogOnboardWorld(CrowdOnboardWorld):
@@ -74,6 +87,8 @@ class MultiAgentDialogWorld(CrowdTaskWorld):
         self.send_task_data = opt.get("send_task_data", False)
         self.opt = opt
         self.retrived_documents = []
+        self.kb_top_k = opt.get("kb_top_k", 0)
+        self.kb_score_cutoff = opt.get("kb_score_cutoff", None)
 
     def parley(self):
         """
@@ -162,15 +177,9 @@ class MultiAgentDialogWorld(CrowdTaskWorld):
         )
 
     def retrive_documents(self, query):
-        return [
-            {
-                "id": i,
-                "text": d.page_content,
-                "score": float(score),
-                **d.metadata,
-            }
-            for i, (d, score) in enumerate(db.similarity_search_with_score(query, k=KB_DOCS_NUM))
-        ]
+        return get_retrieval_service().retrieve(
+            query, top_k=self.kb_top_k, score_cutoff=self.kb_score_cutoff
+        )
 
 
 def get_bot_worker(opt: Dict[str, Any]) -> TurkLikeAgent:
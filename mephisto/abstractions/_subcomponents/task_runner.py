@@ -8,11 +8,13 @@ from abc import ABC, abstractmethod
 import asyncio
 from mephisto.utils.qualifications import find_or_create_qualification
 from typing import (
+    Any,
     List,
     Dict,
     Callable,
     Tuple,
     Awaitable,
+    Union,
     TYPE_CHECKING,
 )
 
@@ -410,6 +412,18 @@ class TaskRunner(ABC):
         """
         raise NotImplementedError()
 
+    def handle_live_update(
+        self, agent: Union["Agent", "OnboardingAgent"], live_update: Dict[str, Any]
+    ) -> bool:
+        """
+        Handle a live update from the given agent's frontend as soon as it
+        arrives, on the event loop of the ClientIOHandler. Returns whether the
+        update was handled, otherwise it's queued for the agent's get_live_update.
+
+        Runners that handle updates here must not block the event loop.
+        """
+        return False
+
     def filter_units_for_worker(self, units: List["Unit"], worker: "Worker"):
         """
         Returns the list of Units that the given worker is eligible to work on.
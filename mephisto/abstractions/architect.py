@@ -9,6 +9,11 @@ from dataclasses import dataclass, field
 from omegaconf import MISSING, DictConfig
 from typing import Dict, List, Any, ClassVar, Type, TYPE_CHECKING, Callable
 
+from mephisto.abstractions.architects.channels.websocket_channel import (
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_DELAY,
+)
+
 if TYPE_CHECKING:
     from mephisto.abstractions._subcomponents.channel import Channel
     from mephisto.data_model.packet import Packet
@@ -35,6 +40,28 @@ class ArchitectArgs:
             )
         },
     )
+    batch_socket_sends: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Coalesce packets sent to the router into batched websocket frames, "
+                "rather than sending one frame per packet."
+            )
+        },
+    )
+    max_socket_batch_size: int = field(
+        default=DEFAULT_MAX_BATCH_SIZE,
+        metadata={"help": "Most packets coalesced into one frame with batch_socket_sends."},
+    )
+    max_socket_batch_delay: float = field(
+        default=DEFAULT_MAX_BATCH_DELAY,
+        metadata={
+            "help": (
+                "Seconds a batched frame waits for more packets before being sent, "
+                "with batch_socket_sends."
+            )
+        },
+    )
 
 
 class Architect(ABC):
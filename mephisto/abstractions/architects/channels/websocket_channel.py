@@ -4,7 +4,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-from typing import Callable, Optional, TYPE_CHECKING
+from typing import Callable, List, Optional, TYPE_CHECKING
 from mephisto.data_model.packet import Packet
 from mephisto.operations.datatypes import LoopWrapper
 from mephisto.abstractions._subcomponents.channel import Channel, STATUS_CHECK_TIME
@@ -24,6 +24,10 @@ from mephisto.utils.logger_core import get_logger
 logger = get_logger(name=__name__)
 
 MAX_RETRIES = 3
+# Most packets coalesced into one frame when batching sends
+DEFAULT_MAX_BATCH_SIZE = 100
+# How long a batch waits for more packets before being sent, in seconds
+DEFAULT_MAX_BATCH_DELAY = 0.0
 
 
 class WebsocketChannel(Channel):
@@ -38,12 +42,18 @@ class WebsocketChannel(Channel):
         on_catastrophic_disconnect: Callable[[str], None],
         on_message: Callable[[str, Packet], None],
         socket_url: str,
+        batch_sends: bool = False,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_delay: float = DEFAULT_MAX_BATCH_DELAY,
     ):
         """
         Create a channel by the given name, and initialize any resources that
         will later be required during the `open` call.
 
-        Requires a socket_url to connect with.
+        Requires a socket_url to connect with. With batch_sends, queued packets
+        are coalesced into frames holding a JSON array of up to max_batch_size
+        packets, each waiting at most max_batch_delay seconds for more packets.
+        The router on the other end must support batched frames.
         """
         super().__init__(
             channel_id=channel_id,
@@ -58,6 +68,11 @@ class WebsocketChannel(Channel):
         self._is_closed = False
         self._socket_task: Optional[asyncio.Task] = None
         self._retries = MAX_RETRIES
+        self.batch_sends = batch_sends
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self._batch_lock = threading.Lock()
+        self._batch_scheduled = False
 
     def is_closed(self):
         """
@@ -116,9 +131,12 @@ class WebsocketChannel(Channel):
         def on_message(msg_json):
             """Incoming message handler defers to the internal handler"""
             try:
-                packet_dict = json.loads(msg_json)
-                packet = Packet.from_dict(packet_dict)
-                self.on_message(self.channel_id, packet)
+                packet_dicts = json.loads(msg_json)
+                if not isinstance(packet_dicts, list):
+                    packet_dicts = [packet_dicts]
+                for packet_dict in packet_dicts:
+                    packet = Packet.from_dict(packet_dict)
+                    self.on_message(self.channel_id, packet)
             except Exception as e:
                 # TODO(CLEAN) properly handle only failed from_dict calls
                 logger.exception(repr(e), exc_info=True)
@@ -203,9 +221,34 @@ class WebsocketChannel(Channel):
         """
         if self.outgoing_queue.empty():
             return
-        # TODO(#651) pop all messages and batch, rather than just one
         packet = self.outgoing_queue.get()
-        send_str = json.dumps(packet.to_sendable_dict())
+        await self._async_send_str(json.dumps(packet.to_sendable_dict()))
+
+    async def _async_send_batches(self):
+        """
+        Send everything in the outgoing queue as batched frames, until
+        the queue is empty
+        """
+        try:
+            if self.max_batch_delay > 0:
+                await asyncio.sleep(self.max_batch_delay)
+            while True:
+                with self._batch_lock:
+                    if self.outgoing_queue.empty():
+                        # Later enqueues need to schedule a new send
+                        self._batch_scheduled = False
+                        return
+                batch: List[Packet] = []
+                while len(batch) < self.max_batch_size and not self.outgoing_queue.empty():
+                    batch.append(self.outgoing_queue.get())
+                await self._async_send_str(json.dumps([p.to_sendable_dict() for p in batch]))
+        except BaseException:
+            with self._batch_lock:
+                self._batch_scheduled = False
+            raise
+
+    async def _async_send_str(self, send_str: str):
+        """Send a single frame through the current websocket"""
         try:
             await self.socket.send(send_str)
         except websockets.exceptions.ConnectionClosedOK:
@@ -230,5 +273,15 @@ class WebsocketChannel(Channel):
         if loop_wrap is None:
             return False
 
-        loop_wrap.execute_coro(self._async_send_all())
+        if not self.batch_sends:
+            loop_wrap.execute_coro(self._async_send_all())
+            return True
+
+        # Only one batched send is scheduled at a time, collecting
+        # everything enqueued until it runs
+        with self._batch_lock:
+            if self._batch_scheduled:
+                return True
+            self._batch_scheduled = True
+        loop_wrap.execute_coro(self._async_send_batches())
         return True
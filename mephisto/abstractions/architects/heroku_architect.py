@@ -24,7 +24,11 @@ from omegaconf import MISSING, DictConfig
 from mephisto.utils.dirs import get_mephisto_tmp_dir
 from mephisto.abstractions.architect import Architect, ArchitectArgs
 from mephisto.abstractions.architects.router.build_router import build_router
-from mephisto.abstractions.architects.channels.websocket_channel import WebsocketChannel
+from mephisto.abstractions.architects.channels.websocket_channel import (
+    WebsocketChannel,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_DELAY,
+)
 from mephisto.operations.registry import register_mephisto_abstraction
 from typing import Any, Tuple, List, Dict, Optional, TYPE_CHECKING, Callable
 
@@ -137,6 +141,13 @@ class HerokuArchitect(Architect):
                 on_catastrophic_disconnect=on_catastrophic_disconnect,
                 on_message=on_message,
                 socket_url=url,
+                batch_sends=self.args.architect.get("batch_socket_sends", False),
+                max_batch_size=self.args.architect.get(
+                    "max_socket_batch_size", DEFAULT_MAX_BATCH_SIZE
+                ),
+                max_batch_delay=self.args.architect.get(
+                    "max_socket_batch_delay", DEFAULT_MAX_BATCH_DELAY
+                ),
             )
             for idx, url in enumerate(urls)
         ]
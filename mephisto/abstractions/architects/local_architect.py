@@ -28,7 +28,11 @@ if TYPE_CHECKING:
     from mephisto.abstractions.blueprint import SharedTaskState
 
 from mephisto.abstractions.architects.router.build_router import build_router
-from mephisto.abstractions.architects.channels.websocket_channel import WebsocketChannel
+from mephisto.abstractions.architects.channels.websocket_channel import (
+    WebsocketChannel,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_DELAY,
+)
 from mephisto.utils.dirs import get_mephisto_tmp_dir
 
 ARCHITECT_TYPE = "local"
@@ -78,6 +82,13 @@ class LocalArchitect(Architect):
         self.cleanup_called = False
         self.server_type = args.architect.server_type
         self.server_source_path = args.architect.get("server_source_path", None)
+        self.batch_socket_sends = args.architect.get("batch_socket_sends", False)
+        self.max_socket_batch_size = args.architect.get(
+            "max_socket_batch_size", DEFAULT_MAX_BATCH_SIZE
+        )
+        self.max_socket_batch_delay = args.architect.get(
+            "max_socket_batch_delay", DEFAULT_MAX_BATCH_DELAY
+        )
 
     def _get_socket_urls(self) -> List[str]:
         """Return the path to the local server socket"""
@@ -116,6 +127,9 @@ class LocalArchitect(Architect):
                 on_catastrophic_disconnect=on_catastrophic_disconnect,
                 on_message=on_message,
                 socket_url=url,
+                batch_sends=self.batch_socket_sends,
+                max_batch_size=self.max_socket_batch_size,
+                max_batch_delay=self.max_socket_batch_delay,
             )
             for idx, url in enumerate(urls)
         ]
@@ -30,7 +30,11 @@ from mephisto.data_model.packet import (
     PACKET_TYPE_ERROR,
 )
 from mephisto.operations.registry import register_mephisto_abstraction
-from mephisto.abstractions.architects.channels.websocket_channel import WebsocketChannel
+from mephisto.abstractions.architects.channels.websocket_channel import (
+    WebsocketChannel,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_DELAY,
+)
 from typing import List, Dict, Any, Optional, TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
@@ -92,15 +96,21 @@ class SocketHandler(WebSocketHandler):
                 See `WebsocketAgent.put_data` for more information about the
                 attachment dict structure.
         """
-        message = json.loads(message_text)
-        if message["packet_type"] == PACKET_TYPE_ALIVE:
-            self.app.last_alive_packet = message
-        elif message["packet_type"] == PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE:
-            self.app.actions_observed += 1
-        elif message["packet_type"] == PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE:
-            self.app.actions_observed += 1
-        elif message["packet_type"] != PACKET_TYPE_REQUEST_STATUSES:
-            self.app.last_packet = message
+        self.app.frames_observed += 1
+        messages = json.loads(message_text)
+        if not isinstance(messages, list):
+            messages = [messages]
+        for message in messages:
+            for listener in self.app.packet_listeners:
+                listener(message)
+            if message["packet_type"] == PACKET_TYPE_ALIVE:
+                self.app.last_alive_packet = message
+            elif message["packet_type"] == PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE:
+                self.app.actions_observed += 1
+            elif message["packet_type"] == PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE:
+                self.app.actions_observed += 1
+            elif message["packet_type"] != PACKET_TYPE_REQUEST_STATUSES:
+                self.app.last_packet = message
 
     def check_origin(self, origin):
         return True
@@ -125,7 +135,9 @@ class MockServer(tornado.web.Application):
         self.running_instance = None
         self.last_alive_packet: Optional[Dict[str, Any]] = None
         self.actions_observed = 0
+        self.frames_observed = 0
         self.last_packet: Optional[Dict[str, Any]] = None
+        self.packet_listeners: List[Callable[[Dict[str, Any]], None]] = []
         tornado_settings = {
             "autoescape": None,
             "debug": "/dbg/" in __file__,
@@ -173,6 +185,22 @@ class MockServer(tornado.web.Application):
         if last_exception is not None:
             raise last_exception
 
+    def send_messages(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Send the given messages to the mephisto client in one frame, right away
+        rather than retrying and pausing after each one like _send_message
+        """
+        assert self.running_instance is not None, "Server not launched"
+        socket = self._get_sub()
+        self.running_instance.add_callback(socket.write_message, json.dumps(messages))
+
+    def add_packet_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Call the given listener with every packet received from the mephisto
+        client. Listeners are called on the server thread, so must not block.
+        """
+        self.packet_listeners.append(listener)
+
     def send_agent_act(self, agent_id, act_content):
         """
         Send a packet from the given agent with
@@ -288,6 +316,13 @@ class MockArchitect(Architect):
         self.task_run_id = task_run.db_id
         self.should_run_server = args.architect.should_run_server
         self.port = args.architect.port
+        self.batch_socket_sends = args.architect.get("batch_socket_sends", False)
+        self.max_socket_batch_size = args.architect.get(
+            "max_socket_batch_size", DEFAULT_MAX_BATCH_SIZE
+        )
+        self.max_socket_batch_delay = args.architect.get(
+            "max_socket_batch_delay", DEFAULT_MAX_BATCH_DELAY
+        )
         self.server: Optional["MockServer"] = None
         # TODO(#651) track state in parent class?
         self.prepared = False
@@ -318,6 +353,9 @@ class MockArchitect(Architect):
                 on_catastrophic_disconnect=on_catastrophic_disconnect,
                 on_message=on_message,
                 socket_url=url,
+                batch_sends=self.batch_socket_sends,
+                max_batch_size=self.max_socket_batch_size,
+                max_batch_delay=self.max_socket_batch_delay,
             )
             for idx, url in enumerate(urls)
         ]
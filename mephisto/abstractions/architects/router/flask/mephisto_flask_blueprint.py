@@ -19,6 +19,7 @@ from geventwebsocket import (  # type: ignore
     Resource,
     WebSocketError,
 )
+from gevent.event import AsyncResult  # type: ignore
 from uuid import uuid4
 import time
 import json
@@ -54,6 +55,7 @@ SYSTEM_CHANNEL_ID = "mephisto"
 
 FAILED_RECONNECT_TIME = 10  # seconds
 FAILED_PING_TIME = 15  # seconds
+AGENT_REQUEST_TIMEOUT = 30  # seconds
 UPLOAD_FOLDER = "/tmp/"
 ALLOWED_EXTENSIONS = {"txt", "pdf", "png", "jpg", "jpeg", "gif"}
 
@@ -120,9 +122,13 @@ class MephistoRouterState:
         self.client_id_to_agent: Dict[str, LocalAgentState] = {}
         self.mephisto_socket: Optional["WebSocket"] = None
         self.agent_id_to_agent: Dict[str, LocalAgentState] = {}
-        self.pending_agent_requests: Dict[str, bool] = {}
-        self.received_agent_responses: Dict[str, Dict[str, Any]] = {}
+        # request_id -> result that the agent details response is set on
+        self.pending_agent_requests: Dict[str, AsyncResult] = {}
         self.last_mephisto_ping: float = time.time()
+        # Sequence number of the latest status change, and agent_id -> sequence
+        # number of its latest change, kept in the order the changes happened
+        self.status_seq: int = 0
+        self.agent_status_seqs: Dict[str, int] = {}
 
 
 mephisto_router_app: Optional["MephistoRouter"] = None
@@ -176,8 +182,23 @@ class MephistoRouter(WebSocketApplication):
         if agent is None:
             agent = LocalAgentState(agent_id)
             state.agent_id_to_agent[agent_id] = agent
+            self._record_status_change(agent)
         return agent
 
+    def _record_status_change(self, agent: LocalAgentState) -> None:
+        """Give the agent's status the next sequence number, for the next status delta"""
+        state = self.mephisto_state
+        state.status_seq += 1
+        # Reinsert, to keep agent_status_seqs in change order
+        state.agent_status_seqs.pop(agent.agent_id, None)
+        state.agent_status_seqs[agent.agent_id] = state.status_seq
+
+    def _set_agent_status(self, agent: LocalAgentState, status: str) -> None:
+        """Update the local agent status, recording it if it changed"""
+        if agent.status != status:
+            agent.status = status
+            self._record_status_change(agent)
+
     def _handle_alive(self, client: "Client", alive_packet: Dict[str, Any]) -> None:
         """
         On alive, find out who the sender is, and register
@@ -206,29 +227,49 @@ class MephistoRouter(WebSocketApplication):
         if curr_status not in [STATUS_ONBOARDING, STATUS_WAITING, STATUS_IN_TASK]:
             return  # not in a live state, no reason to check liveliness
         if time.time() - last_ping > FAILED_PING_TIME:
-            agent.status = STATUS_DISCONNECTED
+            self._set_agent_status(agent, STATUS_DISCONNECTED)
             self._send_status_for_agent(agent.agent_id)
 
     def _handle_get_agent_status(self, agent_status_packet: Dict[str, Any]) -> None:
         """
         On a get agent status request, check the status of all agents and
-        respond to the core mephisto server with the current status of each.
+        respond to the core mephisto server with the status of each agent that
+        changed since the status sequence number in the request. Responds with
+        the status of every agent if the request has no sequence number, as
+        after a reconnect, or one this router never gave out.
 
         May return semi-stale information, but is non-blocking
         """
         state = self.mephisto_state
         state.last_mephisto_ping = time.time()
-        agent_statuses = {}
-        for agent_id in state.agent_id_to_agent.keys():
-            agent = self._find_or_create_agent(agent_id)
+        for agent in state.agent_id_to_agent.values():
+            if agent.status == STATUS_DISCONNECTED:
+                continue  # Nothing left to check
             self._ensure_live_connection(agent)
             if not agent.is_alive and agent.status != STATUS_DISCONNECTED:
                 self._followup_possible_disconnect(agent)
-            agent_statuses[agent_id] = state.agent_id_to_agent[agent_id].status
+
+        since_seq = agent_status_packet["data"].get("since_status_seq")
+        full_snapshot = since_seq is None or since_seq > state.status_seq
+        if full_snapshot:
+            changed_agent_ids = list(state.agent_id_to_agent.keys())
+        else:
+            changed_agent_ids = []
+            for agent_id in reversed(state.agent_status_seqs):
+                if state.agent_status_seqs[agent_id] <= since_seq:
+                    break
+                changed_agent_ids.append(agent_id)
+        agent_statuses = {
+            agent_id: state.agent_id_to_agent[agent_id].status for agent_id in changed_agent_ids
+        }
         packet = {
             "packet_type": PACKET_TYPE_RETURN_STATUSES,
             "subject_id": SYSTEM_CHANNEL_ID,
-            "data": agent_statuses,
+            "data": {
+                "agent_statuses": agent_statuses,
+                "status_seq": state.status_seq,
+                "full_snapshot": full_snapshot,
+            },
             "client_timestamp": agent_status_packet["server_timestamp"],
             "router_incoming_timestamp": agent_status_packet["router_incoming_timestamp"],
         }
@@ -239,7 +280,7 @@ class MephistoRouter(WebSocketApplication):
         agent_id = status_packet["subject_id"]
         agent = self._find_or_create_agent(agent_id)
         if status_packet["data"].get("status") is not None:
-            agent.status = status_packet["data"]["status"]
+            self._set_agent_status(agent, status_packet["data"]["status"])
 
     def _handle_forward(self, packet: Dict[str, Any]) -> None:
         """Handle forwarding the given packet to the included subject_id"""
@@ -262,7 +303,7 @@ class MephistoRouter(WebSocketApplication):
         if agent.disconnect_time == 0:
             return  # Agent never disconnected, isn't live
         if time.time() - agent.disconnect_time > FAILED_RECONNECT_TIME:
-            agent.status = STATUS_DISCONNECTED
+            self._set_agent_status(agent, STATUS_DISCONNECTED)
             debug_log("Agent disconnected", agent)
 
     def _send_status_for_agent(self, agent_id: str) -> None:
@@ -290,15 +331,25 @@ class MephistoRouter(WebSocketApplication):
 
     def on_message(self, message: str) -> None:
         """
-        Determine the type of message, and then handle via the correct handler
+        Unpack the packets in the message, which may be a batch of packets,
+        and handle each of them in order
         """
         if message is None:
             return
 
+        packets = json.loads(message)
+        if not isinstance(packets, list):
+            packets = [packets]
+        for packet in packets:
+            self._handle_packet(packet)
+
+    def _handle_packet(self, packet: Dict[str, Any]) -> None:
+        """
+        Determine the type of packet, and then handle via the correct handler
+        """
         state = self.mephisto_state
         current_client = self.ws.handler.active_client
         client = current_client
-        packet = json.loads(message)
         packet["router_incoming_timestamp"] = time.time()
         if packet["packet_type"] == PACKET_TYPE_REQUEST_STATUSES:
             debug_log("Mephisto requesting status")
@@ -321,10 +372,11 @@ class MephistoRouter(WebSocketApplication):
             request_id = packet["data"].get("request_id")
             if request_id is None:
                 request_id = packet["subject_id"]
-            res_event = state.pending_agent_requests.get(request_id)
-            if res_event is not None:
-                state.received_agent_responses[request_id] = packet
-                del state.pending_agent_requests[request_id]
+            pending_request = state.pending_agent_requests.pop(request_id, None)
+            if pending_request is not None:
+                pending_request.set(packet)
+            else:
+                debug_log("Response for a timed out or unknown request", request_id)
         elif packet["packet_type"] == PACKET_TYPE_HEARTBEAT:
             packet["data"] = {"last_mephisto_ping": js_time(state.last_mephisto_ping)}
             agent_id = packet["subject_id"]
@@ -352,20 +404,25 @@ class MephistoRouter(WebSocketApplication):
         agent.is_alive = False
         agent.disconnect_time = time.time()
 
-    def make_agent_request(self, request_packet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Make a request to the core Mephisto server, and then await the response"""
+    def make_agent_request(
+        self, request_packet: Dict[str, Any], timeout: float = AGENT_REQUEST_TIMEOUT
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Make a request to the core Mephisto server, and then await the response,
+        returning None if it doesn't arrive within the timeout
+        """
         request_id = request_packet["data"]["request_id"]
-
-        self.mephisto_state.pending_agent_requests[request_id] = True
-        self._send_message(self.mephisto_state.mephisto_socket, request_packet)
-        start_time = time.time()
-        res = None
-        while time.time() - start_time < 30 and res is None:
-            res = self.mephisto_state.received_agent_responses.get(request_id)
-            time.sleep(0.01)
-        if res is not None:
-            del self.mephisto_state.received_agent_responses[request_id]
-        return res
+        pending_requests = self.mephisto_state.pending_agent_requests
+
+        pending_request = AsyncResult()
+        pending_requests[request_id] = pending_request
+        try:
+            self._send_message(self.mephisto_state.mephisto_socket, request_packet)
+            return pending_request.wait(timeout)
+        finally:
+            # Drop the entry on timeout, so a late response is ignored
+            if pending_requests.get(request_id) is pending_request:
+                del pending_requests[request_id]
 
 
 @mephisto_router.route("/request_agent", methods=["POST"])
@@ -124,6 +124,11 @@ var agent_id_to_agent = {};
 
 var pending_agent_requests = {};
 
+// Sequence number of the latest status change, and the sequence number of
+// each agent's latest change
+var status_seq = 0;
+var agent_status_seqs = new Map();
+
 var last_mephisto_ping = Date.now();
 
 function debug_log() {
@@ -173,13 +178,28 @@ function find_or_create_agent(agent_id) {
     debug_log("Am creating agent for " + agent_id);
     var agent = new LocalAgentState(agent_id);
     agent_id_to_agent[agent_id] = agent;
+    record_status_change(agent);
   }
   return agent;
 }
 
+// Give the agent's status the next sequence number, for the next status delta
+function record_status_change(agent) {
+  status_seq += 1;
+  agent_status_seqs.set(agent.agent_id, status_seq);
+}
+
+function set_agent_status(agent, status) {
+  if (agent.status != status) {
+    agent.status = status;
+    record_status_change(agent);
+  }
+}
+
 function clear_agent(agent_id) {
   debug_log("Clearing agent " + agent_id);
   delete agent_id_to_agent[agent_id];
+  agent_status_seqs.delete(agent_id);
   let socket = agent_id_to_socket[agent_id];
   delete agent_id_to_socket[agent_id];
   if (socket !== undefined) {
@@ -221,24 +241,44 @@ function ensure_live_connection(agent) {
     return; // Not in a live state, nothing to ensure
   }
   if (Date.now() - last_ping > FAILED_PING_TIME) {
-    agent.status = STATUS_DISCONNECT;
+    set_agent_status(agent, STATUS_DISCONNECT);
     send_status_for_agent(agent.agent_id);
   }
 }
 
-// Return the status of all agents mapped by their agent id
+// Return the status of the agents that changed since the sequence number in
+// the request mapped by their agent id, or of all agents without one
 function handle_get_agent_status(status_packet) {
   last_mephisto_ping = Date.now();
-  let agent_statuses = {};
   for (let agent_id in agent_id_to_agent) {
-    let agent = agent_id_to_agent[agent_id];
-    ensure_live_connection(agent);
-    agent_statuses[agent_id] = agent.status;
+    ensure_live_connection(agent_id_to_agent[agent_id]);
+  }
+
+  let since_seq = status_packet.data.since_status_seq;
+  let full_snapshot =
+    since_seq === undefined || since_seq === null || since_seq > status_seq;
+  let changed_agent_ids = [];
+  if (full_snapshot) {
+    changed_agent_ids = Object.keys(agent_id_to_agent);
+  } else {
+    for (let [agent_id, seq] of agent_status_seqs) {
+      if (seq > since_seq) {
+        changed_agent_ids.push(agent_id);
+      }
+    }
+  }
+  let agent_statuses = {};
+  for (let agent_id of changed_agent_ids) {
+    agent_statuses[agent_id] = agent_id_to_agent[agent_id].status;
   }
   let packet = {
     packet_type: PACKET_TYPE_RETURN_STATUSES,
     subject_id: SYSTEM_SOCKET_ID,
-    data: agent_statuses,
+    data: {
+      agent_statuses: agent_statuses,
+      status_seq: status_seq,
+      full_snapshot: full_snapshot,
+    },
     client_timestamp: status_packet.server_timestamp,
     router_incoming_timestamp: status_packet.router_incoming_timestamp,
   };
@@ -249,7 +289,7 @@ function handle_update_local_status(status_packet) {
   let agent_id = status_packet.subject_id;
   let agent = find_or_create_agent(agent_id);
   if (status_packet.data.status != undefined) {
-    agent.status = status_packet.data.status;
+    set_agent_status(agent, status_packet.data.status);
   }
 }
 
@@ -267,7 +307,7 @@ function forward_to_agent(packet) {
 
 function _followup_possible_disconnect(agent) {
   if (!agent.is_alive) {
-    agent.status = STATUS_DISCONNECT;
+    set_agent_status(agent, STATUS_DISCONNECT);
     debug_log("Agent disconnected", agent);
   }
 }
@@ -315,62 +355,68 @@ wss.on("connection", function (socket) {
   });
 
   // handles routing a packet to the desired recipient
-  socket.on("message", function (packet) {
-    try {
-      packet = JSON.parse(packet);
-      packet["router_incoming_timestamp"] = pythonTime();
-      if (packet["packet_type"] == PACKET_TYPE_REQUEST_STATUSES) {
-        debug_log("Mephisto requesting status");
-        handle_get_agent_status(packet);
-      } else if (
-        packet["packet_type"] == PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE
-      ) {
-        debug_log("Mephisto-bound action: ", packet);
-        mephisto_message_queue.push(packet);
-      } else if (
-        packet["packet_type"] == PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE
-      ) {
-        debug_log("Client-bound action: ", packet);
-        forward_to_agent(packet);
-      } else if (packet["packet_type"] == PACKET_TYPE_ERROR) {
-        mephisto_message_queue.push(packet);
-      } else if (packet["packet_type"] == PACKET_TYPE_ALIVE) {
-        debug_log("Agent alive: ", packet);
-        handle_alive(socket, packet);
-      } else if (packet["packet_type"] == PACKET_TYPE_UPDATE_STATUS) {
-        debug_log("Update agent status", packet);
-        handle_update_local_status(packet);
-        forward_to_agent(packet);
-      } else if (packet["packet_type"] == PACKET_TYPE_AGENT_DETAILS) {
-        let request_id = packet["data"]["request_id"];
-        if (request_id === undefined) {
-          request_id = packet["subject_id"];
-        }
-        let res_obj = pending_agent_requests[request_id];
-        if (res_obj) {
-          res_obj.json(packet);
-          delete pending_agent_requests[request_id];
-        }
-      } else if (packet["packet_type"] == PACKET_TYPE_HEARTBEAT) {
-        packet["data"] = { last_mephisto_ping: last_mephisto_ping };
-        let agent_id = packet["subject_id"];
-        let agent = agent_id_to_agent[agent_id];
-        if (agent !== undefined) {
-          agent.is_alive = true;
-          agent.last_ping = Date.now();
-          packet.data.status = agent.status;
-          if (
-            agent_id_to_socket[agent.agent_id] != socket &&
-            agent_id_to_socket[agent.agent_id] != undefined
-          ) {
-            // Not communicating to the _correct_ socket, update
-            debug_log("Updating socket for ", agent);
-            agent_id_to_socket[agent.agent_id] = socket;
-            socket_id_to_agent[socket.id] = agent;
-          }
+  function handle_packet(packet) {
+    packet["router_incoming_timestamp"] = pythonTime();
+    if (packet["packet_type"] == PACKET_TYPE_REQUEST_STATUSES) {
+      debug_log("Mephisto requesting status");
+      handle_get_agent_status(packet);
+    } else if (
+      packet["packet_type"] == PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE
+    ) {
+      debug_log("Mephisto-bound action: ", packet);
+      mephisto_message_queue.push(packet);
+    } else if (packet["packet_type"] == PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE) {
+      debug_log("Client-bound action: ", packet);
+      forward_to_agent(packet);
+    } else if (packet["packet_type"] == PACKET_TYPE_ERROR) {
+      mephisto_message_queue.push(packet);
+    } else if (packet["packet_type"] == PACKET_TYPE_ALIVE) {
+      debug_log("Agent alive: ", packet);
+      handle_alive(socket, packet);
+    } else if (packet["packet_type"] == PACKET_TYPE_UPDATE_STATUS) {
+      debug_log("Update agent status", packet);
+      handle_update_local_status(packet);
+      forward_to_agent(packet);
+    } else if (packet["packet_type"] == PACKET_TYPE_AGENT_DETAILS) {
+      let request_id = packet["data"]["request_id"];
+      if (request_id === undefined) {
+        request_id = packet["subject_id"];
+      }
+      let res_obj = pending_agent_requests[request_id];
+      if (res_obj) {
+        res_obj.json(packet);
+        delete pending_agent_requests[request_id];
+      }
+    } else if (packet["packet_type"] == PACKET_TYPE_HEARTBEAT) {
+      packet["data"] = { last_mephisto_ping: last_mephisto_ping };
+      let agent_id = packet["subject_id"];
+      let agent = agent_id_to_agent[agent_id];
+      if (agent !== undefined) {
+        agent.is_alive = true;
+        agent.last_ping = Date.now();
+        packet.data.status = agent.status;
+        if (
+          agent_id_to_socket[agent.agent_id] != socket &&
+          agent_id_to_socket[agent.agent_id] != undefined
+        ) {
+          // Not communicating to the _correct_ socket, update
+          debug_log("Updating socket for ", agent);
+          agent_id_to_socket[agent.agent_id] = socket;
+          socket_id_to_agent[socket.id] = agent;
         }
-        forward_to_agent(packet);
       }
+      forward_to_agent(packet);
+    }
+  }
+
+  socket.on("message", function (message) {
+    try {
+      // Mephisto may batch several packets into one message
+      let packets = JSON.parse(message);
+      if (!Array.isArray(packets)) {
+        packets = [packets];
+      }
+      packets.forEach(handle_packet);
     } catch (error) {
       console.log("Transient error on message");
       console.log(error);
@@ -11,17 +11,34 @@ from mephisto.abstractions._subcomponents.agent_state import (
 )
 import os.path
 import time
+import json
 import dataclasses
 
+from mephisto.utils.logger_core import get_logger
+
 if TYPE_CHECKING:
     from mephisto.data_model.agent import Agent
     from mephisto.data_model.packet import Packet
 
+logger = get_logger(name=__name__)
+
+STATE_STORAGE_JSON = "json"
+STATE_STORAGE_JSONL = "jsonl"
+STATE_FILE = "state.json"
+# jsonl storage: one line per message, with everything else in the sidecar
+MESSAGE_LOG_FILE = "state_messages.jsonl"
+STATE_SIDECAR_FILE = "state_sidecar.json"
+
 
 class ParlAIChatAgentState(AgentState):
     """
     Holds information about ParlAI-style chat. Data is stored in json files
     containing every act from the ParlAI world.
+
+    With the 'jsonl' state_storage_mode, acts are instead appended one per line
+    to a message log as they come in, and the inputs, final submission and
+    metadata are kept in a sidecar file, so saving a message doesn't rewrite
+    the whole conversation.
     """
 
     def _set_init_state(self, data: Any):
@@ -43,29 +60,77 @@ class ParlAIChatAgentState(AgentState):
     def _get_expected_data_file(self) -> str:
         """Return the place we would expect to find data for this agent state"""
         agent_dir = self.agent.get_data_dir()
-        return os.path.join(agent_dir, "state.json")
+        return os.path.join(agent_dir, STATE_FILE)
+
+    def _get_message_log_file(self) -> str:
+        """Return the place we would expect to find the message log for this agent state"""
+        agent_dir = self.agent.get_data_dir()
+        return os.path.join(agent_dir, MESSAGE_LOG_FILE)
+
+    def _get_sidecar_file(self) -> str:
+        """Return the place we would expect to find the jsonl storage sidecar"""
+        agent_dir = self.agent.get_data_dir()
+        return os.path.join(agent_dir, STATE_SIDECAR_FILE)
+
+    def _get_configured_storage_mode(self) -> str:
+        """Return the storage mode that new agent states of this run should use"""
+        blueprint_args = self.agent.get_task_run().args.get("blueprint", {})
+        return blueprint_args.get("state_storage_mode", STATE_STORAGE_JSON)
 
     def _load_data(self) -> None:
         """Load stored data from a file to this object"""
+        db = self.agent.db
         agent_file = self._get_expected_data_file()
-        if not self.agent.db.key_exists(agent_file):
-            self.messages: List[Dict[str, Any]] = []
-            self.final_submission: Optional[Dict[str, Any]] = None
-            self.init_data = None
-        else:
-            state = self.agent.db.read_dict(agent_file)
+        self.messages: List[Dict[str, Any]] = []
+        self.final_submission: Optional[Dict[str, Any]] = None
+        self.init_data = None
+        if db.key_exists(agent_file):
+            # Existing state.json files keep being written as they were
+            self.storage_mode = STATE_STORAGE_JSON
+            state = db.read_dict(agent_file)
             self.messages = state["outputs"]["messages"]
-            self.init_data = state["inputs"]
-            self.final_submission = state["outputs"].get("final_submission")
-            if "metadata" in state:
-                self.metadata = _AgentStateMetadata(**state["metadata"])
-            elif "times" in state:
-                self.metadata = _AgentStateMetadata(
-                    start_time=state["times"]["start_time"],
-                    end_time=state["times"]["end_time"],
-                )
-            else:
-                self.metadata = _AgentStateMetadata()
+            self._load_state_fields(state)
+        elif db.key_exists(self._get_sidecar_file()) or db.key_exists(self._get_message_log_file()):
+            self.storage_mode = STATE_STORAGE_JSONL
+            self._load_message_log()
+        else:
+            self.storage_mode = self._get_configured_storage_mode()
+        self.num_logged_messages = len(self.messages)
+
+    def _load_state_fields(self, state: Dict[str, Any]) -> None:
+        """Load everything but the messages from a saved state dict"""
+        self.init_data = state["inputs"]
+        self.final_submission = state["outputs"].get("final_submission")
+        if "metadata" in state:
+            self.metadata = _AgentStateMetadata(**state["metadata"])
+        elif "times" in state:
+            self.metadata = _AgentStateMetadata(
+                start_time=state["times"]["start_time"],
+                end_time=state["times"]["end_time"],
+            )
+        else:
+            self.metadata = _AgentStateMetadata()
+
+    def _load_message_log(self) -> None:
+        """Load the sidecar, then replay the message log into this object"""
+        db = self.agent.db
+        sidecar_file = self._get_sidecar_file()
+        if db.key_exists(sidecar_file):
+            self._load_state_fields(db.read_dict(sidecar_file))
+        log_file = self._get_message_log_file()
+        if db.key_exists(log_file):
+            log_text = db.read_text(log_file)
+            complete_size = log_text.rfind("\n") + 1
+            if complete_size != len(log_text):
+                # Only the final append can be cut short by a crash. It's dropped from
+                # the file too, so that the next append doesn't continue its line
+                logger.warning(f"Dropping partially written message from {log_file}")
+                log_text = log_text[:complete_size]
+                db.write_text(log_file, log_text)
+            for line in log_text.splitlines():
+                if len(line.strip()) == 0:
+                    continue
+                self.messages.append(json.loads(line))
 
     def get_data(self) -> Dict[str, Any]:
         """Return dict with the messages of this agent"""
@@ -117,8 +182,26 @@ class ParlAIChatAgentState(AgentState):
 
     def _save_data(self) -> None:
         """Save all messages from this agent to"""
-        agent_file = self._get_expected_data_file()
-        self.agent.db.write_dict(agent_file, self.get_data())
+        if self.storage_mode == STATE_STORAGE_JSONL:
+            self._append_new_messages()
+            data = self.get_data()
+            del data["outputs"]["messages"]
+            self.agent.db.write_dict(self._get_sidecar_file(), data)
+        else:
+            agent_file = self._get_expected_data_file()
+            self.agent.db.write_dict(agent_file, self.get_data())
+
+    def _append_new_messages(self) -> None:
+        """Write any messages that aren't in the message log yet"""
+        log_file = self._get_message_log_file()
+        if self.num_logged_messages > len(self.messages):
+            # Messages were removed, so the log has to be rebuilt
+            self.agent.db.write_text(log_file, "")
+            self.num_logged_messages = 0
+        new_messages = self.messages[self.num_logged_messages :]
+        if len(new_messages) > 0:
+            self.agent.db.append_text(log_file, "".join(json.dumps(m) + "\n" for m in new_messages))
+            self.num_logged_messages = len(self.messages)
 
     def update_data(self, live_update: Dict[str, Any]) -> None:
         """
@@ -126,7 +209,11 @@ class ParlAIChatAgentState(AgentState):
         """
         live_update["timestamp"] = time.time()
         self.messages.append(live_update)
-        self.save_data()
+        if self.storage_mode == STATE_STORAGE_JSONL:
+            # Nothing but the messages changed, so only the new one is written
+            self._append_new_messages()
+        else:
+            self.save_data()
 
     def _update_submit(self, submitted_data: Dict[str, Any]) -> None:
         """Append any final submission to this state"""
@@ -19,6 +19,8 @@ from dataclasses import dataclass, field
 from mephisto.data_model.assignment import InitializationData
 from mephisto.abstractions.blueprints.parlai_chat.parlai_chat_agent_state import (
     ParlAIChatAgentState,
+    STATE_STORAGE_JSON,
+    STATE_STORAGE_JSONL,
 )
 from mephisto.abstractions.blueprints.parlai_chat.parlai_chat_task_runner import (
     ParlAIChatTaskRunner,
@@ -131,6 +133,16 @@ class ParlAIChatBlueprintArgs(OnboardingRequiredArgs, BlueprintArgs):
         default=MISSING,
         metadata={"help": "Optional count of conversations to have if no context provided"},
     )
+    state_storage_mode: str = field(
+        default=STATE_STORAGE_JSON,
+        metadata={
+            "help": (
+                "How agent chat states are saved. 'json' rewrites the whole state on "
+                "every message, 'jsonl' appends each message to a log instead."
+            ),
+            "choices": [STATE_STORAGE_JSON, STATE_STORAGE_JSONL],
+        },
+    )
 
 
 @register_mephisto_abstraction()
@@ -6,7 +6,6 @@
 
 from mephisto.abstractions.blueprint import TaskRunner, SharedTaskState
 from mephisto.data_model.agent import Agent, OnboardingAgent
-import time
 
 try:
     from parlai.core.agents import Agent as ParlAIAgent  # type: ignore
@@ -191,8 +190,7 @@ class ParlAIChatTaskRunner(TaskRunner):
         )
 
         # Mark the agent as done, then wait for the incoming submit action
-        while not agent.await_submit(timeout=None):
-            time.sleep(0.3)
+        agent.wait_for_submit()
 
     def cleanup_onboarding(self, agent: "OnboardingAgent") -> None:
         """Shutdown the world"""
@@ -132,6 +132,34 @@ class RemoteProcedureBlueprintArgs(
     units_per_assignment: int = field(
         default=1, metadata={"help": "How many workers you want to do each assignment"}
     )
+    async_dispatch: bool = field(
+        default=False,
+        metadata={
+            "help": """
+                Run remote procedure requests as they arrive, on a thread pool
+                shared by all agents (or on the event loop for async functions),
+                rather than polling for them in one thread per agent.
+            """,
+            "required": False,
+        },
+    )
+    dispatch_max_workers: int = field(
+        default=32,
+        metadata={
+            "help": "Threads running remote procedure requests when using async_dispatch",
+            "required": False,
+        },
+    )
+    max_concurrent_requests_per_target: int = field(
+        default=0,
+        metadata={
+            "help": (
+                "Most requests to a single remote procedure to run at once when "
+                "using async_dispatch, further ones wait their turn. 0 for no limit"
+            ),
+            "required": False,
+        },
+    )
 
 
 @register_mephisto_abstraction()
@@ -9,12 +9,18 @@ from mephisto.abstractions.blueprints.remote_procedure.remote_procedure_agent_st
     RemoteProcedureAgentState,
 )
 from mephisto.data_model.agent import Agent, OnboardingAgent
+from mephisto.utils.logger_core import get_logger
+import asyncio
+import threading
 import time
 import json
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from prometheus_client import Histogram  # type: ignore
 from uuid import uuid4
 
-from typing import ClassVar, List, Type, Any, Dict, Union, TYPE_CHECKING
+from typing import ClassVar, List, Type, Any, Deque, Dict, Optional, Tuple, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mephisto.data_model.task_run import TaskRun
@@ -27,8 +33,19 @@ if TYPE_CHECKING:
     )
 
 
+logger = get_logger(name=__name__)
+
 THREAD_SHORT_SLEEP = 0.3
 
+REMOTE_PROCEDURE_LATENCY = Histogram(
+    "remote_procedure_latency_seconds",
+    "Time remote procedure requests spend waiting to run, and running",
+    ["target", "stage"],
+)
+
+# An agent, its request, and when the request arrived
+PendingRequest = Tuple[Union["Agent", "OnboardingAgent"], Dict[str, Any], float]
+
 
 class RemoteProcedureTaskRunner(TaskRunner):
     """
@@ -52,6 +69,22 @@ class RemoteProcedureTaskRunner(TaskRunner):
             task_run.get_task_args().assignment_duration_in_seconds
         )
 
+        # Async dispatch runs requests as they arrive, rather than polling per agent
+        self.async_dispatch = args.blueprint.get("async_dispatch", False)
+        self.max_concurrent_requests_per_target = args.blueprint.get(
+            "max_concurrent_requests_per_target", 0
+        )
+        self._dispatch_executor: Optional[ThreadPoolExecutor] = None
+        if self.async_dispatch:
+            self._dispatch_executor = ThreadPoolExecutor(
+                max_workers=args.blueprint.get("dispatch_max_workers", 32),
+                thread_name_prefix="remote-procedure",
+            )
+        self._dispatch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatch_lock = threading.Lock()
+        self._running_requests: Dict[str, int] = {}
+        self._pending_requests: Dict[str, Deque[PendingRequest]] = {}
+
     def get_init_data_for_agent(self, agent: "Agent") -> Dict[str, Any]:
         """
         Return the data for an agent already assigned to a particular unit
@@ -75,6 +108,48 @@ class RemoteProcedureTaskRunner(TaskRunner):
             or agent.get_agent_id() in self.running_onboardings
         )
 
+    def _get_remote_procedure_call(
+        self, agent: Union["Agent", "OnboardingAgent"], live_update: Dict[str, Any]
+    ) -> Tuple[Any, Tuple[str, Any, RemoteProcedureAgentState]]:
+        """Return the registered function that a request targets, and its arguments"""
+        assert (
+            self.function_registry is not None and live_update["target"] in self.function_registry
+        ), f"Target function {live_update['target']} not found in registry: {self.function_registry}"
+        state = agent.state
+        assert isinstance(
+            state, RemoteProcedureAgentState
+        ), "Must use an agent with RemoteProcedureAgentState"
+        function = self.function_registry[live_update["target"]]
+        return function, (live_update["request_id"], json.loads(live_update["args"]), state)
+
+    def _send_remote_procedure_response(
+        self, agent: Union["Agent", "OnboardingAgent"], request_id: str, res: Any
+    ) -> None:
+        agent.observe(
+            {
+                "handles": request_id,
+                "response": json.dumps(res),
+            }
+        )
+
+    def _run_remote_procedure(
+        self, agent: Union["Agent", "OnboardingAgent"], live_update: Dict[str, Any]
+    ) -> None:
+        """Execute a command that came in from the frontend, and send back the result"""
+        function, function_args = self._get_remote_procedure_call(agent, live_update)
+        with REMOTE_PROCEDURE_LATENCY.labels(target=live_update["target"], stage="run").time():
+            res = function(*function_args)
+        self._send_remote_procedure_response(agent, live_update["request_id"], res)
+
+    async def _run_remote_procedure_async(
+        self, agent: Union["Agent", "OnboardingAgent"], live_update: Dict[str, Any]
+    ) -> None:
+        """Same as _run_remote_procedure, for functions that are coroutines"""
+        function, function_args = self._get_remote_procedure_call(agent, live_update)
+        with REMOTE_PROCEDURE_LATENCY.labels(target=live_update["target"], stage="run").time():
+            res = await function(*function_args)
+        self._send_remote_procedure_response(agent, live_update["request_id"], res)
+
     def _run_server_timestep_for_agent(self, agent: Union["Agent", "OnboardingAgent"]):
         """
         Both onboarding and regular tasks have access to the server for remote
@@ -82,36 +157,91 @@ class RemoteProcedureTaskRunner(TaskRunner):
         """
         live_update = agent.get_live_update()
         if live_update is not None and "request_id" in live_update:
-            request_id = live_update["request_id"]
             # Execute commands that come in from the frontend
-            # TODO extend scope to handle yield-style functions, and
-            # move these to async tasks
-            assert (
-                self.function_registry is not None
-                and live_update["target"] in self.function_registry
-            ), f"Target function {live_update['target']} not found in registry: {self.function_registry}"
-            state = agent.state
-            assert isinstance(
-                state, RemoteProcedureAgentState
-            ), "Must use an agent with RemoteProcedureAgentState"
-            res = self.function_registry[live_update["target"]](
-                request_id, json.loads(live_update["args"]), state
+            # TODO extend scope to handle yield-style functions
+            self._run_remote_procedure(agent, live_update)
+
+        # sleep to avoid tight loop
+        time.sleep(THREAD_SHORT_SLEEP)
+
+    def handle_live_update(
+        self, agent: Union["Agent", "OnboardingAgent"], live_update: Dict[str, Any]
+    ) -> bool:
+        """
+        With async dispatch, run remote procedure requests as soon as they arrive,
+        waiting first for earlier requests to the same target if it's at its limit
+        """
+        if not self.async_dispatch or "request_id" not in live_update:
+            return False
+
+        # Record the request as get_live_update would have for the polling path
+        agent.state.update_data(live_update)
+        target = live_update["target"]
+        if self.function_registry is None or target not in self.function_registry:
+            logger.error(
+                f"Target function {target} not found in registry: {self.function_registry}"
             )
+            return True
+        if asyncio.iscoroutinefunction(self.function_registry[target]):
+            # Coroutines run on the loop that receives the requests
+            self._dispatch_loop = asyncio.get_running_loop()
 
-            agent.observe(
-                {
-                    "handles": request_id,
-                    "response": json.dumps(res),
-                }
+        request: PendingRequest = (agent, live_update, time.time())
+        with self._dispatch_lock:
+            running_count = self._running_requests.get(target, 0)
+            limit = self.max_concurrent_requests_per_target
+            if limit and running_count >= limit:
+                self._pending_requests.setdefault(target, deque()).append(request)
+                return True
+            self._running_requests[target] = running_count + 1
+        self._dispatch_request(request)
+        return True
+
+    def _dispatch_request(self, request: PendingRequest) -> None:
+        agent, live_update, arrival_time = request
+        target = live_update["target"]
+        REMOTE_PROCEDURE_LATENCY.labels(target=target, stage="wait").observe(
+            time.time() - arrival_time
+        )
+
+        future: "Future[None]"
+        if asyncio.iscoroutinefunction(self.function_registry[target]):
+            assert self._dispatch_loop is not None, "No event loop to run coroutines on"
+            future = asyncio.run_coroutine_threadsafe(
+                self._run_remote_procedure_async(agent, live_update), self._dispatch_loop
             )
+        else:
+            assert self._dispatch_executor is not None, "Async dispatch wasn't set up"
+            future = self._dispatch_executor.submit(self._run_remote_procedure, agent, live_update)
+        future.add_done_callback(lambda f: self._on_request_done(request, f))
 
-        # sleep to avoid tight loop
-        time.sleep(THREAD_SHORT_SLEEP)
+    def _on_request_done(self, request: PendingRequest, future: "Future[None]") -> None:
+        """Log a failed request, then start the next one waiting for the same target"""
+        agent, live_update, _arrival_time = request
+        target = live_update["target"]
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(
+                f"Remote procedure {target} failed for agent {agent.get_agent_id()}",
+                exc_info=future.exception(),
+            )
+
+        with self._dispatch_lock:
+            pending = self._pending_requests.get(target)
+            if not pending:
+                self._running_requests[target] -= 1
+                return
+            next_request = pending.popleft()
+        self._dispatch_request(next_request)
 
     def run_onboarding(self, agent: "OnboardingAgent") -> None:
         """
         Running onboarding with access to remote queries
         """
+        if self.async_dispatch:
+            # Requests are handled as they arrive, so there's nothing to poll for
+            agent.await_submit(timeout=self.assignment_duration_in_seconds)
+            return
+
         # Run the server while the task isn't submitted yet
         start_time = time.time()
         while (
@@ -132,6 +262,10 @@ class RemoteProcedureTaskRunner(TaskRunner):
         """
         Running a task with access to remote queries
         """
+        if self.async_dispatch:
+            agent.await_submit(timeout=self.assignment_duration_in_seconds)
+            return
+
         start_time = time.time()
         while (
             not agent.await_submit(timeout=None)
@@ -146,3 +280,10 @@ class RemoteProcedureTaskRunner(TaskRunner):
     def cleanup_unit(self, unit: "Unit") -> None:
         """Handle cleanup for a specific unit"""
         pass
+
+    def shutdown(self):
+        super().shutdown()
+        if self._dispatch_executor is not None:
+            with self._dispatch_lock:
+                self._pending_requests.clear()
+            self._dispatch_executor.shutdown(wait=True)
@@ -16,7 +16,7 @@ from mephisto.operations.registry import (
     get_crowd_provider_from_type,
     get_valid_provider_types,
 )
-from typing import Mapping, Optional, Any, List, Dict, Union
+from typing import Mapping, Optional, Any, List, Dict, Tuple, Union
 import enum
 from mephisto.data_model.agent import Agent, OnboardingAgent
 from mephisto.data_model.unit import Unit
@@ -60,12 +60,15 @@ GET_TASK_RUN_LATENCY = DATABASE_LATENCY.labels(method="get_task_run")
 FIND_TASK_RUNS_LATENCY = DATABASE_LATENCY.labels(method="find_task_runs")
 UPDATE_TASK_RUN_LATENCY = DATABASE_LATENCY.labels(method="update_task_run")
 NEW_ASSIGNMENT_LATENCY = DATABASE_LATENCY.labels(method="new_assignment")
+NEW_ASSIGNMENTS_BATCH_LATENCY = DATABASE_LATENCY.labels(method="new_assignments_batch")
 GET_ASSIGNMENT_LATENCY = DATABASE_LATENCY.labels(method="get_assignment")
 FIND_ASSIGNMENTS_LATENCY = DATABASE_LATENCY.labels(method="find_assignments")
 NEW_UNIT_LATENCY = DATABASE_LATENCY.labels(method="new_unit")
+NEW_UNITS_BATCH_LATENCY = DATABASE_LATENCY.labels(method="new_units_batch")
 GET_UNIT_LATENCY = DATABASE_LATENCY.labels(method="get_unit")
 FIND_UNITS_LATENCY = DATABASE_LATENCY.labels(method="find_units")
 UPDATE_UNIT_LATENCY = DATABASE_LATENCY.labels(method="update_unit")
+GET_UNIT_COUNTS_BY_WORKER_LATENCY = DATABASE_LATENCY.labels(method="get_unit_counts_by_worker")
 NEW_REQUESTER_LATENCY = DATABASE_LATENCY.labels(method="new_requester")
 GET_REQUESTER_LATENCY = DATABASE_LATENCY.labels(method="get_requester")
 FIND_REQUESTERS_LATENCY = DATABASE_LATENCY.labels(method="find_requesters")
@@ -94,6 +97,7 @@ GET_GRANTED_QUALIFICATION_LATENCY = DATABASE_LATENCY.labels(method="get_granted_
 REVOKE_QUALIFICATION_LATENCY = DATABASE_LATENCY.labels(method="revoke_qualification")
 NEW_UNIT_REVIEW_LATENCY = DATABASE_LATENCY.labels(method="new_unit_review")
 UPDATE_UNIT_REVIEW_LATENCY = DATABASE_LATENCY.labels(method="update_unit_review")
+GET_UNIT_REVIEW_STATS_LATENCY = DATABASE_LATENCY.labels(method="get_unit_review_stats")
 
 
 class MephistoDB(ABC):
@@ -420,6 +424,64 @@ class MephistoDB(ABC):
             sandbox=sandbox,
         )
 
+    def _new_assignments_batch(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        new_assignments_batch implementation. Databases that can insert many
+        rows in a single transaction should override this default, which
+        creates and loads the assignments one at a time.
+        """
+        return [
+            self._get_assignment(
+                self._new_assignment(
+                    task_id=task_id,
+                    task_run_id=task_run_id,
+                    requester_id=requester_id,
+                    task_type=task_type,
+                    provider_type=provider_type,
+                    sandbox=sandbox,
+                )
+            )
+            for _ in range(count)
+        ]
+
+    @NEW_ASSIGNMENTS_BATCH_LATENCY.time()
+    def new_assignments_batch(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Create `count` new assignments for the given task, returning their rows
+        in creation order, so callers don't need to load each one again.
+
+        Assignments should not be edited or altered once created
+        """
+        if count == 0:
+            return []
+        return self._new_assignments_batch(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            task_type=task_type,
+            provider_type=provider_type,
+            count=count,
+            sandbox=sandbox,
+        )
+
     @abstractmethod
     def _get_assignment(self, assignment_id: str) -> Mapping[str, Any]:
         """get_assignment implementation"""
@@ -516,6 +578,70 @@ class MephistoDB(ABC):
             sandbox=sandbox,
         )
 
+    def _new_units_batch(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_specs: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        new_units_batch implementation. Databases that can insert many
+        rows in a single transaction should override this default, which
+        creates and loads the units one at a time.
+        """
+        return [
+            self._get_unit(
+                self._new_unit(
+                    task_id=task_id,
+                    task_run_id=task_run_id,
+                    requester_id=requester_id,
+                    assignment_id=assignment_id,
+                    unit_index=unit_index,
+                    pay_amount=pay_amount,
+                    provider_type=provider_type,
+                    task_type=task_type,
+                    sandbox=sandbox,
+                )
+            )
+            for assignment_id, unit_index in unit_specs
+        ]
+
+    @NEW_UNITS_BATCH_LATENCY.time()
+    def new_units_batch(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_specs: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Create a new unit for every (assignment_id, unit_index) pair in unit_specs,
+        returning their rows in the same order. Raises EntryAlreadyExistsException
+        if any assignment already has a unit with the given index, in which case
+        none of the units should be created.
+        """
+        if len(unit_specs) == 0:
+            return []
+        return self._new_units_batch(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            unit_specs=unit_specs,
+            pay_amount=pay_amount,
+            provider_type=provider_type,
+            task_type=task_type,
+            sandbox=sandbox,
+        )
+
     @abstractmethod
     def _get_unit(self, unit_id: str) -> Mapping[str, Any]:
         """get_unit implementation"""
@@ -611,6 +737,40 @@ class MephistoDB(ABC):
         """
         return self._update_unit(unit_id=unit_id, status=status)
 
+    def _get_unit_counts_by_worker(
+        self,
+        task_ids: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        get_unit_counts_by_worker implementation. Databases that can aggregate
+        in a query should override this default, which loads every unit.
+        """
+        if task_ids is None:
+            units = self.find_units()
+        else:
+            units = [unit for task_id in task_ids for unit in self.find_units(task_id=task_id)]
+        counts_by_worker: Dict[str, Dict[str, int]] = {}
+        for unit in units:
+            if unit.worker_id is None or (statuses is not None and unit.db_status not in statuses):
+                continue
+            worker_counts = counts_by_worker.setdefault(unit.worker_id, {})
+            worker_counts[unit.db_status] = worker_counts.get(unit.db_status, 0) + 1
+        return counts_by_worker
+
+    @GET_UNIT_COUNTS_BY_WORKER_LATENCY.time()
+    def get_unit_counts_by_worker(
+        self,
+        task_ids: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Return a mapping from worker id to the number of their units in each
+        status, as last stored in the database. Only counts units of the given
+        tasks and in the given statuses if provided.
+        """
+        return self._get_unit_counts_by_worker(task_ids=task_ids, statuses=statuses)
+
     @abstractmethod
     def _new_requester(self, requester_name: str, provider_type: str) -> str:
         """new_requester implementation"""
@@ -1099,6 +1259,32 @@ class MephistoDB(ABC):
         """
         return self._update_unit_review(unit_id, qualification_id, worker_id, value, revoke)
 
+    def _get_unit_review_stats(
+        self,
+        task_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """get_unit_review_stats implementation"""
+        raise NotImplementedError()
+
+    @GET_UNIT_REVIEW_STATS_LATENCY.time()
+    def get_unit_review_stats(
+        self,
+        task_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Return the number of completed units matching the given filters as total_count,
+        along with how many of their reviews were approved, rejected or soft rejected,
+        and the sum of these as reviewed_count. Only units and reviews created at or
+        after since are counted, and each count is capped at limit if it's given.
+        """
+        return self._get_unit_review_stats(task_id, worker_id, since, limit)
+
     # File/blob manipulation methods
 
     @abstractmethod
@@ -1121,6 +1307,16 @@ class MephistoDB(ABC):
         """Get text data stored at the given key"""
         raise NotImplementedError()
 
+    def append_text(self, path_key: str, data_string: str):
+        """
+        Append the given text to the given key, creating it if it doesn't exist.
+
+        Databases that can append in place should override this default, which
+        rewrites the whole key.
+        """
+        existing = self.read_text(path_key) if self.key_exists(path_key) else ""
+        self.write_text(path_key, existing + data_string)
+
     @abstractmethod
     def key_exists(self, path_key: str) -> bool:
         """See if the given path refers to a known file"""
@@ -10,7 +10,7 @@ from mephisto.abstractions.database import (
     EntryAlreadyExistsException,
     EntryDoesNotExistException,
 )
-from typing import Mapping, Optional, Any, List, Dict, Tuple, Union
+from typing import Mapping, Optional, Any, List, Dict, Tuple, Union, ContextManager
 from mephisto.operations.registry import get_valid_provider_types
 from mephisto.data_model.agent import Agent, AgentState, OnboardingAgent
 from mephisto.data_model.unit import Unit
@@ -23,6 +23,7 @@ from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.worker import Worker
 from mephisto.data_model.qualification import Qualification, GrantedQualification
 
+import contextlib
 import sqlite3
 from sqlite3 import Connection
 import threading
@@ -246,9 +247,23 @@ CREATE INDEX IF NOT EXISTS assignment_by_task_run_index ON assignments(task_run_
 CREATE INDEX IF NOT EXISTS task_run_by_requester_index ON task_runs(requester_id);
 CREATE INDEX IF NOT EXISTS task_run_by_task_index ON task_runs(task_id);
 CREATE INDEX IF NOT EXISTS unit_review_by_unit_index ON unit_review(unit_id);
+CREATE INDEX IF NOT EXISTS unit_review_by_task_by_worker_by_status_index ON unit_review(task_id, worker_id, status, created_at);
+CREATE INDEX IF NOT EXISTS unit_by_task_by_worker_by_status_index ON units(task_id, worker_id, status, creation_date);
 """
 
 
+# Concurrency modes supported by the LocalMephistoDB. "locked" serializes every
+# query behind a single lock, while "wal" runs SQLite in write-ahead logging mode
+# so that reads are lock-free and only writes are serialized.
+CONCURRENCY_MODE_LOCKED = "locked"
+CONCURRENCY_MODE_WAL = "wal"
+VALID_CONCURRENCY_MODES = [CONCURRENCY_MODE_LOCKED, CONCURRENCY_MODE_WAL]
+
+# Time a connection waits on a held SQLite lock (i.e. during a WAL checkpoint)
+# before raising, rather than failing immediately
+SQLITE_BUSY_TIMEOUT_SECONDS = 30
+
+
 class StringIDRow(sqlite3.Row):
     def __getitem__(self, key: str) -> Any:
         val = super().__getitem__(key)
@@ -265,10 +280,31 @@ class LocalMephistoDB(MephistoDB):
     local files and a database.
     """
 
-    def __init__(self, database_path=None):
-        logger.debug(f"database path: {database_path}")
+    def __init__(self, database_path=None, concurrency_mode: str = CONCURRENCY_MODE_LOCKED):
+        logger.debug(f"database path: {database_path}, concurrency mode: {concurrency_mode}")
+        if concurrency_mode not in VALID_CONCURRENCY_MODES:
+            raise MephistoDBException(
+                f"Supplied concurrency mode {concurrency_mode} is not in supported "
+                f"list of modes {VALID_CONCURRENCY_MODES}."
+            )
+        self.concurrency_mode = concurrency_mode
         self.conn: Dict[int, Connection] = {}
+        # All writes are serialized through the table access condition. In the
+        # locked mode reads take it too, while in WAL mode readers work off their
+        # own snapshot on a per-thread connection and never wait on the writer.
         self.table_access_condition = threading.Condition()
+        self._read_access_condition: ContextManager[Any] = (
+            contextlib.nullcontext()
+            if concurrency_mode == CONCURRENCY_MODE_WAL
+            else self.table_access_condition
+        )
+        # Review stats by task_id (None for all tasks), then by the remaining filters.
+        # Entries for a task are dropped whenever this database writes a review or
+        # a unit status for it, and all of them whenever the files change on disk
+        self._unit_review_stats_cache: Dict[Optional[int], Dict[Tuple[Any, ...], Any]] = {}
+        self._unit_review_stats_lock = threading.Lock()
+        self._unit_review_stats_generation = 0
+        self._unit_review_stats_file_version: Optional[Tuple[int, ...]] = None
         super().__init__(database_path)
 
     def _get_connection(self) -> Connection:
@@ -278,8 +314,16 @@ class LocalMephistoDB(MephistoDB):
         curr_thread = threading.get_ident()
         if curr_thread not in self.conn or self.conn[curr_thread] is None:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = sqlite3.connect(
+                    self.db_path,
+                    check_same_thread=False,
+                    timeout=SQLITE_BUSY_TIMEOUT_SECONDS,
+                )
                 conn.row_factory = StringIDRow
+                if self.concurrency_mode == CONCURRENCY_MODE_WAL:
+                    # Durability is still guaranteed at checkpoints, and WAL
+                    # commits no longer need an fsync each
+                    conn.execute("PRAGMA synchronous = NORMAL")
                 self.conn[curr_thread] = conn
             except sqlite3.Error as e:
                 raise MephistoDBException(e)
@@ -299,6 +343,10 @@ class LocalMephistoDB(MephistoDB):
         with self.table_access_condition:
             conn = self._get_connection()
             conn.execute("PRAGMA foreign_keys = 1")
+            if self.concurrency_mode == CONCURRENCY_MODE_WAL:
+                # Journal mode is persistent, so setting it once covers every
+                # connection opened on this file afterwards
+                conn.execute("PRAGMA journal_mode = WAL")
             with conn:
                 c = conn.cursor()
                 c.execute(CREATE_PROJECTS_TABLE)
@@ -320,7 +368,7 @@ class LocalMephistoDB(MephistoDB):
         Try to request the row for the given table and entry,
         raise EntryDoesNotExistException if it isn't present
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             c.execute(
@@ -396,7 +444,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any project that matches the above. When called with no arguments,
         return all projects.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -468,7 +516,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task that matches the above. When called with no arguments,
         return all tasks.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -593,7 +641,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task_run that matches the above. When called with no arguments,
         return all task_runs.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -666,6 +714,63 @@ class LocalMephistoDB(MephistoDB):
             assignment_id = str(c.lastrowid)
             return assignment_id
 
+    def _new_assignments_batch(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """Create count new assignments for the given task in a single transaction"""
+        # Ensure task run exists
+        self.get_task_run(task_run_id)
+        row = (
+            int(task_id),
+            int(task_run_id),
+            int(requester_id),
+            task_type,
+            provider_type,
+            sandbox,
+        )
+        with self.table_access_condition, self._get_connection() as conn:
+            c = conn.cursor()
+            c.executemany(
+                """
+                INSERT INTO assignments(
+                    task_id,
+                    task_run_id,
+                    requester_id,
+                    task_type,
+                    provider_type,
+                    sandbox
+                ) VALUES (?, ?, ?, ?, ?, ?);""",
+                (row for _ in range(count)),
+            )
+            return self.__get_batch_inserted_rows(c, "assignments", "assignment_id", count)
+
+    def __get_batch_inserted_rows(
+        self, c: sqlite3.Cursor, table_name: str, id_name: str, count: int
+    ) -> List[Mapping[str, Any]]:
+        """
+        Return the last count rows inserted into the table in the current transaction.
+        As the write lock is held for the whole transaction and all tables use
+        AUTOINCREMENT keys, the ids of rows inserted by one executemany are consecutive.
+        """
+        c.execute("SELECT last_insert_rowid() AS last_rowid;")
+        last_id = c.fetchone()["last_rowid"]
+        c.execute(
+            f"""
+            SELECT * FROM {table_name}
+            WHERE ({id_name} BETWEEN ? AND ?)
+            ORDER BY {id_name}
+            """,
+            (last_id - count + 1, last_id),
+        )
+        return c.fetchall()
+
     def _get_assignment(self, assignment_id: str) -> Mapping[str, Any]:
         """
         Return assignment's fields by assignment_id, raise EntryDoesNotExistException
@@ -688,7 +793,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task that matches the above. When called with no arguments,
         return all tasks.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -775,6 +880,62 @@ class LocalMephistoDB(MephistoDB):
                     raise EntryAlreadyExistsException(e)
                 raise MephistoDBException(e)
 
+    def _new_units_batch(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_specs: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Create a unit for every (assignment_id, unit_index) pair in a single
+        transaction. Raises EntryAlreadyExistsException, and creates none of
+        the units, if any of the pairs already exists.
+        """
+        with self.table_access_condition, self._get_connection() as conn:
+            c = conn.cursor()
+            try:
+                c.executemany(
+                    """INSERT INTO units(
+                        task_id,
+                        task_run_id,
+                        requester_id,
+                        assignment_id,
+                        unit_index,
+                        pay_amount,
+                        provider_type,
+                        task_type,
+                        sandbox,
+                        status
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
+                    (
+                        (
+                            int(task_id),
+                            int(task_run_id),
+                            int(requester_id),
+                            int(assignment_id),
+                            unit_index,
+                            pay_amount,
+                            provider_type,
+                            task_type,
+                            sandbox,
+                            AssignmentState.CREATED,
+                        )
+                        for assignment_id, unit_index in unit_specs
+                    ),
+                )
+                return self.__get_batch_inserted_rows(c, "units", "unit_id", len(unit_specs))
+            except sqlite3.IntegrityError as e:
+                if is_key_failure(e):
+                    raise EntryDoesNotExistException(e)
+                elif is_unique_failure(e):
+                    raise EntryAlreadyExistsException(e)
+                raise MephistoDBException(e)
+
     def _get_unit(self, unit_id: str) -> Mapping[str, Any]:
         """
         Return unit's fields by unit_id, raise EntryDoesNotExistException
@@ -802,7 +963,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any unit that matches the above. When called with no arguments,
         return all units.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -901,6 +1062,9 @@ class LocalMephistoDB(MephistoDB):
                         f"Given unit_id {unit_id} not found in the database"
                     )
                 raise MephistoDBException(e)
+        if status is not None:
+            # Completed unit counts are cached by task, which isn't known here
+            self._invalidate_unit_review_stats()
 
     def _new_requester(self, requester_name: str, provider_type: str) -> str:
         """
@@ -941,7 +1105,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any requester that matches the above. When called with no arguments,
         return all requesters.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -1001,7 +1165,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any worker that matches the above. When called with no arguments,
         return all workers.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -1120,7 +1284,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any agent that matches the above. When called with no arguments,
         return all agents.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -1180,7 +1344,7 @@ class LocalMephistoDB(MephistoDB):
         """
         Find a qualification. If no name is supplied, returns all qualifications.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -1281,7 +1445,7 @@ class LocalMephistoDB(MephistoDB):
         """
         Find granted qualifications that match the given specifications
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             c.execute(
@@ -1313,7 +1477,7 @@ class LocalMephistoDB(MephistoDB):
 
         See GrantedQualification for the expected fields for the returned mapping
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             c.execute(
@@ -1419,7 +1583,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any onboarding agent that matches the above. When called with no arguments,
         return all onboarding agents.
         """
-        with self.table_access_condition:
+        with self._read_access_condition:
             conn = self._get_connection()
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
@@ -1486,6 +1650,7 @@ class LocalMephistoDB(MephistoDB):
                 ),
             )
             conn.commit()
+        self._invalidate_unit_review_stats(task_id)
 
     def _update_unit_review(
         self,
@@ -1536,6 +1701,148 @@ class LocalMephistoDB(MephistoDB):
                 ),
             )
             conn.commit()
+        self._invalidate_unit_review_stats(results[-1]["task_id"])
+
+    def _get_file_version(self) -> Tuple[int, ...]:
+        """
+        Return the modification times of the database files, which change whenever
+        any connection, including those of other processes, commits a write
+        """
+        file_version = []
+        for path in [self.db_path, f"{self.db_path}-wal"]:
+            try:
+                file_version.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                file_version.append(0)
+        return tuple(file_version)
+
+    def _invalidate_unit_review_stats(self, task_id: Optional[Union[int, str]] = None) -> None:
+        """Drop the cached review stats for the given task, or for every task if None"""
+        with self._unit_review_stats_lock:
+            self._unit_review_stats_generation += 1
+            if task_id is None:
+                self._unit_review_stats_cache.clear()
+            else:
+                self._unit_review_stats_cache.pop(nonesafe_int(task_id), None)
+                self._unit_review_stats_cache.pop(None, None)
+
+    def _get_unit_review_stats(
+        self,
+        task_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Count the completed units and their reviews by status in a single query,
+        caching the result until a write could have changed it
+        """
+        task_key = nonesafe_int(task_id)
+        filters_key = (nonesafe_int(worker_id), since, limit)
+        file_version = self._get_file_version()
+        with self._unit_review_stats_lock:
+            if file_version != self._unit_review_stats_file_version:
+                self._unit_review_stats_cache.clear()
+                self._unit_review_stats_file_version = file_version
+            cached_stats = self._unit_review_stats_cache.get(task_key, {}).get(filters_key)
+            if cached_stats is not None:
+                return dict(cached_stats)
+            generation = self._unit_review_stats_generation
+
+        def get_conditions(date_column: str) -> Tuple[List[str], List[Any]]:
+            conditions = []
+            params: List[Any] = []
+            for condition, value in [
+                ("task_id = ?", task_key),
+                ("worker_id = ?", filters_key[0]),
+                (f"{date_column} >= ?", since),
+            ]:
+                if value is not None:
+                    conditions.append(condition)
+                    params.append(value)
+            return conditions, params
+
+        review_conditions, review_params = get_conditions("created_at")
+        unit_conditions, unit_params = get_conditions("creation_date")
+        completed_statuses = AssignmentState.completed()
+        unit_conditions.append(f"status IN ({', '.join('?' * len(completed_statuses))})")
+        unit_params += completed_statuses
+        review_where = f"WHERE {' AND '.join(review_conditions)}" if review_conditions else ""
+
+        with self._read_access_condition:
+            conn = self._get_connection()
+            c = conn.cursor()
+            c.execute(
+                f"""
+                SELECT 'unit_review' AS source, status, COUNT(*) AS count FROM unit_review
+                {review_where}
+                GROUP BY status
+                UNION ALL
+                SELECT 'units' AS source, NULL AS status, COUNT(*) AS count FROM units
+                WHERE {' AND '.join(unit_conditions)};
+                """,
+                review_params + unit_params,
+            )
+            rows = c.fetchall()
+
+        review_counts = {r["status"]: r["count"] for r in rows if r["source"] == "unit_review"}
+        total_count = sum(r["count"] for r in rows if r["source"] == "units")
+
+        def capped(count: int) -> int:
+            # Each count only covers the first `limit` entries that match the filters
+            return count if limit is None else min(count, limit)
+
+        stats = {
+            "total_count": capped(total_count),
+            "approved_count": capped(review_counts.get(AgentState.STATUS_APPROVED, 0)),
+            "rejected_count": capped(review_counts.get(AgentState.STATUS_REJECTED, 0)),
+            "soft_rejected_count": capped(review_counts.get(AgentState.STATUS_SOFT_REJECTED, 0)),
+        }
+        stats["reviewed_count"] = (
+            stats["approved_count"] + stats["rejected_count"] + stats["soft_rejected_count"]
+        )
+
+        with self._unit_review_stats_lock:
+            # Counts read before an invalidation may already be out of date
+            if generation == self._unit_review_stats_generation:
+                self._unit_review_stats_cache.setdefault(task_key, {})[filters_key] = stats
+        return dict(stats)
+
+    def _get_unit_counts_by_worker(
+        self,
+        task_ids: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Count the units of every worker by status with one grouped query
+        """
+        conditions = ["worker_id IS NOT NULL"]
+        params: List[Any] = []
+        for column, values in [
+            ("task_id", None if task_ids is None else [nonesafe_int(i) for i in task_ids]),
+            ("status", statuses),
+        ]:
+            if values is not None:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params += values
+
+        with self._read_access_condition:
+            conn = self._get_connection()
+            c = conn.cursor()
+            c.execute(
+                f"""
+                SELECT worker_id, status, COUNT(*) AS count FROM units
+                WHERE {' AND '.join(conditions)}
+                GROUP BY worker_id, status;
+                """,
+                params,
+            )
+            rows = c.fetchall()
+
+        counts_by_worker: Dict[str, Dict[str, int]] = {}
+        for r in rows:
+            counts_by_worker.setdefault(str(r["worker_id"]), {})[r["status"]] = r["count"]
+        return counts_by_worker
 
     # File/blob manipulation methods
 
@@ -1571,6 +1878,13 @@ class LocalMephistoDB(MephistoDB):
         with open(path_key, "r") as data_file:
             return data_file.read()
 
+    def append_text(self, path_key: str, data_string: str):
+        """Append the given text to the given key, creating it if it doesn't exist"""
+        self._assert_path_in_domain(path_key)
+        os.makedirs(os.path.dirname(path_key), exist_ok=True)
+        with open(path_key, "a") as data_file:
+            data_file.write(data_string)
+
     def key_exists(self, path_key: str) -> bool:
         """See if the given path refers to a known file"""
         self._assert_path_in_domain(path_key)
@@ -10,8 +10,11 @@ from mephisto.abstractions.database import (
     EntryAlreadyExistsException,
     EntryDoesNotExistException,
 )
-from mephisto.abstractions.databases.local_database import LocalMephistoDB
-from typing import Mapping, Optional, Any, List, Dict
+from mephisto.abstractions.databases.local_database import (
+    LocalMephistoDB,
+    CONCURRENCY_MODE_LOCKED,
+)
+from typing import Mapping, Optional, Any, List, Dict, Tuple
 from mephisto.utils.dirs import get_data_dir
 from mephisto.operations.registry import get_valid_provider_types
 from mephisto.data_model.agent import Agent, AgentState, OnboardingAgent
@@ -28,15 +31,89 @@ from mephisto.data_model.qualification import Qualification, GrantedQualificatio
 import sqlite3
 from sqlite3 import Connection, Cursor
 import threading
-
-# We should be using WeakValueDictionary rather than a full dict once
-# we're better able to trade-off between memory and space.
-# from weakref import WeakValueDictionary
+from collections import OrderedDict
+from weakref import WeakValueDictionary
+from prometheus_client import Counter  # type: ignore
 
 from mephisto.utils.logger_core import get_logger
 
 logger = get_logger(name=__name__)
 
+# Number of recently used objects of each class kept loaded, even when unused
+DEFAULT_CACHE_SIZE = 10000
+
+SINGLETON_CACHE_EVENTS = Counter(
+    "singleton_db_cache_events",
+    "Hits, misses, and evictions of the MephistoSingletonDB caches",
+    ["cache", "event"],
+)
+
+
+class SingletonCache:
+    """
+    Cache of objects by id, that keeps at most max_size of them loaded.
+
+    The max_size most recently used objects are strongly referenced, and
+    evicted in least recently used order. With weak=True every other object
+    that's still in use elsewhere is kept weakly referenced too, so that
+    there's never more than one loaded object for an id.
+    """
+
+    def __init__(self, name: str, max_size: int = DEFAULT_CACHE_SIZE, weak: bool = True):
+        self.max_size = max_size
+        self._recent: "OrderedDict[str, Any]" = OrderedDict()
+        self._live: Optional["WeakValueDictionary[str, Any]"] = (
+            WeakValueDictionary() if weak else None
+        )
+        self._lock = threading.Lock()
+        self._hits = SINGLETON_CACHE_EVENTS.labels(cache=name, event="hit")
+        self._misses = SINGLETON_CACHE_EVENTS.labels(cache=name, event="miss")
+        self._evictions = SINGLETON_CACHE_EVENTS.labels(cache=name, event="eviction")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the object for the key if there's one loaded, marking it as used"""
+        with self._lock:
+            value = self._recent.get(key)
+            if value is not None:
+                self._recent.move_to_end(key)
+            elif self._live is not None:
+                value = self._live.get(key)
+                if value is not None:
+                    self._keep_recent(key, value)
+        if value is not None:
+            self._hits.inc()
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Cache the given object for the key, counted as a miss as it had to be loaded"""
+        with self._lock:
+            cached = self._live if self._live is not None else self._recent
+            if cached.get(key) is not value:
+                self._misses.inc()
+            if self._live is not None:
+                self._live[key] = value
+            self._keep_recent(key, value)
+
+    def pop(self, key: str) -> None:
+        """Drop any object cached for the key"""
+        with self._lock:
+            self._recent.pop(key, None)
+            if self._live is not None:
+                self._live.pop(key, None)
+
+    def __len__(self) -> int:
+        """Number of objects loaded in this cache"""
+        with self._lock:
+            return len(self._live) if self._live is not None else len(self._recent)
+
+    def _keep_recent(self, key: str, value: Any) -> None:
+        self._recent[key] = value
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_size:
+            self._recent.popitem(last=False)
+            self._evictions.inc()
+
+
 # Note: This class could be a generic factory around any MephistoDB, converting
 # the system to a singleton implementation. It requires all of the data being
 # updated locally though, so binding to LocalMephistoDB makes sense for now.
@@ -44,8 +121,8 @@ class MephistoSingletonDB(LocalMephistoDB):
     """
     Class that creates a singleton storage for all accessed data.
 
-    Tries to keep the data usage down with weak references, but it's
-    still subject to memory leaks.
+    Keeps the data usage down by only holding on to the cache_size most
+    recently used objects of each class, and weak references to the rest.
 
     This is a tradeoff to have more speed for not making db queries from disk
     """
@@ -64,12 +141,21 @@ class MephistoSingletonDB(LocalMephistoDB):
         Requester,
     ]
 
-    def __init__(self, database_path=None):
-        super().__init__(database_path=database_path)
+    def __init__(
+        self,
+        database_path=None,
+        concurrency_mode: str = CONCURRENCY_MODE_LOCKED,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        super().__init__(database_path=database_path, concurrency_mode=concurrency_mode)
 
-        # Create singleton dictionaries for entries
-        self._singleton_cache = {k: dict() for k in self._cached_classes}
-        self._assignment_to_unit_mapping: Dict[str, List[Unit]] = {}
+        # Create singleton caches for entries
+        self._singleton_cache = {
+            k: SingletonCache(k.__name__, max_size=cache_size) for k in self._cached_classes
+        }
+        self._assignment_to_unit_mapping = SingletonCache(
+            "assignment_units", max_size=cache_size, weak=False
+        )
 
     def shutdown(self) -> None:
         """Close all open connections"""
@@ -97,7 +183,7 @@ class MephistoSingletonDB(LocalMephistoDB):
         """Store the result of a load for caching reasons"""
         for stored_class in self._cached_classes:
             if issubclass(target_cls, stored_class):
-                self._singleton_cache[stored_class][value.db_id] = value
+                self._singleton_cache[stored_class].put(value.db_id, value)
                 break
         return None
 
@@ -173,7 +259,7 @@ class MephistoSingletonDB(LocalMephistoDB):
                 units = self._assignment_to_unit_mapping.get(assignment_id)
                 if units is None:
                     units = super()._find_units(assignment_id=assignment_id)
-                    self._assignment_to_unit_mapping[assignment_id] = units
+                    self._assignment_to_unit_mapping.put(assignment_id, units)
                 return units
 
         # Any other cases are less common and more complicated, and so we don't cache
@@ -207,8 +293,7 @@ class MephistoSingletonDB(LocalMephistoDB):
         Create a new unit with the given index. Raises EntryAlreadyExistsException
         if there is already a unit for the given assignment with the given index.
         """
-        if assignment_id in self._assignment_to_unit_mapping:
-            del self._assignment_to_unit_mapping[assignment_id]
+        self._assignment_to_unit_mapping.pop(assignment_id)
         return super()._new_unit(
             task_id=task_id,
             task_run_id=task_run_id,
@@ -220,3 +305,31 @@ class MephistoSingletonDB(LocalMephistoDB):
             task_type=task_type,
             sandbox=sandbox,
         )
+
+    def _new_units_batch(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_specs: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Create the batch of units, invalidating the cached unit lists of
+        every assignment that is getting new units
+        """
+        for assignment_id, _unit_index in unit_specs:
+            self._assignment_to_unit_mapping.pop(assignment_id)
+        return super()._new_units_batch(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            unit_specs=unit_specs,
+            pay_amount=pay_amount,
+            provider_type=provider_type,
+            task_type=task_type,
+            sandbox=sandbox,
+        )
@@ -77,3 +77,10 @@ class MockUnit(Unit):
     def new(db: "MephistoDB", assignment: "Assignment", index: int, pay_amount: float) -> "Unit":
         """Create a Unit for the given assignment"""
         return MockUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
+
+    @staticmethod
+    def new_batch(
+        db: "MephistoDB", unit_specs: List[Tuple["Assignment", int]], pay_amount: float
+    ) -> List["Unit"]:
+        """Create a Unit for every (assignment, index) pair in one batch"""
+        return MockUnit._register_units(db, unit_specs, pay_amount, PROVIDER_TYPE)
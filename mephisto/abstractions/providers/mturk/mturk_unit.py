@@ -361,6 +361,13 @@ class MTurkUnit(Unit):
         """Create a Unit for the given assignment"""
         return MTurkUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
 
+    @staticmethod
+    def new_batch(
+        db: "MephistoDB", unit_specs: List[Tuple["Assignment", int]], pay_amount: float
+    ) -> List["Unit"]:
+        """Create a Unit for every (assignment, index) pair in one batch"""
+        return MTurkUnit._register_units(db, unit_specs, pay_amount, PROVIDER_TYPE)
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}({self.db_id}, {self.get_mturk_hit_id()}, {self.db_status})"
@@ -8,7 +8,7 @@ from datetime import datetime
 
 from mephisto.abstractions.providers.mturk.mturk_unit import MTurkUnit
 from mephisto.abstractions.providers.mturk_sandbox.provider_type import PROVIDER_TYPE
-from typing import Any, TYPE_CHECKING
+from typing import Any, List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mephisto.data_model.unit import Unit
@@ -37,3 +37,10 @@ class SandboxMTurkUnit(MTurkUnit):
     def new(db: "MephistoDB", assignment: "Assignment", index: int, pay_amount: float) -> "Unit":
         """Create a Unit for the given assignment"""
         return SandboxMTurkUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
+
+    @staticmethod
+    def new_batch(
+        db: "MephistoDB", unit_specs: List[Tuple["Assignment", int]], pay_amount: float
+    ) -> List["Unit"]:
+        """Create a Unit for every (assignment, index) pair in one batch"""
+        return SandboxMTurkUnit._register_units(db, unit_specs, pay_amount, PROVIDER_TYPE)
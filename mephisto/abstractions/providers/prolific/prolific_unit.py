@@ -7,8 +7,10 @@
 import time
 from typing import Any
 from typing import cast
+from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import TYPE_CHECKING
 
 from mephisto.abstractions._subcomponents.agent_state import AgentState
@@ -409,3 +411,28 @@ class ProlificUnit(Unit):
         logger.debug(f"{ProlificUnit.log_prefix}Unit was created in datastore successfully!")
 
         return unit
+
+    @staticmethod
+    def new_batch(
+        db: "MephistoDB", unit_specs: List[Tuple["Assignment", int]], pay_amount: float
+    ) -> List["Unit"]:
+        """Create a Unit for every (assignment, index) pair in one batch"""
+        units = ProlificUnit._register_units(db, unit_specs, pay_amount, PROVIDER_TYPE)
+        if len(units) == 0:
+            return units
+
+        # Write units in provider-specific datastore
+        datastore: "ProlificDatastore" = db.get_datastore_for_provider(PROVIDER_TYPE)
+        task_run_id = unit_specs[0][0].task_run_id
+        task_run_details = dict(datastore.get_run(task_run_id))
+        for unit in units:
+            datastore.create_unit(
+                unit_id=unit.db_id,
+                run_id=task_run_id,
+                prolific_study_id=task_run_details["prolific_study_id"],
+            )
+        logger.debug(
+            f"{ProlificUnit.log_prefix}{len(units)} units were created in datastore successfully!"
+        )
+
+        return units
@@ -685,6 +685,83 @@ class BaseDatabaseTests(unittest.TestCase):
         units = db.find_units()
         self.assertEqual(len(units), 1)
 
+    def test_batch_creation(self) -> None:
+        """Test creating assignments and units in batches"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run_id = get_test_task_run(db)
+        task_run = TaskRun.get(db, task_run_id)
+        pay_amount = 15.0
+
+        assignment_rows = db.new_assignments_batch(
+            task_run.task_id,
+            task_run_id,
+            task_run.requester_id,
+            task_run.task_type,
+            task_run.provider_type,
+            3,
+            task_run.sandbox,
+        )
+        assignment_ids = [row["assignment_id"] for row in assignment_rows]
+        self.assertEqual(len(assignment_ids), 3)
+        self.assertEqual(len(set(assignment_ids)), 3)
+        for assignment_id in assignment_ids:
+            self.assertTrue(isinstance(assignment_id, str))
+            self.assertEqual(db.get_assignment(assignment_id)["task_run_id"], task_run_id)
+        self.assertEqual(
+            set(a.db_id for a in db.find_assignments(task_run_id=task_run_id)),
+            set(assignment_ids),
+        )
+
+        unit_specs = [(assignment_id, idx) for assignment_id in assignment_ids for idx in range(2)]
+        unit_rows = db.new_units_batch(
+            task_run.task_id,
+            task_run_id,
+            task_run.requester_id,
+            unit_specs,
+            pay_amount,
+            task_run.provider_type,
+            task_run.task_type,
+            task_run.sandbox,
+        )
+        self.assertEqual(len(unit_rows), len(unit_specs))
+        for unit_row, (assignment_id, unit_index) in zip(unit_rows, unit_specs):
+            self.assertEqual(dict(db.get_unit(unit_row["unit_id"])), dict(unit_row))
+            self.assertEqual(unit_row["assignment_id"], assignment_id)
+            self.assertEqual(unit_row["unit_index"], unit_index)
+            self.assertEqual(unit_row["pay_amount"], pay_amount)
+            self.assertEqual(unit_row["status"], AssignmentState.CREATED)
+        self.assertEqual(len(db.find_units(assignment_id=assignment_ids[0])), 2)
+
+        # A batch with an existing unit index should fail as a whole
+        with self.assertRaises(EntryAlreadyExistsException):
+            db.new_units_batch(
+                task_run.task_id,
+                task_run_id,
+                task_run.requester_id,
+                [(assignment_ids[0], 2), (assignment_ids[0], 0)],
+                pay_amount,
+                task_run.provider_type,
+                task_run.task_type,
+                task_run.sandbox,
+            )
+        self.assertEqual(len(db.find_units()), len(unit_specs))
+
+        # Empty batches are allowed and create nothing
+        self.assertEqual(
+            db.new_units_batch(
+                task_run.task_id,
+                task_run_id,
+                task_run.requester_id,
+                [],
+                pay_amount,
+                task_run.provider_type,
+                task_run.task_type,
+            ),
+            [],
+        )
+
     def test_unit_updates(self) -> None:
         """Test updating a unit's status"""
         assert self.db is not None, "No db initialized"
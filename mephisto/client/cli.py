@@ -50,6 +50,7 @@ from mephisto.utils.rich import create_table
 
 FORM_COMPOSER__DATA_DIR_NAME = "data"
 FORM_COMPOSER__DATA_CONFIG_NAME = "task_data.json"
+FORM_COMPOSER__DATA_JSONL_CONFIG_NAME = "task_data.jsonl"
 FORM_COMPOSER__FORM_CONFIG_NAME = "form_config.json"
 FORM_COMPOSER__TOKEN_SETS_VALUES_CONFIG_NAME = "token_sets_values_config.json"
 FORM_COMPOSER__SEPARATE_TOKEN_VALUES_CONFIG_NAME = "separate_token_values_config.json"
@@ -352,6 +353,68 @@ def metrics_cli(args):
         shutdown_grafana_server()
 
 
+@cli.group("bench", cls=RichGroup)
+def bench_cli():
+    """Measure the performance of Mephisto under load"""
+
+
+@bench_cli.command("live", cls=RichCommand)
+@click.option("-w", "--workers", type=(int), default=1000, help="Simulated workers")
+@click.option(
+    "-r",
+    "--arrival-rate",
+    type=(float),
+    default=100.0,
+    help="Workers arriving per second, 0 for all at once",
+)
+@click.option(
+    "-u",
+    "--live-updates",
+    type=(int),
+    default=3,
+    help="Live updates each worker sends before submitting",
+)
+@click.option(
+    "--onboarding/--no-onboarding", default=True, help="Have workers go through onboarding"
+)
+@click.option(
+    "-i",
+    "--sample-interval",
+    type=(float),
+    default=1.0,
+    help="Seconds between samples of the RSS and thread counts",
+)
+@click.option("-t", "--timeout", type=(int), default=600, help="Seconds to wait for all workers")
+@click.option("-o", "--output", type=(str), default=None, help="File to write the JSON report to")
+def bench_live(
+    workers: int,
+    arrival_rate: float,
+    live_updates: int,
+    onboarding: bool,
+    sample_interval: float,
+    timeout: int,
+    output: Optional[str],
+):
+    """
+    Drive simulated workers through a live task run on the mock architect and
+    provider, and report the live server's latencies, throughput and resource use
+    """
+    from mephisto.scripts.benchmarks.live_server import run_live_benchmark
+    from mephisto.scripts.benchmarks.live_server import write_report
+
+    report = run_live_benchmark(
+        num_workers=workers,
+        arrival_rate=arrival_rate,
+        live_updates=live_updates,
+        use_onboarding=onboarding,
+        sample_interval=sample_interval,
+        timeout=timeout,
+    )
+    write_report(report, output)
+    if output is not None:
+        print(f"[green]Live server benchmark report written to {output}[/green]")
+
+
 @cli.command("review_app", cls=RichCommand)
 @click.option("-h", "--host", type=(str), default="127.0.0.1")
 @click.option("-p", "--port", type=(int), default=5000)
@@ -461,6 +524,10 @@ def form_composer(task_data_config_only: bool = True):
     app_data_path = os.path.join(app_path, FORM_COMPOSER__DATA_DIR_NAME)
 
     task_data_config_path = os.path.join(app_data_path, FORM_COMPOSER__DATA_CONFIG_NAME)
+    task_data_jsonl_config_path = os.path.join(app_data_path, FORM_COMPOSER__DATA_JSONL_CONFIG_NAME)
+    if os.path.exists(task_data_jsonl_config_path):
+        # The task reads JSONL task data config instead, when there is one
+        task_data_config_path = task_data_jsonl_config_path
 
     # Change dir to app dir
     os.chdir(app_path)
@@ -491,6 +558,7 @@ def form_composer(task_data_config_only: bool = True):
 @click.option("-p", "--permutate-separate-tokens", type=(bool), default=False, is_flag=True)
 @click.option("-d", "--directory", type=(str), default=None)
 @click.option("-u", "--use-presigned-urls", type=(bool), default=False, is_flag=True)
+@click.option("-j", "--jsonl", type=(bool), default=False, is_flag=True)
 def form_composer_config(
     verify: Optional[bool] = False,
     update_file_location_values: Optional[str] = None,
@@ -498,6 +566,7 @@ def form_composer_config(
     permutate_separate_tokens: Optional[bool] = False,
     directory: Optional[str] = None,
     use_presigned_urls: Optional[bool] = False,
+    jsonl: Optional[bool] = False,
 ):
     """
     Prepare (parts of) config for the `form_composer` command.
@@ -514,6 +583,9 @@ def form_composer_config(
     :param use_presigned_urls: a modifier for `--update_file_location_values` parameter.
         Wraps every S3 URL with a standard handler that presigns these URLs during form rendering
         when we use `--update_file_location_values` command
+    :param jsonl: a modifier for `--extrapolate-token-sets` parameter.
+        Writes task data config as a JSONL file, one form version per line,
+        which the task reads lazily instead of loading all form versions at once
     """
 
     # Substitute defaults for missing param values
@@ -536,9 +608,17 @@ def form_composer_config(
         )
         return None
 
+    if jsonl and not extrapolate_token_sets:
+        print(
+            f"[red]Parameter `--jsonl` can be used "
+            f"only with `--extrapolate-token-sets` option[/red]"
+        )
+        return None
+
     # Check files and create `data.json` config with tokens data before running a task
     full_path = lambda data_file: os.path.join(app_data_path, data_file)
     task_data_config_path = full_path(FORM_COMPOSER__DATA_CONFIG_NAME)
+    task_data_jsonl_config_path = full_path(FORM_COMPOSER__DATA_JSONL_CONFIG_NAME)
     form_config_path = full_path(FORM_COMPOSER__FORM_CONFIG_NAME)
     token_sets_values_config_path = full_path(FORM_COMPOSER__TOKEN_SETS_VALUES_CONFIG_NAME)
     separate_token_values_config_path = full_path(FORM_COMPOSER__SEPARATE_TOKEN_VALUES_CONFIG_NAME)
@@ -586,11 +666,20 @@ def form_composer_config(
             f"[green]Started extrapolating token sets values "
             f"from '{FORM_COMPOSER__TOKEN_SETS_VALUES_CONFIG_NAME}' [/green]"
         )
+        if jsonl:
+            extrapolated_config_path = task_data_jsonl_config_path
+            stale_config_path = task_data_config_path
+        else:
+            extrapolated_config_path = task_data_config_path
+            stale_config_path = task_data_jsonl_config_path
         create_extrapolated_config(
             form_config_path=form_config_path,
             token_sets_values_config_path=token_sets_values_config_path,
-            task_data_config_path=task_data_config_path,
+            task_data_config_path=extrapolated_config_path,
         )
+        # Remove task data config in the other format, so that the task doesn't use it
+        if os.path.exists(stale_config_path):
+            os.remove(stale_config_path)
         print(f"[green]Finished successfully[/green]")
 
     else:
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+from collections import defaultdict, Counter
+from typing import DefaultDict, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from mephisto.abstractions._subcomponents.agent_state import AgentState
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.utils.status_events import (
+    StatusChangeEvent,
+    event_releases_unit,
+    STATUS_EVENT_UNIT,
+)
+
+if TYPE_CHECKING:
+    from mephisto.abstractions.database import MephistoDB
+    from mephisto.data_model.unit import Unit
+
+# Unit status that a final agent status will eventually be synced to
+AGENT_TO_UNIT_STATUS = {
+    AgentState.STATUS_COMPLETED: AssignmentState.COMPLETED,
+    AgentState.STATUS_SOFT_REJECTED: AssignmentState.SOFT_REJECTED,
+    AgentState.STATUS_EXPIRED: AssignmentState.EXPIRED,
+    AgentState.STATUS_APPROVED: AssignmentState.ACCEPTED,
+    AgentState.STATUS_REJECTED: AssignmentState.REJECTED,
+}
+
+
+class UnitAvailabilityIndex:
+    """
+    In-memory index of the units of a live task run that workers can be assigned to.
+
+    Launched units are bucketed by assignment, and the assignments and units each
+    worker holds are counted, all updated from status change events. This lets
+    TaskRun.get_valid_units_for_worker answer without loading the whole run.
+    """
+
+    def __init__(self, db: "MephistoDB", task_run_id: str, task_id: str):
+        self.db = db
+        self.task_run_id = task_run_id
+        self.task_id = task_id
+        self._lock = threading.RLock()
+        # unit_id -> (assignment_id, unit_index) for every unit seen in the run
+        self._unit_info: Dict[str, Tuple[str, int]] = {}
+        self._unit_status: Dict[str, str] = {}
+        self._unit_worker: Dict[str, str] = {}
+        # assignment_id -> {unit_id: Unit} for the launched, non-special units
+        self._launched_units: DefaultDict[str, Dict[str, "Unit"]] = defaultdict(dict)
+        # worker_id -> number of units they hold in each assignment
+        self._worker_assignments: DefaultDict[str, Counter] = defaultdict(Counter)
+        self._worker_active_units: DefaultDict[str, Set[str]] = defaultdict(set)
+        self._worker_completed_count: Counter = Counter()
+        # worker_id -> completed units in other runs of this task, loaded on first use
+        self._worker_completed_elsewhere: Dict[str, int] = {}
+        # Units reserved for a worker, which stay launched until their agent is created
+        self._reserved_units: Set[str] = set()
+
+    def seed(self) -> None:
+        """Load the current state of every unit in the run from the database"""
+        with self._lock:
+            for unit in self.db.find_units(task_run_id=self.task_run_id):
+                self._register_unit(unit)
+                if unit.worker_id is not None:
+                    self._set_unit_worker(unit.db_id, unit.worker_id)
+                self._set_unit_status(unit.db_id, unit.db_status, unit)
+
+    def handle_status_change(self, event: StatusChangeEvent) -> None:
+        """Update the index with a status change of one of the run's units or agents"""
+        from mephisto.data_model.unit import Unit
+
+        if event.entity_type == STATUS_EVENT_UNIT:
+            new_status = event.new_status
+        elif event_releases_unit(event, AssignmentState.incomplete()):
+            new_status = AGENT_TO_UNIT_STATUS[event.new_status]
+        else:
+            return
+
+        unit = None
+        if new_status == AssignmentState.LAUNCHED or event.unit_id not in self._unit_info:
+            # Loaded fresh, as the unit may be handed out to a worker
+            unit = Unit.get(self.db, event.unit_id)
+
+        with self._lock:
+            if unit is not None:
+                self._register_unit(unit)
+            old_status = self._unit_status.get(event.unit_id)
+            if new_status == AssignmentState.ASSIGNED and event.worker_id is not None:
+                self._set_unit_worker(event.unit_id, event.worker_id)
+            self._set_unit_status(event.unit_id, new_status, unit)
+            if old_status == AssignmentState.ASSIGNED and new_status == AssignmentState.LAUNCHED:
+                # Clearing an agent from a unit also clears its worker
+                self._set_unit_worker(event.unit_id, None)
+
+    def get_num_active_units(self, worker_id: str) -> int:
+        """Return the number of units the worker is currently assigned to in this run"""
+        with self._lock:
+            return len(self._worker_active_units.get(worker_id, ()))
+
+    def get_num_completed_units(self, worker_id: str) -> int:
+        """Return the number of units the worker has completed across this task"""
+        with self._lock:
+            if worker_id not in self._worker_completed_elsewhere:
+                completed_types = AssignmentState.completed()
+                related_units = self.db.find_units(task_id=self.task_id, worker_id=worker_id)
+                self._worker_completed_elsewhere[worker_id] = len(
+                    [
+                        u
+                        for u in related_units
+                        if u.task_run_id != self.task_run_id and u.db_status in completed_types
+                    ]
+                )
+            return (
+                self._worker_completed_elsewhere[worker_id]
+                + self._worker_completed_count[worker_id]
+            )
+
+    def set_unit_reserved(self, unit_id: str, reserved: bool) -> None:
+        """Hide a reserved unit from the available units, or show it again once cleared"""
+        with self._lock:
+            if reserved:
+                self._reserved_units.add(unit_id)
+            else:
+                self._reserved_units.discard(unit_id)
+
+    def get_available_units(
+        self,
+        worker_id: str,
+        limit: Optional[int] = None,
+        exclude_unit_ids: Optional[Set[str]] = None,
+    ) -> List["Unit"]:
+        """
+        Return the unreserved launched units that are in an assignment the worker
+        doesn't already hold a unit in (as workers can't pair with themselves),
+        skipping any excluded ones and stopping after the first `limit` found
+        when one is given
+        """
+        if exclude_unit_ids is None:
+            exclude_unit_ids = set()
+        units: List["Unit"] = []
+        with self._lock:
+            occupied = self._worker_assignments.get(worker_id, {})
+            for assignment_id, assignment_units in self._launched_units.items():
+                if occupied.get(assignment_id):
+                    continue
+                for unit_id, unit in assignment_units.items():
+                    if unit_id in self._reserved_units or unit_id in exclude_unit_ids:
+                        continue
+                    units.append(unit)
+                    if limit is not None and len(units) >= limit:
+                        return units
+        return units
+
+    def _register_unit(self, unit: "Unit") -> None:
+        """Note the assignment and index of a unit, must hold the lock"""
+        if unit.db_id not in self._unit_info:
+            self._unit_info[unit.db_id] = (unit.assignment_id, unit.unit_index)
+
+    def _set_unit_worker(self, unit_id: str, worker_id: Optional[str]) -> None:
+        """Move the given unit to a new worker (or none), must hold the lock"""
+        old_worker_id = self._unit_worker.get(unit_id)
+        if old_worker_id == worker_id:
+            return
+        assignment_id, _ = self._unit_info[unit_id]
+        status = self._unit_status.get(unit_id)
+        if old_worker_id is not None:
+            self._update_worker_counts(old_worker_id, unit_id, status, -1)
+            self._worker_assignments[old_worker_id][assignment_id] -= 1
+            del self._unit_worker[unit_id]
+        if worker_id is not None:
+            self._worker_assignments[worker_id][assignment_id] += 1
+            self._unit_worker[unit_id] = worker_id
+            self._update_worker_counts(worker_id, unit_id, status, 1)
+
+    def _set_unit_status(self, unit_id: str, status: str, unit: Optional["Unit"]) -> None:
+        """Move the given unit to a new status, must hold the lock"""
+        old_status = self._unit_status.get(unit_id)
+        if old_status == status:
+            return
+        assignment_id, unit_index = self._unit_info[unit_id]
+        worker_id = self._unit_worker.get(unit_id)
+        if worker_id is not None:
+            self._update_worker_counts(worker_id, unit_id, old_status, -1)
+        self._unit_status[unit_id] = status
+        if worker_id is not None:
+            self._update_worker_counts(worker_id, unit_id, status, 1)
+
+        if old_status == AssignmentState.LAUNCHED:
+            launched = self._launched_units[assignment_id]
+            launched.pop(unit_id, None)
+            if len(launched) == 0:
+                del self._launched_units[assignment_id]
+        if status == AssignmentState.LAUNCHED and unit_index >= 0 and unit is not None:
+            self._launched_units[assignment_id][unit_id] = unit
+
+    def _update_worker_counts(
+        self, worker_id: str, unit_id: str, status: Optional[str], change: int
+    ) -> None:
+        """Add or remove a unit in the given status from a worker's counts"""
+        if status == AssignmentState.ASSIGNED:
+            if change > 0:
+                self._worker_active_units[worker_id].add(unit_id)
+            else:
+                self._worker_active_units[worker_id].discard(unit_id)
+        elif status in AssignmentState.completed():
+            self._worker_completed_count[worker_id] += change
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import os
 import threading
+import weakref
 from queue import Queue
 from uuid import uuid4
 from prometheus_client import Gauge  # type: ignore
@@ -26,7 +27,7 @@ from mephisto.data_model.exceptions import (
     AgentShutdownError,
 )
 
-from typing import Optional, Mapping, Dict, Any, cast, TYPE_CHECKING, Union
+from typing import Optional, Mapping, Dict, Any, Callable, Tuple, cast, TYPE_CHECKING, Union
 
 try:
     from detoxify import Detoxify
@@ -44,6 +45,11 @@ if TYPE_CHECKING:
     from mephisto.operations.datatypes import LiveTaskRun
 
 from mephisto.utils.logger_core import get_logger, warn_once
+from mephisto.utils.status_events import (
+    status_event_bus,
+    StatusChangeEvent,
+    STATUS_EVENT_AGENT,
+)
 
 logger = get_logger(name=__name__)
 
@@ -62,6 +68,56 @@ ACTIVE_WORKERS = Gauge(
     ["worker_id", "agent_type"],
 )
 
+# Statuses that end any wait on an agent, as they won't be acting anymore
+WAIT_ENDING_STATUSES = [
+    AgentState.STATUS_DISCONNECT,
+    AgentState.STATUS_RETURNED,
+    AgentState.STATUS_TIMEOUT,
+    AgentState.STATUS_EXPIRED,
+]
+
+
+class _AgentSignal:
+    """
+    Wakes threads waiting on an agent whenever it gets a live update or a
+    submission, or its status changes. Shared by all of the in-process objects
+    for the same agent, so that a status update made through any of them
+    reaches threads waiting on the others.
+    """
+
+    def __init__(self, status: str):
+        self.condition = threading.Condition()
+        self.status = status
+
+    def notify(self, status: Optional[str] = None) -> None:
+        """Wake all waiting threads, recording the agent's new status if given"""
+        with self.condition:
+            if status is not None:
+                self.status = status
+            self.condition.notify_all()
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: Optional[float]) -> bool:
+        """Block until the predicate is true or the timeout passes, returning the predicate"""
+        with self.condition:
+            return self.condition.wait_for(predicate, timeout)
+
+
+# Map from (db, agent id) to the signal for the agent, kept while any object uses it
+_agent_signals: "weakref.WeakValueDictionary[Tuple[int, str], _AgentSignal]" = (
+    weakref.WeakValueDictionary()
+)
+_agent_signals_lock = threading.Lock()
+
+
+def _get_agent_signal(db: "MephistoDB", agent_id: str, status: str) -> _AgentSignal:
+    """Get the signal shared by the in-process objects for the given agent"""
+    with _agent_signals_lock:
+        signal = _agent_signals.get((id(db), agent_id))
+        if signal is None:
+            signal = _AgentSignal(status)
+            _agent_signals[(id(db), agent_id)] = signal
+        return signal
+
 
 class _AgentBase(ABC):
     """
@@ -107,6 +163,7 @@ class _AgentBase(ABC):
         self.has_live_update.clear()
         self.did_submit = threading.Event()
         self.is_shutdown = False
+        self._signal = _get_agent_signal(db, self.get_agent_id(), self.db_status)
 
         # Follow-up initialization is deferred
         self._state = None  # type: ignore
@@ -182,22 +239,53 @@ class _AgentBase(ABC):
             live_run = self.get_live_run()
             live_run.client_io.send_live_update(self.get_agent_id(), live_update)
 
+    def _sync_signalled_status(self) -> None:
+        """Pick up a status change made through another object for this agent"""
+        status = self._signal.status
+        if status != self.db_status:
+            self.db_status = status
+            if status in WAIT_ENDING_STATUSES:
+                # Disconnect statuses should free any pending acts
+                self.has_live_update.set()
+                self.did_submit.set()
+
+    def _wait_for(self, predicate: Callable[[], bool], timeout: Optional[float]) -> bool:
+        """
+        Block until the predicate is true, the agent shuts down, or its status
+        changes to one that ends waits. Returns False only on timeout.
+        """
+        return self._signal.wait_for(
+            lambda: predicate() or self.is_shutdown or self._signal.status in WAIT_ENDING_STATUSES,
+            timeout,
+        )
+
+    def handle_live_update(self, live_update: Dict[str, Any]) -> None:
+        """Queue a live update from the Agent's frontend to be returned by get_live_update"""
+        self.pending_actions.put(live_update)
+        self.has_live_update.set()
+        self._signal.notify()
+
     def get_live_update(self, timeout: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Request information from the Agent's frontend. If non-blocking,
         (timeout is None) should return None if no actions are ready
         to be returned.
         """
+        woken = False
         if self.pending_actions.empty():
             if timeout is None or timeout == 0:
                 return None
-            self.has_live_update.wait(timeout)
+            woken = self._wait_for(lambda: not self.pending_actions.empty(), timeout)
 
         if self.pending_actions.empty():
             if self.is_shutdown:
                 raise AgentShutdownError(self.db_id)
-            # various disconnect cases
-            status = self.get_status()
+            # various disconnect cases, only checking the db if nothing woke the wait
+            if woken:
+                self._sync_signalled_status()
+                status = self.db_status
+            else:
+                status = self.get_status()
             logger.debug(f"Handling Agent status (get_live_update) - have `{status}`")
             if status == AgentState.STATUS_DISCONNECT:
                 raise AgentDisconnectedError(self.db_id)
@@ -233,7 +321,8 @@ class _AgentBase(ABC):
         """
 
         def _raise_if_disconnected():
-            status = self.get_status()
+            self._sync_signalled_status()
+            status = self.db_status
             logger.debug(f"Handling Agent status (await_submit) - have `{status}`")
             if status == AgentState.STATUS_DISCONNECT:
                 raise AgentDisconnectedError(self.db_id)
@@ -246,18 +335,29 @@ class _AgentBase(ABC):
             # Handle disconnect possibilities first
             _raise_if_disconnected()
             # Wait for the status change
-            self.did_submit.wait(timeout=timeout)
+            self._wait_for(self.did_submit.is_set, timeout)
+            self._sync_signalled_status()
             if not self.did_submit.is_set():
                 # If released without submit, raise timeout
                 raise AgentTimeoutError(timeout, self.db_id)
             # Check disconnect possibilities again
             _raise_if_disconnected()
+        self._sync_signalled_status()
         return self.did_submit.is_set()
 
+    def wait_for_submit(self) -> None:
+        """
+        Block until this agent submits their task, or stops working on it
+        by disconnecting, returning, timing out, or being shut down
+        """
+        self._wait_for(self.did_submit.is_set, None)
+        self._sync_signalled_status()
+
     def handle_submit(self, submit_data: Dict[str, Any]) -> None:
         """Handle final submission for an onboarding agent, with the given data"""
         self.did_submit.set()
         self.state.update_submit(submit_data)
+        self._signal.notify()
 
     def handle_metadata_submit(self, data: Dict[str, Any]) -> None:
         """Handles the submission of metadata (as of now that is tips and feedback)"""
@@ -323,6 +423,7 @@ class _AgentBase(ABC):
         self.has_live_update.set()
         self.did_submit.set()
         self.is_shutdown = True
+        self._signal.notify()
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.db_id}, {self.db_status})"
@@ -458,6 +559,7 @@ class Agent(_AgentBase, MephistoDataModelComponentMixin, metaclass=MephistoDBBac
         """Update the database status of this agent, and
         possibly send a message to the frontend agent informing
         them of this update"""
+        self._sync_signalled_status()
         if self.db_status == new_status:
             return  # Noop, this is already the case
         logger.debug(f"Updating {self} to {new_status}")
@@ -467,6 +569,18 @@ class Agent(_AgentBase, MephistoDataModelComponentMixin, metaclass=MephistoDBBac
         old_status = self.db_status
         self.db.update_agent(self.db_id, status=new_status)
         self.db_status = new_status
+        self._signal.notify(new_status)
+        status_event_bus.publish(
+            StatusChangeEvent(
+                entity_type=STATUS_EVENT_AGENT,
+                db_id=self.db_id,
+                task_run_id=self.task_run_id,
+                unit_id=self.unit_id,
+                old_status=old_status,
+                new_status=new_status,
+                worker_id=self.worker_id,
+            )
+        )
         if self.agent_in_active_run():
             live_run = self.get_live_run()
             live_run.loop_wrap.execute_coro(live_run.worker_pool.push_status_update(self))
@@ -498,6 +612,7 @@ class Agent(_AgentBase, MephistoDataModelComponentMixin, metaclass=MephistoDBBac
         """
         Create this agent in the mephisto db with the correct setup
         """
+        unit.worker_id = worker.db_id
         unit._mark_agent_assignment()
         db_id = db.new_agent(
             worker.db_id,
@@ -548,6 +663,7 @@ class Agent(_AgentBase, MephistoDataModelComponentMixin, metaclass=MephistoDBBac
                 if self.agent_in_active_run():
                     live_run = self.get_live_run()
                     live_run.loop_wrap.execute_coro(live_run.worker_pool.push_status_update(self))
+                self._signal.notify(row["status"])
             self.db_status = row["status"]
         return self.db_status
 
@@ -670,6 +786,7 @@ class OnboardingAgent(
         """Update the database status of this agent, and
         possibly send a message to the frontend agent informing
         them of this update"""
+        self._sync_signalled_status()
         if self.db_status == new_status:
             return  # Noop, this is already the case
 
@@ -680,6 +797,7 @@ class OnboardingAgent(
         old_status = self.db_status
         self.db.update_onboarding_agent(self.db_id, status=new_status)
         self.db_status = new_status
+        self._signal.notify(new_status)
         if self.agent_in_active_run():
             if new_status not in [
                 AgentState.STATUS_APPROVED,
@@ -718,6 +836,7 @@ class OnboardingAgent(
                         live_run.loop_wrap.execute_coro(
                             live_run.worker_pool.push_status_update(self)
                         )
+                self._signal.notify(row["status"])
             self.db_status = row["status"]
         return self.db_status
 
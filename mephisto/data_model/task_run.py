@@ -7,6 +7,8 @@
 
 import os
 import json
+import threading
+import time
 from dataclasses import dataclass, field
 
 from mephisto.data_model.requester import Requester
@@ -15,11 +17,18 @@ from mephisto.data_model._db_backed_meta import (
     MephistoDBBackedMeta,
     MephistoDataModelComponentMixin,
 )
+from mephisto.data_model._unit_availability_index import UnitAvailabilityIndex
 from mephisto.utils.dirs import get_dir_for_run
+from mephisto.utils.status_events import (
+    status_event_bus,
+    StatusChangeEvent,
+    event_releases_unit,
+    STATUS_EVENT_UNIT,
+)
 
 from omegaconf import OmegaConf, MISSING
 
-from typing import List, Optional, Dict, Mapping, TYPE_CHECKING, Any
+from typing import List, Optional, Dict, Mapping, Set, TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from mephisto.abstractions.database import MephistoDB
@@ -35,6 +44,11 @@ from mephisto.utils.logger_core import get_logger
 
 logger = get_logger(name=__name__)
 
+# Number of available units a worker is first offered from the availability index
+AVAILABLE_UNITS_BATCH_SIZE = 100
+
+DEFAULT_COMPLETION_RECONCILE_INTERVAL = 5 * 60
+
 
 @dataclass
 class TaskRunArgs:
@@ -126,6 +140,17 @@ class TaskRunArgs:
         },
     )
 
+    completion_reconcile_interval: int = field(
+        default=DEFAULT_COMPLETION_RECONCILE_INTERVAL,
+        metadata={
+            "help": (
+                "While a run is live, its completion is tracked from unit status changes. "
+                "This is how often (in seconds) that tracking is re-synced with a full "
+                "status query of all of the run's units."
+            )
+        },
+    )
+
     post_install_script: str = field(
         default="",
         metadata={
@@ -212,48 +237,102 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         self.__blueprint: Optional["Blueprint"] = None
         self.__crowd_provider: Optional["CrowdProvider"] = None
 
+        # completion tracking, only used while a run is live
+        self.__completion_tracking_lock = threading.Lock()
+        self.__is_tracking_completion = False
+        self.__incomplete_unit_ids: Optional[Set[str]] = None
+        self.__pending_status_events: Optional[List[StatusChangeEvent]] = None
+        self.__last_completion_reconcile = 0.0
+        self.__unit_availability_index: Optional[UnitAvailabilityIndex] = None
+
     def get_units(self) -> List["Unit"]:
         """
         Return the units associated with this task run.
         """
         return self.db.find_units(task_run_id=self.db_id)
 
-    def get_valid_units_for_worker(self, worker: "Worker") -> List["Unit"]:
+    def get_valid_units_for_worker(
+        self, worker: "Worker", exclude_unit_ids: Optional[Set[str]] = None
+    ) -> List["Unit"]:
         """
         Get any units that the given worker could work on in this
-        task run
+        task run, other than the excluded ones. While unit availability
+        is tracked only a batch of them is returned, so callers that
+        can't use any of it should ask again excluding the batch.
         """
+        if exclude_unit_ids is None:
+            exclude_unit_ids = set()
         config = self.get_task_args()
+        index = self.__unit_availability_index
 
         # TODO(#773) handle with temporary local qualifications to allow
         # pushing real exclusionary qualifications after exceeding
         # maximum_units_per_worker
         if config.allowed_concurrent != 0 or config.maximum_units_per_worker:
-            current_units = self.db.find_units(
-                task_run_id=self.db_id,
-                worker_id=worker.db_id,
-                status=AssignmentState.ASSIGNED,
-            )
-            currently_active = len(current_units)
+            if index is not None:
+                currently_active = index.get_num_active_units(worker.db_id)
+            else:
+                current_units = self.db.find_units(
+                    task_run_id=self.db_id,
+                    worker_id=worker.db_id,
+                    status=AssignmentState.ASSIGNED,
+                )
+                currently_active = len(current_units)
             if config.allowed_concurrent != 0:
                 if currently_active >= config.allowed_concurrent:
                     logger.debug(f"{worker} at maximum concurrent units {currently_active}")
                     return []  # currently at the maximum number of concurrent units
             if config.maximum_units_per_worker != 0:
-                completed_types = AssignmentState.completed()
-                related_units = self.db.find_units(
-                    task_id=self.task_id,
-                    worker_id=worker.db_id,
-                )
-                currently_completed = len(
-                    [u for u in related_units if u.db_status in completed_types]
-                )
+                if index is not None:
+                    currently_completed = index.get_num_completed_units(worker.db_id)
+                else:
+                    completed_types = AssignmentState.completed()
+                    related_units = self.db.find_units(
+                        task_id=self.task_id,
+                        worker_id=worker.db_id,
+                    )
+                    currently_completed = len(
+                        [u for u in related_units if u.db_status in completed_types]
+                    )
                 if currently_active + currently_completed >= config.maximum_units_per_worker:
                     logger.debug(
                         f"{worker} at maximum units {currently_active}, {currently_completed}"
                     )
                     return []  # Currently at the maximum number of units for this task
 
+        # Should load cached blueprint for SharedTaskState
+        blueprint = self.get_blueprint()
+        if index is not None:
+            # Launched units outside of the worker's assignments, kept up to date from events.
+            # Only a batch of them is offered, unless the worker can't do any unit of it
+            limit = AVAILABLE_UNITS_BATCH_SIZE
+            while True:
+                valid_units = index.get_available_units(
+                    worker.db_id, limit=limit, exclude_unit_ids=exclude_unit_ids
+                )
+                ret_units = [
+                    u for u in valid_units if blueprint.shared_state.worker_can_do_unit(worker, u)
+                ]
+                if len(ret_units) > 0 or len(valid_units) < limit:
+                    break
+                limit *= 2
+        else:
+            valid_units = [
+                u
+                for u in self._find_launched_units_for_worker(worker)
+                if u.db_id not in exclude_unit_ids
+            ]
+            ret_units = [
+                u for u in valid_units if blueprint.shared_state.worker_can_do_unit(worker, u)
+            ]
+        logger.debug(f"Found {len(valid_units)} available units")
+
+        logger.debug(f"This worker is qualified for {len(ret_units)} unit.")
+        logger.debug(f"Found {ret_units[:3]} for {worker}.")
+        return ret_units
+
+    def _find_launched_units_for_worker(self, worker: "Worker") -> List["Unit"]:
+        """Load every unit of the run to find launched ones outside of the worker's assignments"""
         task_units: List["Unit"] = self.get_units()
         unit_assigns: Dict[str, List["Unit"]] = {}
         for unit in task_units:
@@ -272,18 +351,28 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         # Valid units must be launched and must not be special units (negative indices)
         # Can use db_status directly rather than polling in the critical path, as in
         # the worst case we miss the transition from an active to launched unit
-        valid_units = [
-            u for u in units if u.db_status == AssignmentState.LAUNCHED and u.unit_index >= 0
-        ]
-        logger.debug(f"Found {len(valid_units)} available units")
+        return [u for u in units if u.db_status == AssignmentState.LAUNCHED and u.unit_index >= 0]
 
-        # Should load cached blueprint for SharedTaskState
-        blueprint = self.get_blueprint()
-        ret_units = [u for u in valid_units if blueprint.shared_state.worker_can_do_unit(worker, u)]
-
-        logger.debug(f"This worker is qualified for {len(ret_units)} unit.")
-        logger.debug(f"Found {ret_units[:3]} for {worker}.")
-        return ret_units
+    def start_unit_availability_tracking(self) -> None:
+        """
+        Keep an index of the units workers can be assigned to, updated from status
+        change events, such that finding valid units doesn't need to load the whole run
+        """
+        if self.__unit_availability_index is not None:
+            return
+        index = UnitAvailabilityIndex(self.db, self.db_id, self.task_id)
+        # Subscribe before seeding, such that no change is missed in between
+        status_event_bus.subscribe(self.db_id, index.handle_status_change)
+        index.seed()
+        self.__unit_availability_index = index
+
+    def stop_unit_availability_tracking(self) -> None:
+        """Drop the unit availability index, going back to loading every unit"""
+        index = self.__unit_availability_index
+        if index is None:
+            return
+        self.__unit_availability_index = None
+        status_event_bus.unsubscribe(self.db_id, index.handle_status_change)
 
     def clear_reservation(self, unit: "Unit") -> None:
         """
@@ -294,6 +383,9 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         if os.path.exists(os.path.join(write_dir, file_name)):
             os.unlink(os.path.join(write_dir, file_name))
             logger.debug(f"Cleared reservation {file_name} for {unit}")
+        index = self.__unit_availability_index
+        if index is not None:
+            index.set_unit_reserved(unit.db_id, False)
 
     def reserve_unit(self, unit: "Unit") -> Optional["Unit"]:
         """
@@ -303,6 +395,11 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         file_name = f"unit_res_{unit.db_id}"
         write_dir = os.path.join(self.get_run_dir(), "reservations")
         os.makedirs(write_dir, exist_ok=True)
+        index = self.__unit_availability_index
+        if index is not None:
+            # Reserved units aren't offered to other workers, whether this or
+            # another reservation holds them
+            index.set_unit_reserved(unit.db_id, True)
         try:
             with open(os.path.join(write_dir, file_name), "x") as res_file:
                 pass  # Creating the file is sufficient
@@ -413,14 +510,102 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         is not complete
         """
         if not self.__is_completed and self.get_has_assignments():
-            statuses = self.get_assignment_statuses()
-            has_incomplete = False
-            for status in AssignmentState.incomplete():
-                if statuses[status] > 0:
-                    has_incomplete = True
+            if self.__is_tracking_completion:
+                if self.assignments_generator_done is False:
+                    # More units may still be created, so the run can't be done yet
+                    return
+                has_incomplete = self._get_num_incomplete_units() > 0
+            else:
+                statuses = self.get_assignment_statuses()
+                has_incomplete = False
+                for status in AssignmentState.incomplete():
+                    if statuses[status] > 0:
+                        has_incomplete = True
             if not has_incomplete and self.assignments_generator_done is not False:
                 self.db.update_task_run(self.db_id, is_completed=True)
                 self.__is_completed = True
+                self.stop_completion_tracking()
+
+    def start_completion_tracking(self) -> None:
+        """
+        Track the number of incomplete units of this run from status change events,
+        such that checking for completion doesn't need to query every unit
+        """
+        with self.__completion_tracking_lock:
+            if self.__is_tracking_completion:
+                return
+            self.__is_tracking_completion = True
+            self.__incomplete_unit_ids = None
+        status_event_bus.subscribe(self.db_id, self._handle_status_change)
+
+    def stop_completion_tracking(self) -> None:
+        """Stop tracking completion from events, going back to querying every unit"""
+        with self.__completion_tracking_lock:
+            if not self.__is_tracking_completion:
+                return
+            self.__is_tracking_completion = False
+            self.__incomplete_unit_ids = None
+        status_event_bus.unsubscribe(self.db_id, self._handle_status_change)
+
+    def _handle_status_change(self, event: StatusChangeEvent) -> None:
+        """Update the tracked incomplete units from a status change in this run"""
+        with self.__completion_tracking_lock:
+            if self.__pending_status_events is not None:
+                # Units are currently being re-synced, apply this afterwards
+                self.__pending_status_events.append(event)
+            elif self.__incomplete_unit_ids is not None:
+                self._apply_status_change(event)
+
+    def _apply_status_change(self, event: StatusChangeEvent) -> None:
+        """Update the incomplete units with the event, must hold the tracking lock"""
+        assert self.__incomplete_unit_ids is not None
+        if event_releases_unit(event, AssignmentState.incomplete()):
+            self.__incomplete_unit_ids.discard(event.unit_id)
+        elif (
+            event.entity_type == STATUS_EVENT_UNIT
+            and event.new_status in AssignmentState.incomplete()
+        ):
+            self.__incomplete_unit_ids.add(event.unit_id)
+
+    def _get_num_incomplete_units(self) -> int:
+        """
+        Return the tracked number of incomplete units, seeding it from the
+        database on first use and re-syncing it every completion_reconcile_interval
+        """
+        reconcile_interval = self.get_task_args().get(
+            "completion_reconcile_interval", DEFAULT_COMPLETION_RECONCILE_INTERVAL
+        )
+        if (
+            self.__incomplete_unit_ids is None
+            or time.monotonic() - self.__last_completion_reconcile > reconcile_interval
+        ):
+            self._reconcile_incomplete_units()
+        assert self.__incomplete_unit_ids is not None
+        return len(self.__incomplete_unit_ids)
+
+    def _reconcile_incomplete_units(self) -> None:
+        """Rebuild the set of incomplete units by querying all of this run's units"""
+        with self.__completion_tracking_lock:
+            self.__pending_status_events = []
+        try:
+            incomplete_unit_ids = set(
+                unit.db_id
+                for unit in self.db.find_units(task_run_id=self.db_id)
+                if unit.get_status() in AssignmentState.incomplete()
+            )
+        except Exception:
+            with self.__completion_tracking_lock:
+                self.__pending_status_events = None
+            raise
+        with self.__completion_tracking_lock:
+            # Events that came in during the queries are at least as new as
+            # the statuses that were read, so they're applied on top
+            self.__incomplete_unit_ids = incomplete_unit_ids
+            assert self.__pending_status_events is not None
+            for event in self.__pending_status_events:
+                self._apply_status_change(event)
+            self.__pending_status_events = None
+        self.__last_completion_reconcile = time.monotonic()
 
     def get_run_dir(self) -> str:
         """
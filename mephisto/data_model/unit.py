@@ -10,7 +10,7 @@ from datetime import datetime
 
 from dateutil.parser import parse
 from prometheus_client import Gauge  # type: ignore
-from collections import defaultdict
+from collections import defaultdict, Counter
 from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.task import Task
 from mephisto.data_model.task_run import TaskRun
@@ -21,7 +21,17 @@ from mephisto.data_model._db_backed_meta import (
 )
 from mephisto.abstractions.blueprint import AgentState
 from mephisto.data_model.requester import Requester
-from typing import Optional, Mapping, Dict, Any, Type, DefaultDict, TYPE_CHECKING
+from typing import (
+    Optional,
+    Mapping,
+    Dict,
+    Any,
+    Type,
+    DefaultDict,
+    List,
+    Tuple,
+    TYPE_CHECKING,
+)
 
 if TYPE_CHECKING:
     from mephisto.abstractions.database import MephistoDB
@@ -32,6 +42,11 @@ if TYPE_CHECKING:
 import os
 
 from mephisto.utils.logger_core import get_logger
+from mephisto.utils.status_events import (
+    status_event_bus,
+    StatusChangeEvent,
+    STATUS_EVENT_UNIT,
+)
 
 logger = get_logger(name=__name__)
 
@@ -180,8 +195,24 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         ACTIVE_UNIT_STATUSES.labels(
             status=status, unit_type=INDEX_TO_TYPE_MAP[self.unit_index]
         ).inc()
+        old_status = self.db_status
         self.db_status = status
         self.db.update_unit(self.db_id, status=status)
+        self._publish_status_change(old_status, status)
+
+    def _publish_status_change(self, old_status: str, new_status: str) -> None:
+        """Let subscribers tracking this unit's run know about a status transition"""
+        status_event_bus.publish(
+            StatusChangeEvent(
+                entity_type=STATUS_EVENT_UNIT,
+                db_id=self.db_id,
+                task_run_id=self.task_run_id,
+                unit_id=self.db_id,
+                old_status=old_status,
+                new_status=new_status,
+                worker_id=self.worker_id,
+            )
+        )
 
     def _mark_agent_assignment(self) -> None:
         """Special helper to mark the transition from LAUNCHED to ASSIGNED"""
@@ -194,6 +225,8 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
             status=AssignmentState.ASSIGNED,
             unit_type=INDEX_TO_TYPE_MAP[self.unit_index],
         ).inc()
+        self.db_status = AssignmentState.ASSIGNED
+        self._publish_status_change(AssignmentState.LAUNCHED, AssignmentState.ASSIGNED)
 
     def get_assignment(self) -> "Assignment":
         """
@@ -246,6 +279,7 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         """Clear the agent that is assigned to this unit"""
         logger.debug(f"Clearing assigned agent {self.agent_id} from {self}")
         self.db.clear_unit_agent_assignment(self.db_id)
+        self.worker_id = None
         self.set_db_status(AssignmentState.LAUNCHED)
         self.get_task_run().clear_reservation(self)
         self.agent_id = None
@@ -299,6 +333,40 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         logger.debug(f"Registered new unit {unit} for {assignment}.")
         return unit
 
+    @staticmethod
+    def _register_units(
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+        provider_type: str,
+    ) -> List["Unit"]:
+        """
+        Create entries for a batch of units in the database at once. All of the
+        given assignments must belong to the same task run.
+        """
+        if len(unit_specs) == 0:
+            return []
+        first_assignment = unit_specs[0][0]
+        rows = db.new_units_batch(
+            first_assignment.task_id,
+            first_assignment.task_run_id,
+            first_assignment.requester_id,
+            [(assignment.db_id, index) for assignment, index in unit_specs],
+            pay_amount,
+            provider_type,
+            first_assignment.task_type,
+            sandbox=first_assignment.sandbox,
+        )
+        units = [Unit.get(db, row["unit_id"], row=row) for row in rows]
+        for index, count in Counter(index for _assignment, index in unit_specs).items():
+            ACTIVE_UNIT_STATUSES.labels(
+                status=AssignmentState.CREATED, unit_type=INDEX_TO_TYPE_MAP[index]
+            ).inc(count)
+        logger.debug(
+            f"Registered {len(units)} new units for task run {first_assignment.task_run_id}."
+        )
+        return units
+
     def get_pay_amount(self) -> float:
         """
         Return the amount that this Unit is costing against the budget,
@@ -404,3 +472,18 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         can be successfully created to have it put into the db.
         """
         raise NotImplementedError()
+
+    @classmethod
+    def new_batch(
+        cls,
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """
+        Create a Unit for every (assignment, index) pair, all from the same task run
+
+        By default this calls new once per unit. Providers without per-unit setup
+        should return the result of _register_units to create them in one batch.
+        """
+        return [cls.new(db, assignment, index, pay_amount) for assignment, index in unit_specs]
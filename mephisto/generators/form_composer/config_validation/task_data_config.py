@@ -6,12 +6,16 @@
 import os.path
 import re
 from copy import deepcopy
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
+from typing import Union
 
 from rich import print
 
+from mephisto.generators.form_composer.constants import JSONL_FILE_EXTENSION
 from mephisto.generators.form_composer.constants import S3_URL_EXPIRATION_MINUTES_MAX
 from mephisto.generators.form_composer.constants import TOKEN_END_REGEX
 from mephisto.generators.form_composer.constants import TOKEN_START_REGEX
@@ -21,10 +25,12 @@ from .config_validation_constants import TOKENS_VALUES_KEY
 from .form_config import validate_form_config
 from .separate_token_values_config import validate_separate_token_values_config
 from .token_sets_values_config import validate_token_sets_values_config
+from .utils import get_file_ext
 from .utils import get_s3_presigned_url
 from .utils import make_error_message
 from .utils import read_config_file
-from .utils import write_config_to_file
+from .utils import read_config_items_from_jsonl_file
+from .utils import write_config_items_to_file
 
 FILE_LOCATION_TOKEN_NAME = "file_location"
 
@@ -58,35 +64,105 @@ def _set_tokens_in_form_config_item(item: dict, tokens_values: dict):
         item[attr_name] = _extrapolate_tokens_values(item_attr, tokens_values)
 
 
-def _collect_form_config_items_to_extrapolate(config_data: dict) -> List[dict]:
-    items_to_extrapolate = []
-
+def _iter_form_config_items_with_paths(config_data: dict) -> Iterator[Tuple[tuple, dict]]:
+    """Yield every form config item that can contain tokens, with the keys leading to it"""
     if not isinstance(config_data, dict):
-        return items_to_extrapolate
+        return
 
     form = config_data["form"]
-    items_to_extrapolate.append(form)
+    form_path = ("form",)
+    yield form_path, form
 
     submit_button = form["submit_button"]
-    items_to_extrapolate.append(submit_button)
+    yield form_path + ("submit_button",), submit_button
 
     sections = form["sections"]
-    for section in sections:
-        items_to_extrapolate.append(section)
+    for section_index, section in enumerate(sections):
+        section_path = form_path + ("sections", section_index)
+        yield section_path, section
 
         fieldsets = section["fieldsets"]
-        for fieldset in fieldsets:
-            items_to_extrapolate.append(fieldset)
+        for fieldset_index, fieldset in enumerate(fieldsets):
+            fieldset_path = section_path + ("fieldsets", fieldset_index)
+            yield fieldset_path, fieldset
 
             rows = fieldset["rows"]
-            for row in rows:
-                items_to_extrapolate.append(row)
+            for row_index, row in enumerate(rows):
+                row_path = fieldset_path + ("rows", row_index)
+                yield row_path, row
 
                 fields = row["fields"]
-                for field in fields:
-                    items_to_extrapolate.append(field)
+                for field_index, field in enumerate(fields):
+                    yield row_path + ("fields", field_index), field
+
+
+def _collect_form_config_items_to_extrapolate(config_data: dict) -> List[dict]:
+    return [item for _, item in _iter_form_config_items_with_paths(config_data)]
+
+
+def _compile_form_config_template(config_data: dict, token_names: Iterable[str]) -> dict:
+    """
+    Find where the given tokens are in the form config, once for all token sets.
+
+    Returns a tree of the keys leading to the attributes with tokens. Each of these
+    attributes is compiled into a format string with a positional field per token,
+    and the names of these tokens.
+    """
+    template: dict = {}
+    token_names = list(token_names)
+    if not token_names:
+        return template
+
+    token_regex = re.compile(
+        TOKEN_START_REGEX
+        + r"\s*("
+        + "|".join(re.escape(token) for token in token_names)
+        + r")\s*"
+        + TOKEN_END_REGEX
+    )
+    for path, item in _iter_form_config_items_with_paths(config_data):
+        for attr_name in ATTRS_SUPPORTING_TOKENS:
+            item_attr = item.get(attr_name)
+            if not item_attr:
+                continue
 
-    return items_to_extrapolate
+            # Text alternating with token names
+            fragments = token_regex.split(item_attr)
+            if len(fragments) == 1:
+                continue
+
+            texts = [f.replace("{", "{{").replace("}", "}}") for f in fragments[::2]]
+            format_string = "{}".join(texts)
+            template_node = template
+            for key in path:
+                template_node = template_node.setdefault(key, {})
+            template_node[attr_name] = (format_string, fragments[1::2])
+
+    return template
+
+
+def _render_form_config_template(
+    config_data: Union[dict, list],
+    template: dict,
+    tokens_values: dict,
+) -> Union[dict, list]:
+    """
+    Fill tokens values into a compiled form config. Only the items leading to
+    attributes with tokens are copied, the rest is shared with `config_data`,
+    so rendered form configs shouldn't be changed in place.
+    """
+    rendered = config_data.copy()
+    for key, template_node in template.items():
+        if isinstance(template_node, tuple):
+            format_string, token_names = template_node
+            rendered[key] = format_string.format(*[str(tokens_values[t]) for t in token_names])
+        else:
+            rendered[key] = _render_form_config_template(
+                config_data[key],
+                template_node,
+                tokens_values,
+            )
+    return rendered
 
 
 def _collect_tokens_from_form_config(
@@ -161,10 +237,10 @@ def _validate_tokens_in_both_configs(
     return overspecified_tokens, underspecified_tokens, tokens_in_unexpected_attrs_errors
 
 
-def _combine_extrapolated_form_configs(
+def _validate_configs_to_combine(
     form_config_data: dict,
     token_sets_values_config_data: List[dict],
-) -> List[dict]:
+):
     errors = []
 
     # Validate Form config
@@ -221,24 +297,61 @@ def _combine_extrapolated_form_configs(
         # Stop generating a Task, the config is incorrect
         raise ValueError("\n" + "\n\n".join(errors))
 
-    # If no errors, combine extrapolated form versions to create Task data config
-    combined_config = []
+
+def _iter_extrapolated_form_configs(
+    form_config_data: dict,
+    token_sets_values_config_data: List[dict],
+) -> Iterator[dict]:
+    """
+    Lazily build a form version for each token set, so that only one of them
+    has to be in memory at a time. Form versions share the parts of the form config
+    without tokens
+    """
+    # Form config compiled for each set of token names (all token sets usually have the same)
+    templates = {}
     if token_sets_values_config_data:
         for token_sets_values in token_sets_values_config_data:
             if token_sets_values == {}:
-                combined_config.append(form_config_data)
+                yield form_config_data
             else:
-                form_config_data_with_tokens = _extrapolate_tokens_in_form_config(
-                    deepcopy(form_config_data),
-                    token_sets_values[TOKENS_VALUES_KEY],
+                tokens_values = token_sets_values[TOKENS_VALUES_KEY]
+                token_names = tuple(tokens_values.keys())
+                if token_names not in templates:
+                    templates[token_names] = _compile_form_config_template(
+                        form_config_data,
+                        token_names,
+                    )
+                yield _render_form_config_template(
+                    form_config_data,
+                    templates[token_names],
+                    tokens_values,
                 )
-                combined_config.append(form_config_data_with_tokens)
     else:
         # If no config with tokens values was added than
         # we just create one-unit config and copy form config into it as-is
-        combined_config.append(form_config_data)
+        yield form_config_data
+
+
+def _combine_extrapolated_form_configs(
+    form_config_data: dict,
+    token_sets_values_config_data: List[dict],
+) -> List[dict]:
+    _validate_configs_to_combine(form_config_data, token_sets_values_config_data)
 
-    return combined_config
+    # If no errors, combine extrapolated form versions to create Task data config
+    return list(_iter_extrapolated_form_configs(form_config_data, token_sets_values_config_data))
+
+
+def iter_extrapolated_form_configs(
+    form_config_data: dict,
+    token_sets_values_config_data: List[dict],
+) -> Iterator[dict]:
+    """
+    Validate form and token sets configs, and return a generator of extrapolated
+    form versions, which can be used as Task data without writing them to a file
+    """
+    _validate_configs_to_combine(form_config_data, token_sets_values_config_data)
+    return _iter_extrapolated_form_configs(form_config_data, token_sets_values_config_data)
 
 
 def create_extrapolated_config(
@@ -258,37 +371,45 @@ def create_extrapolated_config(
     else:
         token_sets_values_data = []
 
-    # Create combined config
+    # Create combined config, writing form versions one by one
+    # (into a JSONL file if `task_data_config_path` has `.jsonl` extension)
     try:
-        extrapolated_form_config_data = _combine_extrapolated_form_configs(
+        extrapolated_form_config_data = iter_extrapolated_form_configs(
             form_config_data,
             token_sets_values_data,
         )
-        write_config_to_file(extrapolated_form_config_data, task_data_config_path)
+        write_config_items_to_file(extrapolated_form_config_data, task_data_config_path)
     except ValueError as e:
         print(f"\n[red]Could not extrapolate form configs:[/red] {e}\n")
         exit()
 
 
-def validate_task_data_config(config_data: List[dict]) -> Tuple[bool, List[str]]:
+def validate_task_data_config(config_data: Iterable[dict]) -> Tuple[bool, List[str]]:
     is_valid = True
     errors = []
 
-    if not isinstance(config_data, list):
+    # Items read from a JSONL file come as an iterator, and are only checked once
+    if not isinstance(config_data, (list, Iterator)):
         is_valid = False
         errors.append("Config must be a JSON Array.")
 
     if config_data:
-        if not all(config_data):
-            is_valid = False
-            errors.append("Task data config must contain at least one non-empty item.")
+        has_empty_items = False
+        items_errors = []
 
         # Validate each form version contained in task data config
         for item in config_data:
+            if not item:
+                has_empty_items = True
             form_config_is_valid, form_config_errors = validate_form_config(item)
             if not form_config_is_valid:
                 is_valid = False
-                errors += form_config_errors
+                items_errors += form_config_errors
+
+        if has_empty_items:
+            is_valid = False
+            errors.append("Task data config must contain at least one non-empty item.")
+        errors += items_errors
 
     return is_valid, errors
 
@@ -304,7 +425,12 @@ def verify_form_composer_configs(
 
     try:
         # 1. Validate task data config
-        task_data_config_data = read_config_file(task_data_config_path, exit_if_no_file=False)
+        if get_file_ext(task_data_config_path) == JSONL_FILE_EXTENSION and os.path.exists(
+            task_data_config_path
+        ):
+            task_data_config_data = read_config_items_from_jsonl_file(task_data_config_path)
+        else:
+            task_data_config_data = read_config_file(task_data_config_path, exit_if_no_file=False)
 
         if task_data_config_data is None:
             pass
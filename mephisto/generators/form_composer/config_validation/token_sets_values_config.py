@@ -5,6 +5,7 @@
 
 import itertools
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Tuple
 
@@ -14,7 +15,7 @@ from .config_validation_constants import TOKENS_VALUES_KEY
 from .separate_token_values_config import validate_separate_token_values_config
 from .utils import make_error_message
 from .utils import read_config_file
-from .utils import write_config_to_file
+from .utils import write_config_items_to_file
 
 TokensPermutationType = List[Dict[str, Dict[str, List[str]]]]
 
@@ -55,27 +56,22 @@ def validate_token_sets_values_config(config_data: List[dict]) -> Tuple[bool, Li
     return is_valid, errors
 
 
-def _premutate_separate_tokens(data: Dict[str, List[str]]) -> TokensPermutationType:
-    all_permutations = []
+def _iter_premutated_separate_tokens(data: Dict[str, List[str]]) -> Iterator[dict]:
+    """Lazily generate token sets for all permutations of separate token values"""
     # Make a list to iterate many times
     data_keys = list(data.keys())
 
     # Collect a list of values lists in data keys order
     sorted_values_lists: List[list] = [values for token, values in data.items()]
 
-    # Making a list of premutated dicts
-    for i, row in enumerate(itertools.product(*sorted_values_lists, repeat=1)):
-        single_permudation = {}
-        for y, key in enumerate(data_keys):
-            single_permudation[key] = row[y]
+    for row in itertools.product(*sorted_values_lists, repeat=1):
+        yield {
+            TOKENS_VALUES_KEY: dict(zip(data_keys, row)),
+        }
 
-        all_permutations.append(
-            {
-                TOKENS_VALUES_KEY: single_permudation,
-            }
-        )
 
-    return all_permutations
+def _premutate_separate_tokens(data: Dict[str, List[str]]) -> TokensPermutationType:
+    return list(_iter_premutated_separate_tokens(data))
 
 
 def update_token_sets_values_config_with_premutated_data(
@@ -103,6 +99,7 @@ def update_token_sets_values_config_with_premutated_data(
         # Stop generating a Task, the config is incorrect
         raise ValueError("\n" + "\n\n".join(errors))
 
-    premutated_data = _premutate_separate_tokens(separate_token_values_config_data)
+    # Token sets are written as they're generated, there can be a lot of them
+    premutated_data = _iter_premutated_separate_tokens(separate_token_values_config_data)
 
-    write_config_to_file(premutated_data, token_sets_values_config_path)
+    write_config_items_to_file(premutated_data, token_sets_values_config_path)
@@ -8,6 +8,8 @@ import os
 from json import JSONDecodeError
 from pathlib import Path
 from typing import Any
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Tuple
 from typing import Union
@@ -21,6 +23,7 @@ from rich import print
 
 from mephisto.generators.form_composer.constants import CONTENTTYPE_BY_EXTENSION
 from mephisto.generators.form_composer.constants import JSON_IDENTATION
+from mephisto.generators.form_composer.constants import JSONL_FILE_EXTENSION
 from mephisto.generators.form_composer.constants import S3_URL_EXPIRATION_MINUTES
 from mephisto.utils.logger_core import get_logger
 
@@ -35,6 +38,27 @@ def write_config_to_file(config_data: Union[List[dict], dict], file_path: str):
         f.write(config_str)
 
 
+def write_config_items_to_file(config_items: Iterable[dict], file_path: str):
+    """
+    Write config items one by one, so that they don't all have to be in memory at once.
+    Files with `.jsonl` extension get one item per line, others the same JSON Array
+    as `write_config_to_file` would write
+    """
+    with open(file_path, "w") as f:
+        if get_file_ext(file_path) == JSONL_FILE_EXTENSION:
+            for item in config_items:
+                f.write(json.dumps(item) + "\n")
+            return
+
+        indent = " " * JSON_IDENTATION
+        separator = "["
+        for item in config_items:
+            item_str = json.dumps(item, indent=JSON_IDENTATION).replace("\n", "\n" + indent)
+            f.write(f"{separator}\n{indent}{item_str}")
+            separator = ","
+        f.write("[]" if separator == "[" else "\n]")
+
+
 def read_config_file(
     config_path: str, exit_if_no_file: bool = True
 ) -> Union[List[dict], dict, None]:
@@ -57,6 +81,14 @@ def read_config_file(
     return config_data
 
 
+def read_config_items_from_jsonl_file(config_path: str) -> Iterator[dict]:
+    """Lazily read config items from a JSONL file, one item per line"""
+    with open(config_path) as config_file:
+        for line in config_file:
+            if line.strip():
+                yield json.loads(line)
+
+
 def make_error_message(main_message: str, error_list: List[str], indent: int = 2) -> str:
     prefix = "\n" + (" " * indent) + "- "
     errors_bullets = prefix + prefix.join(map(str, error_list))
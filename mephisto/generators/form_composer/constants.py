@@ -27,6 +27,8 @@ CONTENTTYPE_BY_EXTENSION = {
 
 JSON_IDENTATION = 2
 
+JSONL_FILE_EXTENSION = "jsonl"
+
 S3_URL_EXPIRATION_MINUTES = int(os.environ.get("S3_URL_EXPIRATION_MINUTES", 60))
 
 S3_URL_EXPIRATION_MINUTES_MAX = 7 * 24 * 60  # Week
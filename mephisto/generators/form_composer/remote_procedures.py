@@ -1,34 +1,52 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Union
 
+from prometheus_client import Counter  # type: ignore
+
 from mephisto.generators.form_composer.config_validation.utils import is_s3_url
 
 from mephisto.abstractions.blueprints.remote_procedure.remote_procedure_agent_state import (
     RemoteProcedureAgentState,
 )
 from mephisto.generators.form_composer.config_validation.utils import get_s3_presigned_url
+from mephisto.generators.form_composer.constants import S3_URL_EXPIRATION_MINUTES
 from mephisto.utils.logger_core import get_logger
 
 MAX_THREADS = 10
 
+# Presigned URLs are reused until this long before they expire,
+# so that a URL handed to a worker still has time to be loaded
+PRESIGNED_URL_EXPIRATION_MARGIN_SECONDS = 5 * 60
+PRESIGNED_URL_CACHE_SIZE = 10000
+
+PRESIGNED_URL_CACHE_EVENTS = Counter(
+    "form_composer_presigned_url_cache_events",
+    "Hits, misses, shared in-flight requests, and evictions of the presigned S3 URL cache",
+    ["event"],
+)
+
 logger = get_logger(name=__name__)
 
+PresignResult = Tuple[str, Union[str, None], Union[str, None]]
+
 
 class ProcedureName:
     GET_MULTIPLE_PRESIGNED_URLS = "getMultiplePresignedUrls"
     GET_PRESIGNED_URL = "getPresignedUrl"
 
 
-def _get_presigned_url(request_id: str, url: str, agent_state: RemoteProcedureAgentState) -> str:
-    logger.debug(f"Presigning S3 URL '{url}' ({request_id=})")
-    presigned_url = get_s3_presigned_url(url)
-    logger.debug(f"Presigned S3 URL '{presigned_url}'")
-    return presigned_url
-
-
-def _get_presigned_url_for_thread(url: str) -> Tuple[str, Union[str, None], Union[str, None]]:
+def _get_presigned_url_for_thread(
+    url: str,
+    expires_in_mins: int = S3_URL_EXPIRATION_MINUTES,
+) -> PresignResult:
     presigned_url = None
     error = None
 
@@ -37,13 +55,119 @@ def _get_presigned_url_for_thread(url: str) -> Tuple[str, Union[str, None], Unio
         return url, None, error
 
     try:
-        presigned_url = get_s3_presigned_url(url)
+        presigned_url = get_s3_presigned_url(url, expires_in_mins)
     except Exception as e:
         error = str(e)
 
     return url, presigned_url, error
 
 
+class PresignedUrlService:
+    """
+    Presigns S3 URLs on a thread pool shared by all requests of the process.
+
+    Presigned URLs are reused until `expiration_margin_secs` before they expire,
+    keeping at most `max_size` of them in least recently used order. Requests for
+    a URL that's already being presigned wait for that result, rather than
+    presigning it again. Failures aren't cached.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MAX_THREADS,
+        max_size: int = PRESIGNED_URL_CACHE_SIZE,
+        expires_in_mins: int = S3_URL_EXPIRATION_MINUTES,
+        expiration_margin_secs: int = PRESIGNED_URL_EXPIRATION_MARGIN_SECONDS,
+    ):
+        self.max_workers = max_workers
+        self.max_size = max_size
+        self.expires_in_mins = expires_in_mins
+        self.expiration_margin_secs = expiration_margin_secs
+        self._cached: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._in_flight: Dict[str, "Future[PresignResult]"] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._hits = PRESIGNED_URL_CACHE_EVENTS.labels(event="hit")
+        self._misses = PRESIGNED_URL_CACHE_EVENTS.labels(event="miss")
+        self._shared = PRESIGNED_URL_CACHE_EVENTS.labels(event="shared")
+        self._evictions = PRESIGNED_URL_CACHE_EVENTS.labels(event="eviction")
+
+    def submit(self, url: str) -> "Future[PresignResult]":
+        """Return a future of the `(url, presigned_url, error)` result for the URL"""
+        with self._lock:
+            cached = self._cached.get(url)
+            if cached is not None:
+                presigned_url, valid_until = cached
+                if time.monotonic() < valid_until:
+                    self._cached.move_to_end(url)
+                    self._hits.inc()
+                    future: "Future[PresignResult]" = Future()
+                    future.set_result((url, presigned_url, None))
+                    return future
+                del self._cached[url]
+
+            future = self._in_flight.get(url)
+            if future is not None:
+                self._shared.inc()
+                return future
+
+            self._misses.inc()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="presigned-url",
+                )
+            future = self._executor.submit(self._presign, url)
+            self._in_flight[url] = future
+            return future
+
+    def get(self, url: str) -> PresignResult:
+        return self.submit(url).result()
+
+    def clear(self) -> None:
+        """Forget all presigned URLs"""
+        with self._lock:
+            self._cached.clear()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._cached.clear()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _presign(self, url: str) -> PresignResult:
+        # Time taken to presign is counted against the URL's expiration
+        valid_until = time.monotonic() + self.expires_in_mins * 60 - self.expiration_margin_secs
+        try:
+            result = _get_presigned_url_for_thread(url, self.expires_in_mins)
+        except Exception as e:
+            result = (url, None, str(e))
+
+        with self._lock:
+            self._in_flight.pop(url, None)
+            _, presigned_url, error = result
+            if not error and time.monotonic() < valid_until:
+                self._cached[url] = (presigned_url, valid_until)
+                self._cached.move_to_end(url)
+                while len(self._cached) > self.max_size:
+                    self._cached.popitem(last=False)
+                    self._evictions.inc()
+        return result
+
+
+presigned_url_service = PresignedUrlService()
+
+
+def _get_presigned_url(request_id: str, url: str, agent_state: RemoteProcedureAgentState) -> str:
+    logger.debug(f"Presigning S3 URL '{url}' ({request_id=})")
+    _, presigned_url, error = presigned_url_service.get(url)
+    if error:
+        raise ValueError(f"Could not presign URL '{url}' because of error: {error}.")
+    logger.debug(f"Presigned S3 URL '{presigned_url}'")
+    return presigned_url
+
+
 def _get_multiple_presigned_urls(
     request_id: str,
     urls: List[str],
@@ -52,10 +176,7 @@ def _get_multiple_presigned_urls(
     logger.debug(f"Presigning S3 URLs '{', '.join(urls)}' ({request_id=})")
 
     # Request all URLs asynchronously
-    threads_results = []
-    with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-        for url in urls:
-            threads_results.append(executor.submit(_get_presigned_url_for_thread, url))
+    threads_results = [presigned_url_service.submit(url) for url in urls]
 
     # Separate successful results from errors
     success_results = []
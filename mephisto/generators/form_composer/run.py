@@ -12,6 +12,9 @@ from mephisto.abstractions.blueprints.remote_procedure.remote_procedure_blueprin
     SharedRemoteProcedureTaskState,
 )
 from mephisto.generators.form_composer.config_validation.utils import read_config_file
+from mephisto.generators.form_composer.config_validation.utils import (
+    read_config_items_from_jsonl_file,
+)
 from mephisto.generators.form_composer.remote_procedures import JS_NAME_FUNCTION_MAPPING
 from mephisto.operations.operator import Operator
 from mephisto.tools.scripts import build_custom_bundle
@@ -24,12 +27,13 @@ def main(operator: Operator, cfg: DictConfig) -> None:
     _build_custom_bundles(cfg)
 
     # Configure shared state
-    task_data_config_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "data",
-        "task_data.json",
-    )
-    task_data = read_config_file(task_data_config_path)
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    task_data_jsonl_config_path = os.path.join(data_dir, "task_data.jsonl")
+    if os.path.exists(task_data_jsonl_config_path):
+        # Form versions are read one by one, as assignments are created
+        task_data = read_config_items_from_jsonl_file(task_data_jsonl_config_path)
+    else:
+        task_data = read_config_file(os.path.join(data_dir, "task_data.json"))
     shared_state = SharedRemoteProcedureTaskState(
         static_task_data=task_data,
         function_registry=JS_NAME_FUNCTION_MAPPING,
@@ -88,6 +88,8 @@ class ClientIOHandler:
         self.agents_by_registration_id: Dict[str, str] = {}
         # Agent status handling
         self._status_task: Optional[asyncio.Task] = None
+        # Map from channel id to the last status sequence number its router returned
+        self.channel_status_seqs: Dict[str, int] = {}
         # Message handling
         self.message_queue: "Queue[Packet]" = Queue()
         self.agent_id_to_channel_id: Dict[str, str] = {}
@@ -151,7 +153,11 @@ class ClientIOHandler:
         return live_run
 
     def _on_channel_open(self, channel_id: str) -> None:
-        """Handler for what to do when a socket opens, we send an alive"""
+        """
+        Handler for what to do when a socket opens, we send an alive, and
+        ask for all statuses on the next check as the router may have restarted
+        """
+        self.channel_status_seqs.pop(channel_id, None)
         self._send_alive(channel_id)
 
     def _on_catastrophic_disconnect(self, channel_id: str) -> None:
@@ -256,8 +262,9 @@ class ClientIOHandler:
         agent = live_run.worker_pool.get_agent_for_id(packet.subject_id)
         assert agent is not None, f"Could not find given agent: {packet.subject_id}"
 
-        agent.pending_actions.put(packet.data)
-        agent.has_live_update.set()
+        if live_run.task_runner.handle_live_update(agent, packet.data):
+            return
+        agent.handle_live_update(packet.data)
 
     def _on_submit_unit(self, packet: Packet, _channel_id: str):
         """Handle an action as sent from an agent, enqueuing to the agent"""
@@ -393,7 +400,7 @@ class ClientIOHandler:
                 self._register_agent(packet, channel_id)
             elif packet.type == PACKET_TYPE_RETURN_STATUSES:
                 # Record this status response
-                live_run.worker_pool.handle_updated_agent_status(packet.data)
+                self._on_returned_statuses(packet, channel_id)
                 self.log_metrics_for_packet(packet)
             elif packet.type == PACKET_TYPE_ERROR:
                 self._log_frontend_error(packet)
@@ -403,16 +410,30 @@ class ClientIOHandler:
                 # PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE, PACKET_TYPE_AGENT_DETAILS
                 raise Exception(f"Unexpected packet type {packet.type}")
 
+    def _on_returned_statuses(self, packet: Packet, channel_id: str) -> None:
+        """
+        Apply the statuses the router returned to the worker pool, and note
+        the sequence number they're current to
+        """
+        live_run = self.get_live_run()
+        if "status_seq" not in packet.data:
+            # Routers that don't version statuses return all of them
+            agent_statuses = packet.data
+        else:
+            agent_statuses = packet.data["agent_statuses"]
+            self.channel_status_seqs[channel_id] = packet.data["status_seq"]
+        live_run.worker_pool.handle_updated_agent_status(agent_statuses)
+
     def _request_status_update(self) -> None:
         """
-        Check last round of statuses, then request
-        an update from the server on all agent's current status
+        Check last round of statuses, then request an update from the server
+        on the status of agents that changed since the last response
         """
         for channel_id, channel in self.channels.items():
             send_packet = Packet(
                 packet_type=PACKET_TYPE_REQUEST_STATUSES,
                 subject_id=SYSTEM_CHANNEL_ID,
-                data={},
+                data={"since_status_seq": self.channel_status_seqs.get(channel_id)},
             )
             channel.enqueue_send(send_packet)
 
@@ -76,6 +76,8 @@ class LiveTaskRun:
         self.task_runner.shutdown()
         self.worker_pool.shutdown()
         self.client_io.shutdown()
+        self.task_run.stop_completion_tracking()
+        self.task_run.stop_unit_availability_tracking()
 
 
 class WorkerFailureReasons:
@@ -28,6 +28,8 @@ config = ConfigStoreWithProvider("mephisto")
 @dataclass
 class DatabaseArgs:
     _database_type: str = "singleton"  # default DB is performant singleton
+    concurrency_mode: str = "locked"  # "wal" enables lock-free reads for busy live servers
+    cache_size: int = 10000  # recently used objects of each type the singleton DB keeps loaded
 
 
 @dataclass
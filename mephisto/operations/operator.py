@@ -301,11 +301,13 @@ class Operator:
                 )
             raise e
 
+        task_run.start_unit_availability_tracking()
         live_run.task_launcher.create_assignments()
         live_run.task_launcher.launch_units(url=task_url)
 
         self._task_runs_tracked[task_run.db_id] = live_run
         task_run.update_completion_progress(status=False)
+        task_run.start_completion_tracking()
 
         return task_run.db_id
 
@@ -342,6 +344,8 @@ class Operator:
                 tracked_run.task_launcher.shutdown()
                 tracked_run.task_launcher.expire_units()
                 tracked_run.architect.shutdown()
+                tracked_run.task_run.stop_completion_tracking()
+                tracked_run.task_run.stop_unit_availability_tracking()
                 del self._task_runs_tracked[task_run.db_id]
             await asyncio.sleep(RUN_STATUS_POLL_TIME)
             if self._using_prometheus and not self.is_shutdown:
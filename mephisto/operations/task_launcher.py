@@ -17,8 +17,15 @@ from mephisto.data_model.unit import (
     COMPENSATION_UNIT_INDEX,
 )
 
+from mephisto.utils.status_events import (
+    status_event_bus,
+    StatusChangeEvent,
+    event_releases_unit,
+)
+
 from typing import Dict, Optional, List, Any, TYPE_CHECKING, Iterator, Iterable
 from tqdm import tqdm  # type: ignore
+import itertools
 import os
 import time
 import enum
@@ -33,7 +40,17 @@ import types
 logger = get_logger(name=__name__)
 
 UNIT_GENERATOR_WAIT_SECONDS = 10
+# Launched units are tracked from status change events. A full status query of
+# every launched unit is only done at this interval, to catch any changes made on
+# the provider side that didn't flow through the data model.
+LAUNCHED_UNITS_RECONCILE_SECONDS = 300
 ASSIGNMENT_GENERATOR_WAIT_SECONDS = 0.5
+# Number of assignments whose rows are written to the database in a single transaction
+ASSIGNMENT_CREATION_BATCH_SIZE = 1000
+
+
+# Unit statuses that occupy one of the max_num_concurrent_units slots
+ACTIVE_UNIT_STATUSES = [AssignmentState.LAUNCHED, AssignmentState.ASSIGNED]
 
 
 class GeneratorType(enum.Enum):
@@ -67,6 +84,9 @@ class TaskLauncher:
         self.max_num_concurrent_units = max_num_concurrent_units
         self.launched_units: Dict[str, Unit] = {}
         self.unlaunched_units: Dict[str, Unit] = {}
+        self.launched_units_access_condition = threading.Condition()
+        self.last_launched_units_reconcile = time.monotonic()
+        self.is_tracking_status_events = False
         self.keep_launching_units: bool = False
         self.finished_generators: bool = False
         self.assignment_thread_done: bool = True
@@ -109,6 +129,35 @@ class TaskLauncher:
             with self.unlaunched_units_access_condition:
                 self.unlaunched_units[unit.db_id] = unit
 
+    def _create_assignments_batch(self, assignment_data_batch: List[InitializationData]) -> None:
+        """
+        Create a batch of assignments in the database using their read assignment_data,
+        inserting all of the assignment rows and all of the unit rows at once
+        """
+        task_run = self.task_run
+        task_args = task_run.get_task_args()
+        assignment_rows = self.db.new_assignments_batch(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            task_run.task_type,
+            task_run.provider_type,
+            len(assignment_data_batch),
+            task_run.sandbox,
+        )
+        unit_specs = []
+        for row, assignment_data in zip(assignment_rows, assignment_data_batch):
+            assignment = Assignment.get(self.db, row["assignment_id"], row=row)
+            assignment.write_assignment_data(assignment_data)
+            self.assignments.append(assignment)
+            unit_count = len(assignment_data.unit_data)
+            unit_specs += [(assignment, unit_idx) for unit_idx in range(unit_count)]
+        units = self.UnitClass.new_batch(self.db, unit_specs, task_args.task_reward)
+        self.units += units
+        with self.unlaunched_units_access_condition:
+            for unit in units:
+                self.unlaunched_units[unit.db_id] = unit
+
     def _try_generating_assignments(
         self, assignment_data_iterator: Iterator[InitializationData]
     ) -> None:
@@ -125,8 +174,12 @@ class TaskLauncher:
         """Create an assignment and associated units for the generated assignment data"""
         self.keep_launching_units = True
         if self.generator_type != GeneratorType.ASSIGNMENT:
-            for data in self.assignment_data_iterable:
-                self._create_single_assignment(data)
+            data_iterator = iter(self.assignment_data_iterable)
+            while True:
+                data_batch = list(itertools.islice(data_iterator, ASSIGNMENT_CREATION_BATCH_SIZE))
+                if len(data_batch) == 0:
+                    break
+                self._create_assignments_batch(data_batch)
         else:
             assert isinstance(
                 self.assignment_data_iterable, types.GeneratorType
@@ -138,17 +191,48 @@ class TaskLauncher:
             )
             self.assignments_thread.start()
 
+    def _handle_status_change(self, event: StatusChangeEvent) -> None:
+        """Stop counting a launched unit once a status change takes it out of LAUNCHED/ASSIGNED"""
+        if not event_releases_unit(event, ACTIVE_UNIT_STATUSES):
+            return
+        with self.launched_units_access_condition:
+            if self.launched_units.pop(event.unit_id, None) is not None:
+                self.launched_units_access_condition.notify_all()
+
+    def _start_tracking_status_events(self) -> None:
+        """Subscribe to the status changes of this launcher's task run"""
+        if not self.is_tracking_status_events:
+            status_event_bus.subscribe(self.task_run.db_id, self._handle_status_change)
+            self.is_tracking_status_events = True
+            self.last_launched_units_reconcile = time.monotonic()
+
+    def _stop_tracking_status_events(self) -> None:
+        """Unsubscribe from the status changes of this launcher's task run"""
+        if self.is_tracking_status_events:
+            status_event_bus.unsubscribe(self.task_run.db_id, self._handle_status_change)
+            self.is_tracking_status_events = False
+
+    def _reconcile_launched_units(self) -> None:
+        """Query the status of every launched unit, dropping those that are no longer active"""
+        with self.launched_units_access_condition:
+            launched_units = list(self.launched_units.items())
+        units_id_to_remove = [
+            db_id for db_id, unit in launched_units if unit.get_status() not in ACTIVE_UNIT_STATUSES
+        ]
+        with self.launched_units_access_condition:
+            for db_id in units_id_to_remove:
+                self.launched_units.pop(db_id, None)
+        self.last_launched_units_reconcile = time.monotonic()
+
     def generate_units(self):
         """units generator which checks that only 'max_num_concurrent_units' running at the same time,
         i.e. in the LAUNCHED or ASSIGNED states"""
         while self.keep_launching_units:
-            units_id_to_remove = []
-            for db_id, unit in self.launched_units.items():
-                status = unit.get_status()
-                if status != AssignmentState.LAUNCHED and status != AssignmentState.ASSIGNED:
-                    units_id_to_remove.append(db_id)
-            for db_id in units_id_to_remove:
-                self.launched_units.pop(db_id)
+            if (
+                time.monotonic() - self.last_launched_units_reconcile
+                > LAUNCHED_UNITS_RECONCILE_SECONDS
+            ):
+                self._reconcile_launched_units()
 
             num_avail_units = self.max_num_concurrent_units - len(self.launched_units)
             num_avail_units = (
@@ -162,7 +246,8 @@ class TaskLauncher:
                 for i, item in enumerate(self.unlaunched_units.items()):
                     db_id, unit = item
                     if i < num_avail_units:
-                        self.launched_units[unit.db_id] = unit
+                        with self.launched_units_access_condition:
+                            self.launched_units[unit.db_id] = unit
                         units_id_to_remove.append(db_id)
                         yield unit
                     else:
@@ -170,7 +255,9 @@ class TaskLauncher:
                 for db_id in units_id_to_remove:
                     self.unlaunched_units.pop(db_id)
 
-            time.sleep(UNIT_GENERATOR_WAIT_SECONDS)
+            # Wake up early if a status change frees up a slot for another unit
+            with self.launched_units_access_condition:
+                self.launched_units_access_condition.wait(timeout=UNIT_GENERATOR_WAIT_SECONDS)
             if not self.unlaunched_units:
                 break
 
@@ -192,6 +279,7 @@ class TaskLauncher:
     def launch_units(self, url: str) -> None:
         """launch any units registered by this TaskLauncher"""
         self.launch_url = url
+        self._start_tracking_status_events()
         self.units_thread = threading.Thread(
             target=self._launch_limited_units,
             args=(url,),
@@ -255,5 +343,8 @@ class TaskLauncher:
         self.finished_generators = True
         if self.assignments_thread is not None:
             self.assignments_thread.join()
+        with self.launched_units_access_condition:
+            self.launched_units_access_condition.notify_all()
         if self.units_thread is not None:
             self.units_thread.join()
+        self._stop_tracking_status_events()
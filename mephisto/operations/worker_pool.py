@@ -25,7 +25,7 @@ from mephisto.operations.task_launcher import (
 )
 from mephisto.operations.datatypes import LiveTaskRun, WorkerFailureReasons
 
-from typing import Sequence, Dict, Union, Optional, List, Any, TYPE_CHECKING
+from typing import Sequence, Dict, Union, Optional, List, Set, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mephisto.data_model.unit import Unit
@@ -176,12 +176,42 @@ class WorkerPool:
         else:
             await self.register_agent(crowd_data, worker, request_id)
 
+    async def _get_usable_units(self, worker: "Worker", offered_unit_ids: Set[str]) -> List["Unit"]:
+        """
+        Get the next units the worker could be assigned to, other than the ones
+        already offered to them, passing over any batch that the task runner
+        filters out entirely
+        """
+        live_run = self.get_live_run()
+        loop = live_run.loop_wrap.loop
+        while True:
+            with EXTERNAL_FUNCTION_LATENCY.labels(function="get_valid_units_for_worker").time():
+                units = await loop.run_in_executor(
+                    None,
+                    partial(
+                        live_run.task_run.get_valid_units_for_worker,
+                        worker,
+                        exclude_unit_ids=offered_unit_ids,
+                    ),
+                )
+            if len(units) == 0:
+                return []
+            offered_unit_ids.update(u.db_id for u in units)
+            with EXTERNAL_FUNCTION_LATENCY.labels(function="filter_units_for_worker").time():
+                usable_units = await loop.run_in_executor(
+                    None,
+                    partial(live_run.task_runner.filter_units_for_worker, units, worker),
+                )
+            if len(usable_units) > 0:
+                return usable_units
+
     async def _assign_unit_to_agent(
         self,
         crowd_data: Dict[str, Any],
         worker: "Worker",
         request_id: str,
         units: List["Unit"],
+        offered_unit_ids: Optional[Set[str]] = None,
     ):
         live_run = self.get_live_run()
         task_run = live_run.task_run
@@ -195,6 +225,9 @@ class WorkerPool:
         while len(units) > 0 and reserved_unit is None:
             unit = units.pop(0)
             reserved_unit = task_run.reserve_unit(unit)
+            if reserved_unit is None and len(units) == 0 and offered_unit_ids is not None:
+                # Units are offered in batches, so others may be free once these were taken
+                units = await self._get_usable_units(worker, offered_unit_ids)
         if reserved_unit is None:
             AGENT_DETAILS_COUNT.labels(response="no_available_units").inc()
             live_run.client_io.enqueue_agent_details(
@@ -321,15 +354,8 @@ class WorkerPool:
             logger.info(f"Onboarding agent {onboarding_id} registered out from onboarding")
 
         # get the list of tentatively valid units
-        with EXTERNAL_FUNCTION_LATENCY.labels(function="get_valid_units_for_worker").time():
-            units = await loop.run_in_executor(
-                None, partial(live_run.task_run.get_valid_units_for_worker, worker)
-            )
-        with EXTERNAL_FUNCTION_LATENCY.labels(function="filter_units_for_worker").time():
-            usable_units = await loop.run_in_executor(
-                None,
-                partial(live_run.task_runner.filter_units_for_worker, units, worker),
-            )
+        offered_unit_ids: Set[str] = set()
+        usable_units = await self._get_usable_units(worker, offered_unit_ids)
 
         if not worker_passed:
             # TODO(WISH) it may be worth investigating launching a dummy task for these
@@ -363,7 +389,9 @@ class WorkerPool:
                 ).to_dict(),
             )
         else:
-            await self._assign_unit_or_qa(crowd_data, worker, request_id, usable_units)
+            await self._assign_unit_or_qa(
+                crowd_data, worker, request_id, usable_units, offered_unit_ids
+            )
 
     async def reconnect_agent(self, agent_id: str, request_id: str):
         """When an agent reconnects, find and send the relevant data"""
@@ -435,6 +463,7 @@ class WorkerPool:
         worker: "Worker",
         request_id: str,
         units: List["Unit"],
+        offered_unit_ids: Optional[Set[str]] = None,
     ) -> None:
         """Determine whether agent receives a QA unit (screening, gold) or regular"""
         live_run = self.get_live_run()
@@ -463,6 +492,7 @@ class WorkerPool:
                             ),
                         )
                     units = [screen_unit]
+                    offered_unit_ids = None
                 else:
                     AGENT_DETAILS_COUNT.labels(response="no_available_units").inc()
                     live_run.client_io.enqueue_agent_details(
@@ -493,6 +523,7 @@ class WorkerPool:
                         ),
                     )
                     units = [gold_unit]
+                    offered_unit_ids = None
                 else:
                     AGENT_DETAILS_COUNT.labels(response="no_available_units").inc()
                     live_run.client_io.enqueue_agent_details(
@@ -506,7 +537,7 @@ class WorkerPool:
                     return
 
         # Register the correct unit type
-        await self._assign_unit_to_agent(crowd_data, worker, request_id, units)
+        await self._assign_unit_to_agent(crowd_data, worker, request_id, units, offered_unit_ids)
 
     async def register_agent(self, crowd_data: Dict[str, Any], worker: "Worker", request_id: str):
         """Process an agent registration packet to register an agent, returning the agent_id"""
@@ -518,8 +549,8 @@ class WorkerPool:
         agent_registration_id = crowd_data["agent_registration_id"]
 
         # get the list of tentatively valid units
-        with EXTERNAL_FUNCTION_LATENCY.labels(function="get_valid_units_for_worker").time():
-            units = task_run.get_valid_units_for_worker(worker)
+        offered_unit_ids: Set[str] = set()
+        units = await self._get_usable_units(worker, offered_unit_ids)
 
         if len(units) == 0:
             AGENT_DETAILS_COUNT.labels(response="no_available_units").inc()
@@ -532,11 +563,6 @@ class WorkerPool:
             )
             logger.debug(f"agent_registration_id {agent_registration_id}, had no valid units.")
             return
-        with EXTERNAL_FUNCTION_LATENCY.labels(function="filter_units_for_worker").time():
-            units = await loop.run_in_executor(
-                None,
-                partial(live_run.task_runner.filter_units_for_worker, units, worker),
-            )
         # If there's onboarding, see if this worker has already been disqualified
         blueprint = live_run.blueprint
         if isinstance(blueprint, OnboardingRequired) and blueprint.use_onboarding:
@@ -602,7 +628,7 @@ class WorkerPool:
                 live_run.task_runner.execute_onboarding(onboard_agent, cleanup_onboarding)
                 return
 
-        await self._assign_unit_or_qa(crowd_data, worker, request_id, units)
+        await self._assign_unit_or_qa(crowd_data, worker, request_id, units, offered_unit_ids)
 
     async def push_status_update(self, agent: Union["Agent", "OnboardingAgent"]) -> None:
         """
@@ -627,7 +653,8 @@ class WorkerPool:
         Handle updating the local statuses for agents based on
         the previously reported agent statuses.
 
-        Takes as input a mapping from agent_id to server-side status
+        Takes as input a mapping from agent_id to server-side status, for
+        the agents whose status changed since the last report
         """
         live_run = self.get_live_run()
         for agent_id, status in status_map.items():
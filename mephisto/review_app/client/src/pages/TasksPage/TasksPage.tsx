@@ -8,13 +8,19 @@ import * as moment from "moment/moment";
 import * as React from "react";
 import { useEffect } from "react";
 import { Spinner, Table } from "react-bootstrap";
-import { exportTaskResults, getTasks } from "requests/tasks";
+import {
+  exportTaskResults,
+  getTaskExportResultsProgress,
+  getTasks,
+} from "requests/tasks";
 import urls from "urls";
 import TasksHeader from "./TasksHeader/TasksHeader";
 import "./TasksPage.css";
 
 const STORAGE_TASK_ID_KEY: string = "selectedTaskID";
 
+const EXPORT_PROGRESS_INTERVAL_MS: number = 1000;
+
 interface PropsType {
   setErrors: Function;
 }
@@ -46,25 +52,46 @@ function TasksPage(props: PropsType) {
   const requestTaskResults = (taskId: number, nUnits: number) => {
     setTaskIdExportResults(taskId);
 
-    const onSuccessExportResults = (data) => {
+    const downloadResults = () => {
+      // Create pseudo link and click it
+      const linkId = "result-json";
+      const link = document.createElement("a");
+      link.setAttribute("style", "display: none;");
+      link.id = linkId;
+      link.href = urls.server.taskExportResultsJson(taskId, nUnits);
+      link.target = "_blank";
+      link.click();
+      link.remove();
+    };
+
+    // Results are exported in the background, so poll until the file is ready
+    const onExportProgress = (progress: TaskExportProgressType) => {
+      if (progress.status === "running") {
+        setLoadingExportResults(true);
+        setTimeout(() => {
+          getTaskExportResultsProgress(
+            taskId,
+            (data) => onExportProgress(data.progress),
+            () => {},
+            onError
+          );
+        }, EXPORT_PROGRESS_INTERVAL_MS);
+        return;
+      }
+
+      setLoadingExportResults(false);
       setTaskIdExportResults(null);
 
-      if (data.file_created) {
-        // Create pseudo link and click it
-        const linkId = "result-json";
-        const link = document.createElement("a");
-        link.setAttribute("style", "display: none;");
-        link.id = linkId;
-        link.href = urls.server.taskExportResultsJson(taskId, nUnits);
-        link.target = "_blank";
-        link.click();
-        link.remove();
+      if (progress.status === "finished") {
+        downloadResults();
+      } else if (progress.error) {
+        onError({ error: progress.error });
       }
     };
 
     exportTaskResults(
       taskId,
-      onSuccessExportResults,
+      (data) => onExportProgress(data.progress),
       setLoadingExportResults,
       onError
     );
@@ -92,3 +92,24 @@ export function exportTaskResults(
     abortController
   );
 }
+
+export function getTaskExportResultsProgress(
+  id: number,
+  setDataAction: SetRequestDataActionType,
+  setLoadingAction: SetRequestLoadingActionType,
+  setErrorsAction: SetRequestErrorsActionType,
+  abortController?: AbortController
+) {
+  const url = generateURL(urls.server.taskExportResultsProgress, [id]);
+
+  makeRequest(
+    "GET",
+    url,
+    null,
+    setDataAction,
+    setLoadingAction,
+    setErrorsAction,
+    "getTaskExportResultsProgress error:",
+    abortController
+  );
+}
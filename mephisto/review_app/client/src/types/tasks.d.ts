@@ -19,3 +19,10 @@ declare type TaskStatsType = {
   rejected_count: number;
   soft_rejected_count: number;
 };
+
+declare type TaskExportProgressType = {
+  status: "not_started" | "running" | "finished" | "failed";
+  exported_count: number;
+  total_count: number | null;
+  error: string | null;
+};
@@ -24,6 +24,8 @@ const urls = {
     taskExportResults: (id) => API_URL + `/api/tasks/${id}/export-results`,
     taskExportResultsJson: (id, nUnits) =>
       API_URL + `/api/tasks/${id}/${nUnits}/export-results.json`,
+    taskExportResultsProgress: (id) =>
+      API_URL + `/api/tasks/${id}/export-results/progress`,
     tasks: API_URL + "/api/tasks",
     tasksWorkerUnitsIds: (id) => API_URL + `/api/tasks/${id}/worker-units-ids`,
     unitReviewHtml: (id) => API_URL + `/api/units/${id}/review.html`,
@@ -62,6 +62,9 @@ def create_app(debug: bool = False, database_path: Optional[str] = None) -> Flas
     app.db = LocalMephistoDB(database_path=database_path)
     app.data_browser = DataBrowser(db=app.db)
 
+    # Background exports of task results, by task id
+    app.task_results_exports = {}
+
     # API URLS
     init_urls(app)
 
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from flask import request
+from werkzeug.exceptions import BadRequest
+
+
+def get_page_params() -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse the keyset pagination parameters of a request: `after_id`, the last id
+    of the previous page, and `limit`, the most entries to return
+    """
+    page_params = []
+    for param_name in ["after_id", "limit"]:
+        param = request.args.get(param_name)
+        if not param:
+            page_params.append(None)
+            continue
+
+        try:
+            value = int(param)
+        except ValueError:
+            raise BadRequest(f"`{param_name}` must be an integer.")
+
+        if value < 1:
+            raise BadRequest(f"`{param_name}` must be a positive integer.")
+
+        page_params.append(value)
+
+    after_id, limit = page_params
+    return after_id, limit
+
+
+def get_next_after_id(ids: List[int], limit: Optional[int]) -> Optional[int]:
+    """Return the `after_id` of the next page, or None if this was the last one"""
+    if not limit or len(ids) < limit:
+        return None
+    return ids[-1]
@@ -9,7 +9,9 @@ from .qualification_workers_view import QualificationWorkersView
 from .qualifications_view import QualificationsView
 from .qualify_worker_view import QualifyWorkerView
 from .stats_view import StatsView
+from .task_export_results_file_view import TaskExportResultsFileView
 from .task_export_results_json_view import TaskExportResultsJsonView
+from .task_export_results_progress_view import TaskExportResultsProgressView
 from .task_export_results_view import TaskExportResultsView
 from .task_view import TaskView
 from .tasks_view import TasksView
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from flask import send_file
+from flask.views import MethodView
+
+from .task_export_results_json_view import get_finished_results_file_path
+
+
+class TaskExportResultsFileView(MethodView):
+    def get(self, task_id: str = None, results_format: str = None) -> dict:
+        """Get result data file in JSONL or Parquet format"""
+        results_file_path = get_finished_results_file_path(task_id, results_format)
+
+        return send_file(
+            results_file_path,
+            as_attachment=True,
+            attachment_filename=f"task-{task_id}-results.{results_format}",
+        )
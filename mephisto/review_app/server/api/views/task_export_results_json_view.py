@@ -4,27 +4,56 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import json
 import os
+from typing import Iterator
 
-from flask import send_file
+from flask import current_app as app
+from flask import Response
 from flask.views import MethodView
+from werkzeug.exceptions import BadRequest
 from werkzeug.exceptions import NotFound
 
-from .task_export_results_view import get_result_file_path
+from mephisto.review_app.server.results_export import get_results_file_path
+from mephisto.review_app.server.results_export import read_results
+from mephisto.review_app.server.results_export import RESULTS_FORMAT_JSONL
 from .task_export_results_view import get_results_dir
 
 
+def get_finished_results_file_path(task_id: str, results_format: str) -> str:
+    """Return the path of the exported results file, if no export is writing it"""
+    export = app.task_results_exports.get(str(task_id))
+    if export is not None and export.is_running():
+        raise BadRequest("Results of this task are still being exported.")
+
+    results_file_path = get_results_file_path(get_results_dir(), task_id, results_format)
+    if not os.path.exists(results_file_path):
+        raise NotFound("File not found")
+
+    return results_file_path
+
+
 class TaskExportResultsJsonView(MethodView):
-    def get(self, task_id: str = None, n_units: int = None) -> dict:
-        """Get result data file in JSON format"""
-        results_dir = get_results_dir()
-        results_file_path = get_result_file_path(results_dir, task_id, n_units)
-
-        if not os.path.exists(results_file_path):
-            raise NotFound("File not found")
-
-        return send_file(
-            results_file_path,
-            as_attachment=True,
-            attachment_filename=f"task-{task_id}-results.json",
+    def get(self, task_id: str = None, n_units: int = None) -> Response:
+        """
+        Get result data file in JSON format, an object of unit results by unit id.
+        It's streamed from the exported JSONL file, so it is never held in memory.
+        `n_units` is only kept in the URL for compatibility
+        """
+        results_file_path = get_finished_results_file_path(task_id, RESULTS_FORMAT_JSONL)
+
+        def generate_json() -> Iterator[str]:
+            yield "{"
+            for idx, unit_results in enumerate(read_results(results_file_path)):
+                separator = "," if idx else ""
+                unit_id = json.dumps(unit_results["unit_id"])
+                yield f"{separator}\n    {unit_id}: {json.dumps(unit_results)}"
+            yield "\n}"
+
+        return Response(
+            generate_json(),
+            mimetype="application/json",
+            headers={
+                "Content-Disposition": f"attachment; filename=task-{task_id}-results.json",
+            },
         )
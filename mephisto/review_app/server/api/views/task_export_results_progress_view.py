@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from flask import current_app as app
+from flask.views import MethodView
+
+from mephisto.review_app.server.results_export import EXPORT_STATUS_NOT_STARTED
+
+
+class TaskExportResultsProgressView(MethodView):
+    def get(self, task_id: str = None) -> dict:
+        """Get progress of the latest results export of the Task"""
+
+        export = app.task_results_exports.get(str(task_id))
+        if export is None:
+            return {
+                "progress": {
+                    "status": EXPORT_STATUS_NOT_STARTED,
+                    "exported_count": 0,
+                    "total_count": None,
+                    "error": None,
+                },
+            }
+
+        return {
+            "progress": export.get_progress(),
+        }
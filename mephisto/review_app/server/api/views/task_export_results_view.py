@@ -4,20 +4,26 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-import json
 import os
+import threading
 from pathlib import Path
 from typing import List
 
 from flask import current_app as app
+from flask import request
 from flask.views import MethodView
 from werkzeug.exceptions import BadRequest
 
 from mephisto.abstractions.databases.local_database import StringIDRow
 from mephisto.data_model.constants.assignment_state import AssignmentState
-from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.results_export import PYARROW_INSTALLED
+from mephisto.review_app.server.results_export import RESULTS_FORMAT_JSONL
+from mephisto.review_app.server.results_export import RESULTS_FORMAT_PARQUET
+from mephisto.review_app.server.results_export import TaskResultsExport
 from .tasks_view import find_completed_units
 
+_task_results_exports_lock = threading.Lock()
+
 
 def get_results_dir() -> str:
     project_root_dir = Path(__file__).resolve().parent.parent.parent.parent.parent.parent.parent
@@ -25,13 +31,12 @@ def get_results_dir() -> str:
     return results_dir
 
 
-def get_result_file_path(results_dir: str, task_id: str, n_units: int) -> str:
-    return os.path.join(results_dir, f"task_{task_id}__{n_units}_units__results.json")
-
-
 class TaskExportResultsView(MethodView):
     def get(self, task_id: str = None) -> dict:
-        """Assemble results for all Units related to the Task into a single file"""
+        """
+        Start assembling results for all Units related to the Task into a single file
+        in the background (unless it's already running), and return its progress
+        """
 
         db_task: StringIDRow = app.db.get_task(task_id)
         app.logger.debug(f"Found Task in DB: {db_task}")
@@ -45,27 +50,28 @@ class TaskExportResultsView(MethodView):
                 "Please review it completely before requesting the results."
             )
 
-        task_units_data = {}
-        for db_unit in db_units:
-            unit_id = db_unit["unit_id"]
-            unit: Unit = Unit.get(app.db, unit_id)
-
-            try:
-                unit_data = app.data_browser.get_data_from_unit(unit)
-            except AssertionError:
-                # In case if unit does not have agent somehow
-                unit_data = {}
-
-            task_units_data[unit_id] = unit_data
-
-        # Save file with results, so it can be copied later from the repo if needed
-        results_dir = get_results_dir()
-        results_file_path = get_result_file_path(results_dir, task_id, len(db_units))
-
-        # File is cached only if we did not add any new reviewed units to the task
-        if not os.path.exists(results_file_path):
-            os.makedirs(results_dir, exist_ok=True)
-            with open(results_file_path, "w") as f:
-                f.write(json.dumps(task_units_data, indent=4))
-
-        return {"file_created": True}
+        results_format = request.args.get("format", RESULTS_FORMAT_JSONL)
+        if results_format not in [RESULTS_FORMAT_JSONL, RESULTS_FORMAT_PARQUET]:
+            raise BadRequest(f"Unknown results format `{results_format}`.")
+        if results_format == RESULTS_FORMAT_PARQUET and not PYARROW_INSTALLED:
+            raise BadRequest("Exporting results to Parquet requires `pyarrow` to be installed.")
+
+        # Units that are already in the results file are skipped, so a new export
+        # only adds the ones reviewed since the last one
+        with _task_results_exports_lock:
+            export = app.task_results_exports.get(str(task_id))
+            if export is None or not export.is_running():
+                export = TaskResultsExport(
+                    app.db,
+                    app.data_browser,
+                    str(task_id),
+                    get_results_dir(),
+                    write_parquet=results_format == RESULTS_FORMAT_PARQUET,
+                )
+                app.task_results_exports[str(task_id)] = export
+                export.start()
+
+        return {
+            "file_created": not export.is_running(),
+            "progress": export.get_progress(),
+        }
@@ -3,6 +3,8 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 from typing import List
 from typing import Optional
 
@@ -11,16 +13,85 @@ from flask import request
 from flask.views import MethodView
 from werkzeug.exceptions import BadRequest
 
+from mephisto.abstractions.database import MephistoDB
+from mephisto.abstractions.databases.local_database import StringIDRow
 from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.unit import Unit
 from mephisto.generators.form_composer.config_validation.task_data_config import (
     prepare_task_config_for_review_app,
 )
+from mephisto.review_app.server.api.pagination import get_next_after_id
+from mephisto.review_app.server.api.pagination import get_page_params
+from mephisto.review_app.server.db_queries import find_units_page
+from mephisto.tools.data_browser import DataBrowser
+
+
+# Agent data files of the units on a page are read in parallel by this many threads
+UNIT_DATA_LOAD_WORKERS = 8
+
+_unit_data_executor = ThreadPoolExecutor(
+    max_workers=UNIT_DATA_LOAD_WORKERS,
+    thread_name_prefix="review_app_unit_data",
+)
+
+
+def _load_unit_details(
+    db: MephistoDB,
+    data_browser: DataBrowser,
+    unit_row: StringIDRow,
+    has_task_source_review: Dict[str, bool],
+) -> dict:
+    unit: Unit = Unit.get(db, str(unit_row["unit_id"]), row=unit_row)
+
+    try:
+        unit_data = data_browser.get_data_from_unit(unit)
+    except AssertionError:
+        # In case if this is Expired Unit. It raises and axceptions
+        unit_data = {}
+
+    if unit.task_run_id not in has_task_source_review:
+        task_run: TaskRun = unit.get_task_run()
+        has_task_source_review[unit.task_run_id] = bool(
+            task_run.args.get("blueprint").get("task_source_review")
+        )
+
+    inputs = unit_data.get("data", {}).get("inputs", {})
+    outputs = unit_data.get("data", {}).get("outputs", {})
+
+    # In case if there is outdated code that returns `final_submission`
+    # under `inputs` and `outputs` keys, we should use the value in side `final_submission`
+    if "final_submission" in inputs:
+        inputs = inputs["final_submission"]
+    if "final_submission" in outputs:
+        outputs = outputs["final_submission"]
+
+    # Perform any dynamic action on task config for current unit
+    # to make it the same as it looked like for a worker
+    prepared_inputs = inputs
+    if "form" in inputs:
+        prepared_inputs = prepare_task_config_for_review_app(inputs)
+
+    agent = unit.get_assigned_agent()
+    unit_data_folder = agent.get_data_dir() if agent else None
+
+    return {
+        "has_task_source_review": has_task_source_review[unit.task_run_id],
+        "id": int(unit.db_id),
+        "inputs": inputs,  # instructions for worker
+        "outputs": outputs,  # response from worker
+        "prepared_inputs": prepared_inputs,  # prepared instructions from worker
+        "task_start": unit_data.get("task_start"),
+        "task_end": unit_data.get("task_end"),
+        "unit_data_folder": unit_data_folder,  # path to data dir in file system
+    }
 
 
 class UnitsDetailsView(MethodView):
     def get(self) -> dict:
-        """Get full input for specified workers results (`unit_ids` is mandatory)"""
+        """
+        Get full input for specified workers results (`unit_ids` is mandatory).
+        Results are paginated by `after_id` and `limit`
+        """
 
         unit_ids: Optional[str] = request.args.get("unit_ids")
 
@@ -37,54 +108,25 @@ class UnitsDetailsView(MethodView):
         if not unit_ids:
             raise BadRequest("`unit_ids` parameter must be specified.")
 
-        # Get units
-        db_units: List[Unit] = app.db.find_units()
-
-        # Prepare response
-        units = []
-        for unit in db_units:
-            if unit_ids and int(unit.db_id) not in unit_ids:
-                continue
+        after_id, limit = get_page_params()
 
-            try:
-                unit_data = app.data_browser.get_data_from_unit(unit)
-            except AssertionError:
-                # In case if this is Expired Unit. It raises and axceptions
-                unit_data = {}
-
-            task_run: TaskRun = unit.get_task_run()
-            has_task_source_review = bool(task_run.args.get("blueprint").get("task_source_review"))
-
-            inputs = unit_data.get("data", {}).get("inputs", {})
-            outputs = unit_data.get("data", {}).get("outputs", {})
-
-            # In case if there is outdated code that returns `final_submission`
-            # under `inputs` and `outputs` keys, we should use the value in side `final_submission`
-            if "final_submission" in inputs:
-                inputs = inputs["final_submission"]
-            if "final_submission" in outputs:
-                outputs = outputs["final_submission"]
-
-            # Perform any dynamic action on task config for current unit
-            # to make it the same as it looked like for a worker
-            prepared_inputs = inputs
-            if "form" in inputs:
-                prepared_inputs = prepare_task_config_for_review_app(inputs)
-
-            agent = unit.get_assigned_agent()
-            unit_data_folder = agent.get_data_dir() if agent else None
-
-            units.append(
-                {
-                    "has_task_source_review": has_task_source_review,
-                    "id": int(unit.db_id),
-                    "inputs": inputs,  # instructions for worker
-                    "outputs": outputs,  # response from worker
-                    "prepared_inputs": prepared_inputs,  # prepared instructions from worker
-                    "unit_data_folder": unit_data_folder,  # path to data dir in file system
-                }
+        # Get units
+        unit_rows = find_units_page(app.db, unit_ids=unit_ids, after_id=after_id, limit=limit)
+
+        # Prepare response, reading the data of every unit in parallel.
+        # The app proxy is only available on this thread, so it's resolved here
+        db, data_browser = app.db, app.data_browser
+        has_task_source_review: Dict[str, bool] = {}
+        units = list(
+            _unit_data_executor.map(
+                lambda unit_row: _load_unit_details(
+                    db, data_browser, unit_row, has_task_source_review
+                ),
+                unit_rows,
             )
+        )
 
         return {
             "units": units,
+            "next_after_id": get_next_after_id([u["id"] for u in units], limit),
         }
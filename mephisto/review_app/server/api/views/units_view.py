@@ -7,6 +7,7 @@
 from typing import List
 from typing import Optional
 
+from dateutil.parser import parse
 from flask import current_app as app
 from flask import request
 from flask.views import MethodView
@@ -14,7 +15,9 @@ from werkzeug.exceptions import BadRequest
 
 from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.task import Task
-from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.api.pagination import get_next_after_id
+from mephisto.review_app.server.api.pagination import get_page_params
+from mephisto.review_app.server.db_queries import find_units_page
 
 
 class UnitsView(MethodView):
@@ -22,7 +25,8 @@ class UnitsView(MethodView):
         """
         Get workers' results (filtered by `task_id` and/or `unit_ids`, etc) -
         without full details of input/output.
-        At least one filtering parameter must be specified
+        At least one filtering parameter must be specified.
+        Results are paginated by `after_id` and `limit`
         """
 
         task_id_param = request.args.get("task_id")
@@ -45,43 +49,40 @@ class UnitsView(MethodView):
                 "At least one of `task_id` or `unit_ids` parameters must be specified."
             )
 
+        after_id, limit = get_page_params()
+
         # Check if task with past `task_id` exists
         if task_id_param:
             Task.get(app.db, str(task_id_param))
-            if not unit_ids_param:
-                unit_ids = [int(u.db_id) for u in app.db.find_units(task_id=task_id_param)]
+
+        # Only columns of the units and their reviews are needed for the list,
+        # so agent data is left to `/units/details`
+        unit_rows = find_units_page(
+            app.db,
+            task_id=task_id_param,
+            unit_ids=unit_ids,
+            statuses=[AssignmentState.COMPLETED],
+            after_id=after_id,
+            limit=limit,
+        )
 
         # Prepare response
         units = []
-        for unit_id in unit_ids:
-            unit: Unit = Unit.get(app.db, str(unit_id))
-
-            if task_id_param and unit.task_id != task_id_param:
-                continue
-
-            if unit.db_status != AssignmentState.COMPLETED:
-                continue
-
-            try:
-                unit_data = app.data_browser.get_data_from_unit(unit)
-            except AssertionError:
-                # In case if this is Expired Unit. It raises and axceptions
-                unit_data = {}
-
-            bonus = unit_data.get("bonus")
-            review_note = unit_data.get("review_note")
+        for unit_row in unit_rows:
+            bonus = unit_row["review_bonus"]
+            review_note = unit_row["review_note"]
 
             units.append(
                 {
-                    "id": int(unit.db_id),
-                    "worker_id": int(unit.worker_id) if unit.worker_id else None,
-                    "task_id": int(unit.task_id) if unit.task_id else None,
-                    "pay_amount": unit.pay_amount,
-                    "status": unit.db_status,
-                    "creation_date": unit.creation_date.isoformat(),
+                    "id": int(unit_row["unit_id"]),
+                    "worker_id": int(unit_row["worker_id"]) if unit_row["worker_id"] else None,
+                    "task_id": int(unit_row["task_id"]) if unit_row["task_id"] else None,
+                    "pay_amount": unit_row["pay_amount"],
+                    "status": unit_row["status"],
+                    "creation_date": parse(unit_row["creation_date"]).isoformat(),
                     "results": {
-                        "start": unit_data.get("task_start"),
-                        "end": unit_data.get("task_end"),
+                        "start": None,  # See `task_start` in `/units/details`
+                        "end": None,  # See `task_end` in `/units/details`
                         "inputs_preview": None,  # optional TODO(#1058): [Review APP]
                         "outputs_preview": None,  # optional TODO(#1058): [Review APP]
                     },
@@ -94,4 +95,5 @@ class UnitsView(MethodView):
 
         return {
             "units": units,
+            "next_after_id": get_next_after_id([u["id"] for u in units], limit),
         }
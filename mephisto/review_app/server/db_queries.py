@@ -44,3 +44,60 @@ def find_units(
         rows = c.fetchall()
 
         return rows
+
+
+def find_units_page(
+    db,
+    task_id: Optional[int] = None,
+    unit_ids: Optional[List[int]] = None,
+    statuses: Optional[List[str]] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[StringIDRow]:
+    """
+    Return the unit rows matching the filters in `unit_id` order, starting after
+    `after_id`, with the bonus and review note of each unit's latest review
+    """
+    with db.table_access_condition:
+        conn = db._get_connection()
+
+        params = []
+        conditions = []
+
+        if task_id:
+            conditions.append("u.task_id = ?")
+            params.append(nonesafe_int(task_id))
+
+        if unit_ids:
+            conditions.append(f"u.unit_id IN ({','.join('?' * len(unit_ids))})")
+            params += [nonesafe_int(i) for i in unit_ids]
+
+        if statuses:
+            conditions.append(f"u.status IN ({','.join('?' * len(statuses))})")
+            params += statuses
+
+        if after_id:
+            conditions.append("u.unit_id > ?")
+            params.append(nonesafe_int(after_id))
+
+        where_query = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        limit_query = "LIMIT ?" if limit else ""
+        if limit:
+            params.append(nonesafe_int(limit))
+
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT u.*, r.bonus AS review_bonus, r.review_note AS review_note FROM units u
+            LEFT JOIN unit_review r ON r.id = (
+                SELECT MAX(id) FROM unit_review WHERE unit_review.unit_id = u.unit_id
+            )
+            {where_query}
+            ORDER BY u.unit_id ASC {limit_query};
+            """,
+            params,
+        )
+        rows = c.fetchall()
+
+        return rows
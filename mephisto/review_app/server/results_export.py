@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Set
+
+from mephisto.abstractions.database import MephistoDB
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.db_queries import find_units
+from mephisto.tools.data_browser import DataBrowser
+from mephisto.utils.logger_core import get_logger
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.parquet  # type: ignore
+
+    PYARROW_INSTALLED = True
+except ImportError:
+    PYARROW_INSTALLED = False
+
+logger = get_logger(name=__name__)
+
+EXPORT_STATUS_NOT_STARTED = "not_started"
+EXPORT_STATUS_RUNNING = "running"
+EXPORT_STATUS_FINISHED = "finished"
+EXPORT_STATUS_FAILED = "failed"
+
+RESULTS_FORMAT_JSONL = "jsonl"
+RESULTS_FORMAT_PARQUET = "parquet"
+
+# Units whose agent data is read at once. Reads further ahead than this wait for
+# earlier units to be written, so memory use doesn't grow with the task size
+DEFAULT_EXPORT_WORKERS = 8
+PARQUET_BATCH_SIZE = 1000
+
+
+def get_results_file_path(results_dir: str, task_id: str, results_format: str) -> str:
+    return os.path.join(results_dir, f"task_{task_id}__results.{results_format}")
+
+
+def read_results(results_file_path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the exported data of every unit in a JSONL results file"""
+    with open(results_file_path, "r") as f:
+        for line in f:
+            if line.endswith("\n"):
+                yield json.loads(line)
+
+
+def _prepare_results_file(results_file_path: str) -> Set[str]:
+    """
+    Return the ids of the units already in the results file, after dropping
+    a last line that a previous export didn't finish writing
+    """
+    exported_unit_ids = set()
+    if not os.path.exists(results_file_path):
+        return exported_unit_ids
+
+    complete_size = 0
+    with open(results_file_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            exported_unit_ids.add(json.loads(line)["unit_id"])
+            complete_size += len(line)
+
+    if complete_size != os.path.getsize(results_file_path):
+        with open(results_file_path, "rb+") as f:
+            f.truncate(complete_size)
+
+    return exported_unit_ids
+
+
+class TaskResultsExport:
+    """
+    Export of the results of every reviewed Unit of a Task, running in the background.
+
+    Results are appended to a JSONL file one Unit at a time, reading the agent data
+    of a few Units in parallel. Units already in the file are skipped, so running
+    the export again after new reviews, or after it was interrupted, only exports
+    the Units that are missing. A Parquet copy of the file is written at the end
+    if requested.
+    """
+
+    def __init__(
+        self,
+        db: MephistoDB,
+        data_browser: DataBrowser,
+        task_id: str,
+        results_dir: str,
+        write_parquet: bool = False,
+        max_workers: int = DEFAULT_EXPORT_WORKERS,
+    ):
+        assert (
+            not write_parquet or PYARROW_INSTALLED
+        ), "Exporting results to Parquet requires pyarrow to be installed"
+        self.db = db
+        self.data_browser = data_browser
+        self.task_id = task_id
+        self.results_dir = results_dir
+        self.write_parquet = write_parquet
+        self.max_workers = max_workers
+
+        self.status = EXPORT_STATUS_NOT_STARTED
+        self.exported_count = 0
+        self.total_count: Optional[int] = None
+        self.error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def get_file_path(self, results_format: str = RESULTS_FORMAT_JSONL) -> str:
+        return get_results_file_path(self.results_dir, self.task_id, results_format)
+
+    def start(self) -> None:
+        """Start the export in a background thread"""
+        assert self._thread is None, "An export can only be started once"
+        self.status = EXPORT_STATUS_RUNNING
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"task-{self.task_id}-results-export",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self.status == EXPORT_STATUS_RUNNING
+
+    def get_progress(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "exported_count": self.exported_count,
+            "total_count": self.total_count,
+            "error": self.error,
+        }
+
+    def _get_unit_results(self, unit_id: str) -> str:
+        unit: Unit = Unit.get(self.db, unit_id)
+
+        try:
+            unit_data = self.data_browser.get_data_from_unit(unit)
+        except AssertionError:
+            # In case if unit does not have agent somehow
+            unit_data = {}
+
+        return json.dumps({**unit_data, "unit_id": unit_id}) + "\n"
+
+    def _run(self) -> None:
+        try:
+            self._export_jsonl()
+            if self.write_parquet:
+                self._export_parquet()
+            self.status = EXPORT_STATUS_FINISHED
+        except Exception as e:
+            logger.exception(f"Failed to export results of task {self.task_id}")
+            self.error = str(e)
+            self.status = EXPORT_STATUS_FAILED
+
+    def _export_jsonl(self) -> None:
+        os.makedirs(self.results_dir, exist_ok=True)
+        results_file_path = self.get_file_path()
+        exported_unit_ids = _prepare_results_file(results_file_path)
+
+        unit_ids = [
+            u["unit_id"]
+            for u in find_units(self.db, int(self.task_id), statuses=AssignmentState.completed())
+            if u["status"] != AssignmentState.COMPLETED
+        ]
+        self.total_count = len(unit_ids)
+        self.exported_count = len([i for i in unit_ids if i in exported_unit_ids])
+        unit_ids_to_export = [i for i in unit_ids if i not in exported_unit_ids]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, open(
+            results_file_path, "a"
+        ) as f:
+            pending_results: deque = deque()
+
+            def write_next_results() -> None:
+                # Each line is flushed whole, so an interrupted export can be resumed
+                f.write(pending_results.popleft().result())
+                f.flush()
+                self.exported_count += 1
+
+            for unit_id in unit_ids_to_export:
+                pending_results.append(executor.submit(self._get_unit_results, unit_id))
+                if len(pending_results) >= self.max_workers:
+                    write_next_results()
+            while pending_results:
+                write_next_results()
+
+    def _export_parquet(self) -> None:
+        """Convert the JSONL results to Parquet, a batch of units at a time"""
+        parquet_file_path = self.get_file_path(RESULTS_FORMAT_PARQUET)
+        schema = pyarrow.schema([("unit_id", pyarrow.string()), ("unit_data", pyarrow.string())])
+
+        def write_batch(writer: "pyarrow.parquet.ParquetWriter", batch: list) -> None:
+            writer.write_table(
+                pyarrow.Table.from_pydict(
+                    {
+                        "unit_id": [r["unit_id"] for r in batch],
+                        "unit_data": [json.dumps(r) for r in batch],
+                    },
+                    schema=schema,
+                )
+            )
+
+        # Written under a temporary name so that a partial file is never served
+        tmp_file_path = f"{parquet_file_path}.tmp"
+        with pyarrow.parquet.ParquetWriter(tmp_file_path, schema) as writer:
+            batch = []
+            for unit_results in read_results(self.get_file_path()):
+                batch.append(unit_results)
+                if len(batch) == PARQUET_BATCH_SIZE:
+                    write_batch(writer, batch)
+                    batch = []
+            if batch:
+                write_batch(writer, batch)
+        os.replace(tmp_file_path, parquet_file_path)
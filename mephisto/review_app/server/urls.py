@@ -46,10 +46,18 @@ def init_urls(app: Flask):
         "/api/tasks/<int:task_id>/export-results",
         view_func=api_views.TaskExportResultsView.as_view("task_export_results"),
     )
+    app.add_url_rule(
+        "/api/tasks/<int:task_id>/export-results/progress",
+        view_func=api_views.TaskExportResultsProgressView.as_view("task_export_results_progress"),
+    )
     app.add_url_rule(
         "/api/tasks/<int:task_id>/<int:n_units>/export-results.json",
         view_func=api_views.TaskExportResultsJsonView.as_view("task_export_results_json"),
     )
+    app.add_url_rule(
+        "/api/tasks/<int:task_id>/export-results.<any(jsonl, parquet):results_format>",
+        view_func=api_views.TaskExportResultsFileView.as_view("task_export_results_file"),
+    )
     app.add_url_rule(
         "/api/units",
         view_func=api_views.UnitsView.as_view("units"),
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark comparing the ParlAIChatAgentState storage modes.
+
+Every conversation saves its initial state, then one live update per turn,
+then a final submission, the way a ParlAI chat world does. Reports the time
+spent and the bytes written to storage for each mode.
+
+Usage:
+    python -m mephisto.scripts.benchmarks.agent_state_storage --conversations 20 --turns 200
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict
+
+from mephisto.abstractions.blueprints.parlai_chat.parlai_chat_agent_state import (
+    ParlAIChatAgentState,
+    STATE_STORAGE_JSON,
+    STATE_STORAGE_JSONL,
+)
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.agent import Agent
+from mephisto.utils.testing import get_test_agent
+
+STORAGE_MODES = [STATE_STORAGE_JSON, STATE_STORAGE_JSONL]
+MESSAGE_TEXT = "This is a chat message of a fairly typical length for a dialogue turn. " * 2
+
+
+class ByteCountingDB(LocalMephistoDB):
+    """LocalMephistoDB that counts the bytes written through the file methods"""
+
+    bytes_written = 0
+
+    def write_dict(self, path_key: str, target_dict: Dict[str, Any]):
+        self.bytes_written += len(json.dumps(target_dict))
+        super().write_dict(path_key, target_dict)
+
+    def write_text(self, path_key: str, data_string: str):
+        self.bytes_written += len(data_string)
+        super().write_text(path_key, data_string)
+
+    def append_text(self, path_key: str, data_string: str):
+        self.bytes_written += len(data_string)
+        super().append_text(path_key, data_string)
+
+
+def run_benchmark(storage_mode: str, num_conversations: int, num_turns: int) -> Dict[str, Any]:
+    """Run the conversations with the given storage mode against a fresh database"""
+    data_dir = tempfile.mkdtemp()
+    db = ByteCountingDB(os.path.join(data_dir, "database.db"))
+    try:
+        agent = Agent.get(db, get_test_agent(db))
+        db.bytes_written = 0
+        elapsed = 0.0
+        for _ in range(num_conversations):
+            # Every conversation starts from an empty agent state
+            shutil.rmtree(agent.get_data_dir(), ignore_errors=True)
+            start_time = time.monotonic()
+            state = ParlAIChatAgentState(agent)
+            state.storage_mode = storage_mode
+            state.set_init_state({"persona": "benchmark persona"})
+            for turn in range(num_turns):
+                state.update_data(
+                    {
+                        "id": f"agent_{turn % 2}",
+                        "text": MESSAGE_TEXT,
+                        "task_data": {"turn": turn},
+                    }
+                )
+            state.update_submit({"rating": 5})
+            elapsed += time.monotonic() - start_time
+        return {
+            "mode": storage_mode,
+            "conversations": num_conversations,
+            "turns": num_turns,
+            "seconds": elapsed,
+            "bytes_written": db.bytes_written,
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--conversations", type=int, default=20, help="Conversations to run")
+    parser.add_argument("--turns", type=int, default=200, help="Turns per conversation")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=STORAGE_MODES,
+        choices=STORAGE_MODES,
+        help="Storage modes to compare",
+    )
+    args = parser.parse_args()
+
+    results = [run_benchmark(mode, args.conversations, args.turns) for mode in args.modes]
+    print(f"{'mode':>6} {'convos':>7} {'turns':>6} {'seconds':>9} {'MB written':>11}")
+    for result in results:
+        print(
+            f"{result['mode']:>6} {result['conversations']:>7} {result['turns']:>6} "
+            f"{result['seconds']:>9.2f} {result['bytes_written'] / 1e6:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark comparing the throughput of the LocalMephistoDB concurrency modes.
+
+Every worker thread simulates the traffic of a live task: it registers an agent
+on a free unit, moves the agent through a few status updates, and in between
+issues the unit/agent lookups that the live server makes on every packet.
+
+Usage:
+    python -m mephisto.scripts.benchmarks.database_concurrency --threads 200 --units 2000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+from mephisto.abstractions.databases.local_database import (
+    LocalMephistoDB,
+    VALID_CONCURRENCY_MODES,
+)
+from mephisto.data_model.agent import AgentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.utils.testing import get_test_task_run
+
+AGENT_STATUS_PROGRESSION = [
+    AgentState.STATUS_ACCEPTED,
+    AgentState.STATUS_IN_TASK,
+    AgentState.STATUS_COMPLETED,
+]
+READS_PER_WRITE = 4
+
+
+def _populate(db: LocalMephistoDB, num_units: int, num_workers: int):
+    task_run = TaskRun.get(db, get_test_task_run(db))
+    unit_ids = []
+    for _ in range(num_units):
+        assignment_id = db.new_assignment(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            task_run.task_type,
+            task_run.provider_type,
+        )
+        unit_ids.append(
+            db.new_unit(
+                task_run.task_id,
+                task_run.db_id,
+                task_run.requester_id,
+                assignment_id,
+                0,
+                0.1,
+                task_run.provider_type,
+                task_run.task_type,
+            )
+        )
+    worker_ids = [db.new_worker(f"bench_worker_{i}", "mock") for i in range(num_workers)]
+    return task_run, unit_ids, worker_ids
+
+
+def run_benchmark(concurrency_mode: str, num_threads: int, num_units: int) -> Dict[str, Any]:
+    """Run the mixed register/update workload against a fresh database"""
+    data_dir = tempfile.mkdtemp()
+    db = LocalMephistoDB(
+        os.path.join(data_dir, "database.db"),
+        concurrency_mode=concurrency_mode,
+    )
+    try:
+        task_run, unit_ids, worker_ids = _populate(db, num_units, num_threads)
+        unit_batches: List[List[str]] = [unit_ids[i::num_threads] for i in range(num_threads)]
+        op_counts = [0] * num_threads
+        start_barrier = threading.Barrier(num_threads + 1)
+
+        def simulate_worker(idx: int):
+            worker_id = worker_ids[idx]
+            start_barrier.wait()
+            for unit_id in unit_batches[idx]:
+                unit_row = db.get_unit(unit_id)
+                agent_id = db.new_agent(
+                    worker_id,
+                    unit_id,
+                    task_run.task_id,
+                    task_run.db_id,
+                    unit_row["assignment_id"],
+                    task_run.task_type,
+                    task_run.provider_type,
+                )
+                op_counts[idx] += 2
+                for status in AGENT_STATUS_PROGRESSION:
+                    for _ in range(READS_PER_WRITE):
+                        db.get_agent(agent_id)
+                    db.find_units(task_run_id=task_run.db_id, worker_id=worker_id)
+                    db.update_agent(agent_id, status=status)
+                    op_counts[idx] += READS_PER_WRITE + 2
+
+        threads = [threading.Thread(target=simulate_worker, args=(i,)) for i in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        start_barrier.wait()
+        start_time = time.monotonic()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start_time
+        total_ops = sum(op_counts)
+        return {
+            "mode": concurrency_mode,
+            "threads": num_threads,
+            "units": num_units,
+            "operations": total_ops,
+            "seconds": elapsed,
+            "ops_per_second": total_ops / elapsed,
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, default=200, help="Concurrent worker threads")
+    parser.add_argument("--units", type=int, default=2000, help="Units to register agents on")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=VALID_CONCURRENCY_MODES,
+        choices=VALID_CONCURRENCY_MODES,
+        help="Concurrency modes to compare",
+    )
+    args = parser.parse_args()
+
+    results = [run_benchmark(mode, args.threads, args.units) for mode in args.modes]
+    print(f"{'mode':>8} {'threads':>8} {'ops':>8} {'seconds':>9} {'ops/sec':>10}")
+    for result in results:
+        print(
+            f"{result['mode']:>8} {result['threads']:>8} {result['operations']:>8} "
+            f"{result['seconds']:>9.2f} {result['ops_per_second']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark of building FormComposer form versions from token sets.
+
+Generates a form config with tokens in its sections, fieldsets and fields, and a
+token set for each unit, then builds every form version twice: from the form
+config compiled once, and by copying the whole form config and substituting
+tokens in it for each unit. Reports the time each takes, after checking that
+both build the same form versions.
+
+Usage:
+    python -m mephisto.scripts.benchmarks.form_composer_extrapolation --units 100000
+"""
+
+import argparse
+import time
+from copy import deepcopy
+from typing import Any, Callable, Dict, Iterable, List
+
+from mephisto.generators.form_composer.config_validation.config_validation_constants import (
+    TOKENS_VALUES_KEY,
+)
+from mephisto.generators.form_composer.config_validation.task_data_config import (
+    _extrapolate_tokens_in_form_config,
+    _iter_extrapolated_form_configs,
+)
+
+COMPARED_UNITS = 100
+
+
+def make_form_config(num_sections: int, num_fields: int) -> Dict[str, Any]:
+    """Form config with a section per token, each with `num_fields` fields"""
+
+    def make_field(section: int, field: int) -> Dict[str, Any]:
+        return {
+            "id": f"id_field_{section}_{field}",
+            "name": f"field_{section}_{field}",
+            "label": f"Field {field} about {{{{ token_{section} }}}}",
+            "help": "Field help",
+            "tooltip": f"Tooltip with {{{{ token_{section} }}}}",
+            "placeholder": "Field placeholder",
+            "type": "input",
+            "value": "",
+        }
+
+    return {
+        "form": {
+            "title": "Form about {{ token_0 }}",
+            "instruction": "Form instruction",
+            "sections": [
+                {
+                    "name": f"section_{section}",
+                    "title": f"Section about {{{{ token_{section} }}}}",
+                    "instruction": "Section instruction",
+                    "fieldsets": [
+                        {
+                            "title": "Fieldset title",
+                            "instruction": "Fieldset instruction",
+                            "rows": [
+                                {"fields": [make_field(section, field)]}
+                                for field in range(num_fields)
+                            ],
+                        },
+                    ],
+                }
+                for section in range(num_sections)
+            ],
+            "submit_button": {
+                "text": "Submit",
+                "instruction": "Submit instruction",
+                "tooltip": "Submit tooltip",
+            },
+        },
+    }
+
+
+def make_token_sets(num_units: int, num_tokens: int) -> List[Dict[str, Any]]:
+    return [
+        {TOKENS_VALUES_KEY: {f"token_{t}": f"value {t} of unit {u}" for t in range(num_tokens)}}
+        for u in range(num_units)
+    ]
+
+
+def iter_copied_form_configs(
+    form_config: Dict[str, Any], token_sets: List[Dict[str, Any]]
+) -> Iterable[Dict[str, Any]]:
+    """Form versions built by copying the whole form config for each token set"""
+    for token_set in token_sets:
+        yield _extrapolate_tokens_in_form_config(
+            deepcopy(form_config),
+            token_set[TOKENS_VALUES_KEY],
+        )
+
+
+def run_benchmark(
+    build_form_configs: Callable[..., Iterable[Dict[str, Any]]],
+    form_config: Dict[str, Any],
+    token_sets: List[Dict[str, Any]],
+) -> float:
+    start_time = time.monotonic()
+    for _ in build_form_configs(form_config, token_sets):
+        pass
+    return time.monotonic() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--units", type=int, default=100000, help="Form versions to build")
+    parser.add_argument("--sections", type=int, default=5, help="Sections, one token each")
+    parser.add_argument("--fields", type=int, default=10, help="Fields in each section")
+    args = parser.parse_args()
+
+    form_config = make_form_config(args.sections, args.fields)
+    token_sets = make_token_sets(args.units, args.sections)
+
+    compared_token_sets = token_sets[:COMPARED_UNITS]
+    assert list(_iter_extrapolated_form_configs(form_config, compared_token_sets)) == list(
+        iter_copied_form_configs(form_config, compared_token_sets)
+    ), "Compiled form config builds different form versions"
+
+    print(f"{'method':>10} {'seconds':>9} {'units/s':>10}")
+    for method, build_form_configs in [
+        ("compiled", _iter_extrapolated_form_configs),
+        ("copied", iter_copied_form_configs),
+    ]:
+        seconds = run_benchmark(build_form_configs, form_config, token_sets)
+        print(f"{method:>10} {seconds:>9.2f} {args.units / seconds:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Load test of the live server, driving simulated workers through a task run.
+
+Launches a mock blueprint task run on an Operator, with the mock architect and
+provider, and has simulated workers arrive at the mock server at the given rate.
+Every worker registers, submits onboarding if it's required, sends live updates,
+waits for the task to answer and submits its unit, each step sent as soon as the
+server answers the previous one. Reports the latency percentiles of every step,
+the packet throughput, the database latency by method, the task runner threads
+and the process RSS over time, as a JSON report.
+
+Note that live update latencies include the fixed 0.3s the mock task runner
+waits before reading the first live update of a unit.
+
+Usage:
+    mephisto bench live --workers 2000 --output live_report.json
+    python -m mephisto.scripts.benchmarks.live_server --workers 2000
+"""
+
+import argparse
+import json
+import math
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from omegaconf import MISSING, OmegaConf
+from prometheus_client.metrics import MetricWrapperBase  # type: ignore
+
+from mephisto.abstractions._subcomponents.task_runner import ONGOING_THREAD_COUNT
+from mephisto.abstractions.architects.mock_architect import MockArchitectArgs, MockServer
+from mephisto.abstractions.blueprint import AgentState
+from mephisto.abstractions.blueprints.mock.mock_blueprint import MockBlueprintArgs
+from mephisto.abstractions.database import DATABASE_LATENCY
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.providers.mock.mock_provider import MockProviderArgs
+from mephisto.data_model.agent import OnboardingAgent
+from mephisto.data_model.packet import (
+    PACKET_TYPE_AGENT_DETAILS,
+    PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE,
+    PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE,
+    PACKET_TYPE_REGISTER_AGENT,
+    PACKET_TYPE_SUBMIT_ONBOARDING,
+    PACKET_TYPE_SUBMIT_UNIT,
+)
+from mephisto.data_model.task_run import TaskRunArgs
+from mephisto.operations.hydra_config import MephistoConfig
+from mephisto.operations.operator import Operator
+from mephisto.scripts.benchmarks.websocket_channel_throughput import get_free_port
+from mephisto.utils.testing import get_test_requester
+
+DEFAULT_WORKERS = 1000
+# Workers arriving per second, 0 for all at once
+DEFAULT_ARRIVAL_RATE = 100.0
+DEFAULT_LIVE_UPDATES = 3
+DEFAULT_SAMPLE_INTERVAL = 1.0
+DEFAULT_TIMEOUT = 600
+
+SERVER_START_TIMEOUT = 10
+# Time given to the operator to record the last submissions
+DRAIN_TIMEOUT = 30
+ARRIVAL_TICK_SECONDS = 0.05
+ONBOARDING_QUALIFICATION = "live_benchmark_onboarding"
+STEPS = ["registration", "onboarding", "live_update", "worker"]
+
+
+def get_rss_bytes() -> int:
+    """Resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Only the peak is available outside of Linux, in bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_metric_samples(metric: MetricWrapperBase, sample_name: str, label: str) -> Dict[str, float]:
+    """Values of the given samples of a prometheus metric, by the value of a label"""
+    return {
+        sample.labels[label]: sample.value
+        for family in metric.collect()
+        for sample in family.samples
+        if sample.name == sample_name
+    }
+
+
+def get_database_latency() -> Dict[str, Tuple[float, float]]:
+    """Number of calls and seconds spent in them so far, by database method"""
+    counts = get_metric_samples(DATABASE_LATENCY, "database_latency_seconds_count", "method")
+    sums = get_metric_samples(DATABASE_LATENCY, "database_latency_seconds_sum", "method")
+    return {method: (count, sums.get(method, 0.0)) for method, count in counts.items()}
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, Any]:
+    if not latencies:
+        return {"count": 0}
+    latencies = sorted(latencies)
+
+    def percentile_ms(percentile: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile))] * 1000
+
+    return {
+        "count": len(latencies),
+        "p50_ms": percentile_ms(0.5),
+        "p90_ms": percentile_ms(0.9),
+        "p99_ms": percentile_ms(0.99),
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+class SimulatedWorkers:
+    """
+    Workers going through a task run on the mock server. Each worker's next
+    packets are sent from the server thread as soon as it answers the last ones.
+    """
+
+    def __init__(self, server: MockServer, num_workers: int, live_updates: int):
+        assert live_updates > 0, "Mock task units wait for at least one live update"
+        self.server = server
+        self.num_workers = num_workers
+        self.live_updates = live_updates
+
+        self.latencies: Dict[str, List[float]] = {step: [] for step in STEPS}
+        self.failures: "Counter[str]" = Counter()
+        self.submitted = 0
+        self.packets_sent = 0
+        self.packets_received = 0
+        self.all_finished = threading.Event()
+
+        self._finished = 0
+        self._lock = threading.Lock()
+        # Map from request id to the step, worker and time of the request
+        self._pending_requests: Dict[str, Tuple[str, int, float]] = {}
+        # Map from agent id to the worker and the time its live updates were sent
+        self._pending_live_updates: Dict[str, Tuple[int, float]] = {}
+        self._arrival_times: Dict[int, float] = {}
+        server.add_packet_listener(self._on_packet)
+
+    def arrive(self, arrival_rate: float, stop: threading.Event) -> None:
+        """Register all workers, arrival_rate of them per second"""
+        start_time = time.monotonic()
+        arrived = 0
+        while arrived < self.num_workers and not stop.is_set():
+            if arrival_rate > 0:
+                elapsed = time.monotonic() - start_time
+                due = min(self.num_workers, int(elapsed * arrival_rate) + 1)
+            else:
+                due = self.num_workers
+            if due > arrived:
+                self._register(range(arrived, due))
+                arrived = due
+            time.sleep(ARRIVAL_TICK_SECONDS)
+
+    def _register(self, worker_indices: range) -> None:
+        now = time.monotonic()
+        messages = []
+        with self._lock:
+            for worker_index in worker_indices:
+                request_id = f"registration_{worker_index}"
+                self._arrival_times[worker_index] = now
+                self._pending_requests[request_id] = ("registration", worker_index, now)
+                messages.append(
+                    {
+                        "packet_type": PACKET_TYPE_REGISTER_AGENT,
+                        "subject_id": "MockServer",
+                        "data": {
+                            "request_id": request_id,
+                            "provider_data": {
+                                "worker_name": f"live_benchmark_worker_{worker_index}",
+                                "agent_registration_id": f"live_benchmark_{worker_index}",
+                            },
+                        },
+                    }
+                )
+        self._send(messages)
+
+    def _send(self, messages: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.packets_sent += len(messages)
+        self.server.send_messages(messages)
+
+    def _finish(self, worker_index: int, submitted: bool) -> None:
+        with self._lock:
+            self._finished += 1
+            if submitted:
+                self.submitted += 1
+                arrival_time = self._arrival_times.pop(worker_index)
+                self.latencies["worker"].append(time.monotonic() - arrival_time)
+            if self._finished == self.num_workers:
+                self.all_finished.set()
+
+    def _on_packet(self, packet: Dict[str, Any]) -> None:
+        with self._lock:
+            self.packets_received += 1
+        if packet["packet_type"] == PACKET_TYPE_AGENT_DETAILS:
+            self._on_agent_details(packet["data"])
+        elif packet["packet_type"] == PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE:
+            self._on_live_update(packet["subject_id"])
+
+    def _on_agent_details(self, details: Dict[str, Any]) -> None:
+        with self._lock:
+            request = self._pending_requests.pop(details["request_id"], None)
+            if request is None:
+                return
+            step, worker_index, sent_time = request
+            self.latencies[step].append(time.monotonic() - sent_time)
+
+        agent_id = details.get("agent_id")
+        if agent_id is None:
+            with self._lock:
+                self.failures[details.get("failure_reason") or "unknown"] += 1
+            self._finish(worker_index, submitted=False)
+        elif OnboardingAgent.is_onboarding_id(agent_id):
+            request_id = f"onboarding_{worker_index}"
+            with self._lock:
+                self._pending_requests[request_id] = ("onboarding", worker_index, time.monotonic())
+            self._send(
+                [
+                    {
+                        "packet_type": PACKET_TYPE_SUBMIT_ONBOARDING,
+                        "subject_id": agent_id,
+                        "data": {
+                            "request_id": request_id,
+                            "onboarding_data": {"should_pass": True},
+                        },
+                    }
+                ]
+            )
+        else:
+            with self._lock:
+                self._pending_live_updates[agent_id] = (worker_index, time.monotonic())
+            self._send(
+                [
+                    {
+                        "packet_type": PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE,
+                        "subject_id": agent_id,
+                        "data": {"text": f"live update {i}", "update_id": str(uuid.uuid4())},
+                    }
+                    for i in range(self.live_updates)
+                ]
+            )
+
+    def _on_live_update(self, agent_id: str) -> None:
+        with self._lock:
+            live_update = self._pending_live_updates.pop(agent_id, None)
+            if live_update is None:
+                return
+            worker_index, sent_time = live_update
+            self.latencies["live_update"].append(time.monotonic() - sent_time)
+        self._send(
+            [
+                {
+                    "packet_type": PACKET_TYPE_SUBMIT_UNIT,
+                    "subject_id": agent_id,
+                    "data": {"completed": True},
+                }
+            ]
+        )
+        self._finish(worker_index, submitted=True)
+
+
+def sample_resources(
+    samples: List[Dict[str, Any]], start_time: float, interval: float, stop: threading.Event
+) -> None:
+    """Append the process' resource usage to samples every interval, until stopped"""
+    while True:
+        samples.append(
+            {
+                "seconds": time.monotonic() - start_time,
+                "rss_mb": get_rss_bytes() / 2**20,
+                "threads": threading.active_count(),
+                "task_runner_threads": get_metric_samples(
+                    ONGOING_THREAD_COUNT, "task_runner_thread_count", "thread_type"
+                ),
+            }
+        )
+        if stop.wait(interval):
+            return
+
+
+def run_live_benchmark(
+    num_workers: int = DEFAULT_WORKERS,
+    arrival_rate: float = DEFAULT_ARRIVAL_RATE,
+    live_updates: int = DEFAULT_LIVE_UPDATES,
+    use_onboarding: bool = True,
+    sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+    timeout: int = DEFAULT_TIMEOUT,
+) -> Dict[str, Any]:
+    """Run num_workers simulated workers through a mock task run, returning the report"""
+    data_dir = tempfile.mkdtemp()
+    db = LocalMephistoDB(os.path.join(data_dir, "mephisto.db"))
+    requester_name, _ = get_test_requester(db)
+    operator = Operator(db)
+    stop = threading.Event()
+    threads: List[threading.Thread] = []
+    try:
+        # Mock assignments have two units, that are run separately when not concurrent
+        config = MephistoConfig(
+            blueprint=MockBlueprintArgs(
+                num_assignments=math.ceil(num_workers / 2),
+                is_concurrent=False,
+                timeout_time=timeout,
+                use_onboarding=use_onboarding,
+                onboarding_qualification=ONBOARDING_QUALIFICATION if use_onboarding else MISSING,
+            ),
+            provider=MockProviderArgs(requester_name=requester_name),
+            architect=MockArchitectArgs(should_run_server=True, port=str(get_free_port())),
+            task=TaskRunArgs(
+                task_title="Live server benchmark",
+                task_description="Simulated workers load testing the live server",
+                task_reward=0.1,
+                task_tags="benchmark",
+                submission_timeout=timeout,
+            ),
+        )
+        task_run_id = operator.launch_task_run_or_die(OmegaConf.structured(config))
+        server = operator.get_running_task_runs()[task_run_id].architect.server
+        assert server is not None, "Mock architect didn't launch its server"
+        assert operator._run_loop_until(
+            lambda: len(server.subs) > 0, SERVER_START_TIMEOUT
+        ), "Operator didn't connect to the mock server in time"
+
+        workers = SimulatedWorkers(server, num_workers, live_updates)
+        samples: List[Dict[str, Any]] = []
+        database_latency_before = get_database_latency()
+        start_time = time.monotonic()
+        threads = [
+            threading.Thread(
+                target=sample_resources,
+                args=(samples, start_time, sample_interval, stop),
+                name="live-benchmark-sampler",
+            ),
+            threading.Thread(
+                target=workers.arrive,
+                args=(arrival_rate, stop),
+                name="live-benchmark-arrivals",
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        operator._run_loop_until(workers.all_finished.is_set, timeout)
+        seconds = time.monotonic() - start_time
+        operator._run_loop_until(
+            lambda: len(db.find_agents(task_run_id=task_run_id, status=AgentState.STATUS_COMPLETED))
+            >= workers.submitted,
+            DRAIN_TIMEOUT,
+        )
+        stop.set()
+        for thread in threads:
+            thread.join()
+        units_completed = len(
+            db.find_agents(task_run_id=task_run_id, status=AgentState.STATUS_COMPLETED)
+        )
+        database_latency = {}
+        for method, (count, total) in get_database_latency().items():
+            count_before, total_before = database_latency_before.get(method, (0.0, 0.0))
+            if count > count_before:
+                database_latency[method] = {
+                    "count": int(count - count_before),
+                    "total_seconds": total - total_before,
+                    "mean_ms": (total - total_before) / (count - count_before) * 1000,
+                }
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        operator.force_shutdown(timeout=DRAIN_TIMEOUT)
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {
+        "config": {
+            "workers": num_workers,
+            "arrival_rate": arrival_rate,
+            "live_updates": live_updates,
+            "onboarding": use_onboarding,
+        },
+        "seconds": seconds,
+        "workers": {
+            "submitted": workers.submitted,
+            "failed": dict(workers.failures),
+            "unfinished": num_workers - workers.submitted - sum(workers.failures.values()),
+        },
+        "units_completed": units_completed,
+        "latency": {step: summarize_latencies(workers.latencies[step]) for step in STEPS},
+        "packets": {
+            "sent": workers.packets_sent,
+            "received": workers.packets_received,
+            "per_second": (workers.packets_sent + workers.packets_received) / seconds,
+        },
+        "database": dict(
+            sorted(database_latency.items(), key=lambda item: -item[1]["total_seconds"])
+        ),
+        "peak_rss_mb": max(sample["rss_mb"] for sample in samples),
+        "samples": samples,
+    }
+
+
+def write_report(report: Dict[str, Any], output: Optional[str]) -> None:
+    """Write the report as JSON to the output file, or print it if there's none"""
+    report_json = json.dumps(report, indent=2)
+    if output is None:
+        print(report_json)
+    else:
+        with open(output, "w") as f:
+            f.write(report_json + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Simulated workers")
+    parser.add_argument(
+        "--arrival-rate",
+        type=float,
+        default=DEFAULT_ARRIVAL_RATE,
+        help="Workers arriving per second, 0 for all at once",
+    )
+    parser.add_argument(
+        "--live-updates",
+        type=int,
+        default=DEFAULT_LIVE_UPDATES,
+        help="Live updates each worker sends before submitting",
+    )
+    parser.add_argument("--no-onboarding", action="store_true", help="Let workers skip onboarding")
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=DEFAULT_SAMPLE_INTERVAL,
+        help="Seconds between samples of the RSS and thread counts",
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=DEFAULT_TIMEOUT, help="Seconds to wait for all workers"
+    )
+    parser.add_argument("--output", default=None, help="File to write the JSON report to")
+    args = parser.parse_args()
+
+    report = run_live_benchmark(
+        num_workers=args.workers,
+        arrival_rate=args.arrival_rate,
+        live_updates=args.live_updates,
+        use_onboarding=not args.no_onboarding,
+        sample_interval=args.sample_interval,
+        timeout=args.timeout,
+    )
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Load test of the Flask router's agent requests.
+
+Starts the Flask router locally, connects a WebsocketChannel to it that plays
+the Mephisto server by answering every agent registration after a delay, and
+then makes concurrent /request_agent posts. Reports how many of them got their agent
+details back, their latencies, and the CPU time the router used.
+
+Usage:
+    python -m mephisto.scripts.benchmarks.router_agent_requests --requests 1000
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from mephisto.abstractions.architects.channels.websocket_channel import WebsocketChannel
+from mephisto.data_model.packet import (
+    Packet,
+    PACKET_TYPE_AGENT_DETAILS,
+    PACKET_TYPE_ALIVE,
+    PACKET_TYPE_REGISTER_AGENT,
+)
+from mephisto.operations.client_io_handler import SYSTEM_CHANNEL_ID
+from mephisto.scripts.benchmarks.websocket_channel_throughput import (
+    get_free_port,
+    start_router,
+)
+
+REQUEST_TIMEOUT = 60
+
+
+def post_agent_request(port: int) -> Optional[float]:
+    """Request an agent from the router, returning the latency if it succeeded"""
+    body = json.dumps({"provider_data": {"worker_name": "load_test"}, "client_timestamp": 0})
+    request = urllib.request.Request(
+        f"http://localhost:{port}/request_agent",
+        data=body.encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    start_time = time.monotonic()
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            details = json.loads(response.read())
+    except Exception:
+        return None
+    if details["data"].get("agent_id") is None:
+        return None
+    return time.monotonic() - start_time
+
+
+def run_load_test(
+    port: int, num_requests: int, concurrency: int, response_delay: float
+) -> Dict[str, Any]:
+    """Make num_requests agent requests against the router, concurrency at a time"""
+    channel: Optional[WebsocketChannel] = None
+
+    def on_message(channel_id: str, packet: Packet) -> None:
+        # Answer registrations the way the ClientIOHandler would, after the delay
+        if packet.type == PACKET_TYPE_REGISTER_AGENT:
+            request_id = packet.data["request_id"]
+            assert channel is not None
+            response = Packet(
+                packet_type=PACKET_TYPE_AGENT_DETAILS,
+                subject_id=packet.subject_id,
+                data={"request_id": request_id, "agent_id": f"agent_{request_id}"},
+            )
+            threading.Timer(response_delay, channel.enqueue_send, args=(response,)).start()
+
+    channel = WebsocketChannel(
+        "load_test",
+        on_channel_open=lambda channel_id: None,
+        on_catastrophic_disconnect=lambda channel_id: None,
+        on_message=on_message,
+        socket_url=f"ws://localhost:{port}/",
+    )
+    channel.open()
+    try:
+        while not channel.is_alive():
+            time.sleep(0.05)
+        channel.enqueue_send(Packet(packet_type=PACKET_TYPE_ALIVE, subject_id=SYSTEM_CHANNEL_ID))
+        time.sleep(0.5)
+
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(post_agent_request, [port] * num_requests))
+        elapsed = time.monotonic() - start_time
+    finally:
+        channel.close()
+
+    latencies = sorted(latency for latency in results if latency is not None)
+    return {
+        "requests": num_requests,
+        "succeeded": len(latencies),
+        "seconds": elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else float("nan"),
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=1000, help="Agent requests to make")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Requests in flight at once, all of them by default",
+    )
+    parser.add_argument(
+        "--response-delay",
+        type=float,
+        default=1.0,
+        help="Seconds the fake Mephisto server takes to answer each registration",
+    )
+    args = parser.parse_args()
+
+    port = get_free_port()
+    router_process = start_router(port)
+    try:
+        result = run_load_test(
+            port, args.requests, args.concurrency or args.requests, args.response_delay
+        )
+    finally:
+        router_process.kill()
+        _, _, router_usage = os.wait4(router_process.pid, 0)
+    router_cpu_seconds = router_usage.ru_utime + router_usage.ru_stime
+
+    print(
+        f"{'requests':>9} {'succeeded':>10} {'seconds':>9} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'router cpu s':>13}"
+    )
+    print(
+        f"{result['requests']:>9} {result['succeeded']:>10} {result['seconds']:>9.2f} "
+        f"{result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {router_cpu_seconds:>13.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark of the memory the MephistoSingletonDB keeps for loaded units.
+
+Builds a synthetic database of units, then for each cache size loads every
+unit once, as a long-lived operator does over many task runs, followed by the
+most recent units again. Reports the memory still held once nothing else
+references the units, and the cache hits, misses and evictions.
+
+Usage:
+    python -m mephisto.scripts.benchmarks.singleton_cache_memory --units 200000
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+from prometheus_client import REGISTRY  # type: ignore
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_singleton_database import (
+    DEFAULT_CACHE_SIZE,
+    MephistoSingletonDB,
+)
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
+from mephisto.utils.testing import get_test_task_run
+
+CREATE_BATCH_SIZE = 10000
+RECENT_UNITS = 1000
+
+
+def _populate(database_path: str, num_units: int) -> List[str]:
+    db = LocalMephistoDB(database_path)
+    try:
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        unit_ids = []
+        for start in range(0, num_units, CREATE_BATCH_SIZE):
+            assignment_rows = db.new_assignments_batch(
+                task_run.task_id,
+                task_run.db_id,
+                task_run.requester_id,
+                task_run.task_type,
+                task_run.provider_type,
+                count=min(CREATE_BATCH_SIZE, num_units - start),
+            )
+            unit_rows = db.new_units_batch(
+                task_run.task_id,
+                task_run.db_id,
+                task_run.requester_id,
+                [(row["assignment_id"], 0) for row in assignment_rows],
+                0.1,
+                task_run.provider_type,
+                task_run.task_type,
+            )
+            unit_ids += [row["unit_id"] for row in unit_rows]
+        return unit_ids
+    finally:
+        db.shutdown()
+
+
+def _get_unit_cache_events() -> Tuple[float, ...]:
+    return tuple(
+        REGISTRY.get_sample_value(
+            "singleton_db_cache_events_total", {"cache": "Unit", "event": event}
+        )
+        or 0
+        for event in ["hit", "miss", "eviction"]
+    )
+
+
+def run_benchmark(database_path: str, unit_ids: List[str], cache_size: int) -> Dict[str, Any]:
+    """Load every unit, then the most recent ones again, with the given cache size"""
+    events_before = _get_unit_cache_events()
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.monotonic()
+    db = MephistoSingletonDB(database_path, cache_size=cache_size)
+    try:
+        for unit_id in unit_ids:
+            Unit.get(db, unit_id)
+        for unit_id in unit_ids[-RECENT_UNITS:]:
+            Unit.get(db, unit_id)
+        elapsed = time.monotonic() - start_time
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        db.shutdown()
+    hits, misses, evictions = (
+        after - before for after, before in zip(_get_unit_cache_events(), events_before)
+    )
+    return {
+        "cache_size": cache_size,
+        "seconds": elapsed,
+        "retained_mb": retained / 2**20,
+        "peak_mb": peak / 2**20,
+        "hits": hits,
+        "misses": misses,
+        "evictions": evictions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--units", type=int, default=200000, help="Units in the database")
+    parser.add_argument(
+        "--cache-sizes",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Cache sizes to compare, by default one holding every unit and the default",
+    )
+    args = parser.parse_args()
+    cache_sizes = args.cache_sizes or [args.units, DEFAULT_CACHE_SIZE]
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        database_path = os.path.join(data_dir, "database.db")
+        unit_ids = _populate(database_path, args.units)
+        results = [run_benchmark(database_path, unit_ids, size) for size in cache_sizes]
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(
+        f"{'cache size':>10} {'seconds':>9} {'retained MB':>12} {'peak MB':>9} "
+        f"{'hits':>8} {'misses':>8} {'evictions':>10}"
+    )
+    for result in results:
+        print(
+            f"{result['cache_size']:>10} {result['seconds']:>9.2f} "
+            f"{result['retained_mb']:>12.1f} {result['peak_mb']:>9.1f} "
+            f"{result['hits']:>8.0f} {result['misses']:>8.0f} {result['evictions']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
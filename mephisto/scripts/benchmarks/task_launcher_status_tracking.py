@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark of a TaskLauncher tracking launched units from status change events.
+
+A mock task run of the given size is launched under a max_num_concurrent_units
+cap, and every unit is completed as soon as it's launched. The time to get through
+the run is reported with the number of get_status calls the launcher made, which
+should stay at zero as the launched units are tracked from events.
+
+Usage:
+    python -m mephisto.scripts.benchmarks.task_launcher_status_tracking --units 10000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict
+from unittest.mock import patch
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.abstractions.providers.mock.mock_unit import MockUnit
+from mephisto.data_model.assignment import InitializationData
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.operations.task_launcher import TaskLauncher
+from mephisto.utils.testing import get_test_task_run
+
+DB_CLASSES = {"local": LocalMephistoDB, "singleton": MephistoSingletonDB}
+UNITS_PER_ASSIGNMENT = 10
+
+
+def run_benchmark(database: str, num_units: int, max_num_units: int) -> Dict[str, Any]:
+    """Launch and complete every unit of a fresh mock task run"""
+    data_dir = tempfile.mkdtemp()
+    db = DB_CLASSES[database](os.path.join(data_dir, "mephisto.db"))
+    try:
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        num_assignments = num_units // UNITS_PER_ASSIGNMENT
+        assignment_data = InitializationData(shared={}, unit_data=[{}] * UNITS_PER_ASSIGNMENT)
+        launcher = TaskLauncher(
+            db,
+            task_run,
+            [assignment_data] * num_assignments,
+            max_num_concurrent_units=max_num_units,
+        )
+        start_time = time.monotonic()
+        launcher.create_assignments()
+        created_time = time.monotonic()
+
+        with patch.object(
+            MockUnit, "get_status", autospec=True, side_effect=MockUnit.get_status
+        ) as mock_get_status, patch(
+            "mephisto.operations.task_launcher.UNIT_GENERATOR_WAIT_SECONDS", 0.01
+        ):
+            launcher.launch_units("dummy-url:3000")
+            num_completed = 0
+            while num_completed < len(launcher.units):
+                with launcher.launched_units_access_condition:
+                    launched_units = list(launcher.launched_units.values())
+                for unit in launched_units:
+                    if unit.db_status == AssignmentState.LAUNCHED:
+                        unit.set_db_status(AssignmentState.COMPLETED)
+                        num_completed += 1
+            launcher.shutdown()
+        end_time = time.monotonic()
+        return {
+            "database": database,
+            "units": len(launcher.units),
+            "create_seconds": created_time - start_time,
+            "launch_seconds": end_time - created_time,
+            "get_status_calls": mock_get_status.call_count,
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--units", type=int, default=10000, help="Units in the task run")
+    parser.add_argument(
+        "--max-concurrent-units", type=int, default=100, help="max_num_concurrent_units cap"
+    )
+    parser.add_argument(
+        "--databases",
+        nargs="+",
+        default=list(DB_CLASSES.keys()),
+        choices=list(DB_CLASSES.keys()),
+        help="Databases to compare",
+    )
+    args = parser.parse_args()
+
+    results = [
+        run_benchmark(database, args.units, args.max_concurrent_units)
+        for database in args.databases
+    ]
+    print(f"{'database':>10} {'units':>8} {'create s':>9} {'launch s':>9} {'get_status':>11}")
+    for result in results:
+        print(
+            f"{result['database']:>10} {result['units']:>8} {result['create_seconds']:>9.2f} "
+            f"{result['launch_seconds']:>9.2f} {result['get_status_calls']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark comparing WebsocketChannel throughput with and without batched sends.
+
+Starts the Flask router locally, connects a WebsocketChannel to it as the
+Mephisto server, and sends bursts of Mephisto-bound packets that the router
+routes straight back to the channel. Reports the packets per second that made
+the round trip for each send mode.
+
+Usage:
+    python -m mephisto.scripts.benchmarks.websocket_channel_throughput --packets 20000
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict
+
+import mephisto.abstractions.architects.router.flask as flask_router
+from mephisto.abstractions.architects.channels.websocket_channel import (
+    DEFAULT_MAX_BATCH_SIZE,
+    WebsocketChannel,
+)
+from mephisto.data_model.packet import (
+    Packet,
+    PACKET_TYPE_ALIVE,
+    PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE,
+)
+from mephisto.operations.client_io_handler import SYSTEM_CHANNEL_ID
+
+SEND_MODES = ["single", "batched"]
+ROUTER_START_TIMEOUT = 30
+ROUND_TRIP_TIMEOUT = 300
+MESSAGE_TEXT = "This is a chat message of a fairly typical length for a dialogue turn."
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def start_router(port: int) -> subprocess.Popen:
+    """Launch the Flask router on the given port, and wait for it to accept connections"""
+    router_app = os.path.join(os.path.dirname(flask_router.__file__), "app.py")
+    router_process = subprocess.Popen(
+        [sys.executable, router_app],
+        env={**os.environ, "PORT": str(port)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    start_time = time.monotonic()
+    while time.monotonic() - start_time < ROUTER_START_TIMEOUT:
+        try:
+            socket.create_connection(("localhost", port), timeout=1).close()
+            return router_process
+        except OSError:
+            time.sleep(0.1)
+    router_process.kill()
+    raise TimeoutError(f"Flask router didn't start on port {port}")
+
+
+def run_benchmark(send_mode: str, port: int, num_packets: int, batch_size: int) -> Dict[str, Any]:
+    """Send num_packets through the router with the given send mode, timing the round trip"""
+    received = 0
+    all_received = threading.Event()
+    expected = num_packets + 1  # Including the warm up packet
+
+    def on_message(channel_id: str, packet: Packet) -> None:
+        nonlocal received
+        received += 1
+        if received == expected:
+            all_received.set()
+
+    def make_packet(idx: int) -> Packet:
+        return Packet(
+            packet_type=PACKET_TYPE_MEPHISTO_BOUND_LIVE_UPDATE,
+            subject_id=SYSTEM_CHANNEL_ID,
+            data={"text": MESSAGE_TEXT, "idx": idx},
+        )
+
+    channel = WebsocketChannel(
+        f"benchmark_{send_mode}",
+        on_channel_open=lambda channel_id: None,
+        on_catastrophic_disconnect=lambda channel_id: None,
+        on_message=on_message,
+        socket_url=f"ws://localhost:{port}/",
+        batch_sends=send_mode == "batched",
+        max_batch_size=batch_size,
+    )
+    channel.open()
+    try:
+        while not channel.is_alive():
+            time.sleep(0.05)
+        # Register as the Mephisto socket, then wait for one round trip before timing
+        channel.enqueue_send(Packet(packet_type=PACKET_TYPE_ALIVE, subject_id=SYSTEM_CHANNEL_ID))
+        channel.enqueue_send(make_packet(-1))
+        start_time = time.monotonic()
+        while received == 0:
+            if time.monotonic() - start_time > ROUTER_START_TIMEOUT:
+                raise TimeoutError("The router never routed a packet back")
+            time.sleep(0.05)
+
+        start_time = time.monotonic()
+        for idx in range(num_packets):
+            channel.enqueue_send(make_packet(idx))
+        if not all_received.wait(ROUND_TRIP_TIMEOUT):
+            raise TimeoutError(f"Only {received} of {expected} packets made the round trip")
+        elapsed = time.monotonic() - start_time
+    finally:
+        channel.close()
+    return {
+        "mode": send_mode,
+        "packets": num_packets,
+        "seconds": elapsed,
+        "packets_per_second": num_packets / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--packets", type=int, default=20000, help="Packets to send per mode")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_MAX_BATCH_SIZE,
+        help="Most packets per frame in batched mode",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=SEND_MODES,
+        choices=SEND_MODES,
+        help="Send modes to compare",
+    )
+    args = parser.parse_args()
+
+    port = get_free_port()
+    router_process = start_router(port)
+    try:
+        results = [run_benchmark(mode, port, args.packets, args.batch_size) for mode in args.modes]
+    finally:
+        router_process.kill()
+        router_process.wait()
+
+    print(f"{'mode':>8} {'packets':>8} {'seconds':>9} {'packets/sec':>12}")
+    for result in results:
+        print(
+            f"{result['mode']:>8} {result['packets']:>8} {result['seconds']:>9.2f} "
+            f"{result['packets_per_second']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
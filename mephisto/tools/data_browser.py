@@ -4,14 +4,53 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from mephisto.data_model.agent import Agent
 from mephisto.data_model.unit import Unit
 from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.worker import Worker
 
-from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database import LocalMephistoDB, StringIDRow
 from mephisto.data_model.constants.assignment_state import AssignmentState
 
-from typing import List, Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+import glob
+import hashlib
+import json
+import os
+
+try:
+    import pandas as pd  # type: ignore
+
+    PANDAS_INSTALLED = True
+except ImportError:
+    PANDAS_INSTALLED = False
+
+if TYPE_CHECKING:
+    from pandas import DataFrame  # type: ignore
+
+# Columns of the unit records returned by the bulk DataBrowser methods, in order
+UNIT_RECORD_COLUMNS = [
+    "task_run_id",
+    "assignment_id",
+    "unit_id",
+    "unit_index",
+    "unit_status",
+    "pay_amount",
+    "agent_id",
+    "status",
+    "worker_id",
+    "worker_name",
+    "data",
+    "task_start",
+    "task_end",
+    "tips",
+    "feedback",
+]
+# Columns holding arbitrary json data, which are stored as strings in cache files
+UNIT_RECORD_JSON_COLUMNS = ["data", "tips", "feedback"]
+DEFAULT_LOAD_WORKERS = 8
 
 
 class DataBrowser:
@@ -103,6 +142,199 @@ class DataBrowser:
             "feedback": agent.state.get_feedback(),
         }
 
+    def _find_unit_and_agent_rows(
+        self, task_run_id: str, statuses: List[str]
+    ) -> Tuple[List[StringIDRow], List[StringIDRow]]:
+        """
+        Return the rows of the units of the given task run in one of the given
+        statuses, and of their agents along with the worker names
+        """
+        status_params = ", ".join("?" * len(statuses))
+        params = [int(task_run_id), *statuses]
+        with self.db._read_access_condition:
+            conn = self.db._get_connection()
+            c = conn.cursor()
+            c.execute(
+                f"""
+                SELECT * FROM units
+                WHERE task_run_id = ? AND status IN ({status_params})
+                ORDER BY unit_id ASC;
+                """,
+                params,
+            )
+            unit_rows = c.fetchall()
+            c.execute(
+                f"""
+                SELECT agents.*, workers.worker_name FROM units
+                JOIN agents ON agents.agent_id = units.agent_id
+                LEFT JOIN workers ON workers.worker_id = agents.worker_id
+                WHERE units.task_run_id = ? AND units.status IN ({status_params});
+                """,
+                params,
+            )
+            agent_rows = c.fetchall()
+        return unit_rows, agent_rows
+
+    def _get_agent_data(self, agent_row: StringIDRow) -> Dict[str, Any]:
+        agent = Agent.get(self.db, agent_row["agent_id"], row=agent_row)
+        return {
+            "data": agent.state.get_parsed_data(),
+            "task_start": agent.state.get_task_start(),
+            "task_end": agent.state.get_task_end(),
+            "tips": agent.state.get_tips(),
+            "feedback": agent.state.get_feedback(),
+        }
+
+    def _get_unit_records_for_task_run(
+        self,
+        task_run_id: str,
+        unit_rows: List[StringIDRow],
+        agent_rows: List[StringIDRow],
+        max_workers: int,
+    ) -> List[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            agent_data = dict(
+                zip(
+                    [r["agent_id"] for r in agent_rows],
+                    executor.map(self._get_agent_data, agent_rows),
+                )
+            )
+        agent_rows_by_id = {r["agent_id"]: r for r in agent_rows}
+
+        records = []
+        for unit_row in unit_rows:
+            agent_row = agent_rows_by_id.get(unit_row["agent_id"])
+            record = dict.fromkeys(UNIT_RECORD_COLUMNS)
+            record.update(
+                {
+                    "task_run_id": task_run_id,
+                    "assignment_id": unit_row["assignment_id"],
+                    "unit_id": unit_row["unit_id"],
+                    "unit_index": unit_row["unit_index"],
+                    "unit_status": unit_row["status"],
+                    "pay_amount": unit_row["pay_amount"],
+                }
+            )
+            if agent_row is not None:
+                record.update(
+                    {
+                        "agent_id": agent_row["agent_id"],
+                        "status": agent_row["status"],
+                        "worker_id": agent_row["worker_id"],
+                        "worker_name": agent_row["worker_name"],
+                        **agent_data[agent_row["agent_id"]],
+                    }
+                )
+            records.append(record)
+        return records
+
+    def _get_agent_files_mtime(self, task_run: TaskRun, agent_rows: List[StringIDRow]) -> int:
+        """Return the last modification time of any of the state files of the agents"""
+        run_dir = task_run.get_run_dir()
+        last_modified = 0
+        for agent_row in agent_rows:
+            agent_dir = os.path.join(run_dir, agent_row["assignment_id"], agent_row["agent_id"])
+            if not os.path.isdir(agent_dir):
+                continue
+            for entry in os.scandir(agent_dir):
+                last_modified = max(last_modified, entry.stat().st_mtime_ns)
+        return last_modified
+
+    def get_unit_records_for_task_runs(
+        self,
+        task_runs: List[TaskRun],
+        statuses: Optional[List[str]] = None,
+        max_workers: int = DEFAULT_LOAD_WORKERS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return a record of every unit in the given statuses (by default, the
+        completed ones) from all the provided TaskRuns, with the columns
+        in UNIT_RECORD_COLUMNS. These hold the ids and statuses of the unit
+        and its agent, as well as what get_data_from_unit returns.
+
+        Units are found with a couple of queries per TaskRun, using the statuses
+        stored in the database rather than checking them with the provider, and
+        agent state files are loaded by max_workers threads at once.
+        """
+        if statuses is None:
+            statuses = AssignmentState.completed()
+        records = []
+        for task_run in task_runs:
+            unit_rows, agent_rows = self._find_unit_and_agent_rows(task_run.db_id, statuses)
+            records += self._get_unit_records_for_task_run(
+                task_run.db_id, unit_rows, agent_rows, max_workers
+            )
+        return records
+
+    def get_units_table_for_task_runs(
+        self,
+        task_runs: List[TaskRun],
+        statuses: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
+        max_workers: int = DEFAULT_LOAD_WORKERS,
+    ) -> "DataFrame":
+        """
+        Return the records of get_unit_records_for_task_runs as a pandas DataFrame
+        with the UNIT_RECORD_COLUMNS columns, one row per unit.
+
+        If a cache_dir is given, the rows of every TaskRun are stored there in a
+        Parquet file (requires pyarrow), which is used until the TaskRun's units
+        change in the database or any of its agent state files is modified.
+        """
+        assert PANDAS_INSTALLED, "Getting a units table requires pandas to be installed"
+        if statuses is None:
+            statuses = AssignmentState.completed()
+
+        tables = []
+        for task_run in task_runs:
+            unit_rows, agent_rows = self._find_unit_and_agent_rows(task_run.db_id, statuses)
+            if cache_dir is None:
+                records = self._get_unit_records_for_task_run(
+                    task_run.db_id, unit_rows, agent_rows, max_workers
+                )
+                tables.append(pd.DataFrame.from_records(records, columns=UNIT_RECORD_COLUMNS))
+                continue
+
+            cache_key = hashlib.sha1(
+                json.dumps(
+                    [
+                        statuses,
+                        [[r["unit_id"], r["status"], r["agent_id"]] for r in unit_rows],
+                        [[r["agent_id"], r["status"]] for r in agent_rows],
+                        self._get_agent_files_mtime(task_run, agent_rows),
+                    ]
+                ).encode()
+            ).hexdigest()
+            cache_path = os.path.join(cache_dir, f"task_run_{task_run.db_id}__{cache_key}.parquet")
+            if os.path.exists(cache_path):
+                table = pd.read_parquet(cache_path)
+                for column in UNIT_RECORD_JSON_COLUMNS:
+                    table[column] = table[column].map(json.loads)
+                tables.append(table)
+                continue
+
+            records = self._get_unit_records_for_task_run(
+                task_run.db_id, unit_rows, agent_rows, max_workers
+            )
+            table = pd.DataFrame.from_records(records, columns=UNIT_RECORD_COLUMNS)
+            tables.append(table)
+
+            # Replace any outdated cache of this TaskRun
+            os.makedirs(cache_dir, exist_ok=True)
+            for outdated_path in glob.glob(
+                os.path.join(cache_dir, f"task_run_{task_run.db_id}__*.parquet")
+            ):
+                os.remove(outdated_path)
+            cached_table = table.copy()
+            for column in UNIT_RECORD_JSON_COLUMNS:
+                cached_table[column] = cached_table[column].map(json.dumps)
+            cached_table.to_parquet(f"{cache_path}.tmp", index=False)
+            os.replace(f"{cache_path}.tmp", cache_path)
+
+        if len(tables) == 0:
+            return pd.DataFrame(columns=UNIT_RECORD_COLUMNS)
+        return pd.concat(tables, ignore_index=True)
+
     def get_workers_with_qualification(self, qualification_name: str) -> List[Worker]:
         """
         Returns a list of 'Worker's for workers who are qualified wrt `qualification_name`.
@@ -9,6 +9,7 @@ Utilities specifically for running examine scripts. Example usage can be
 seen in the examine results scripts in the examples directory.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Callable
 from typing import Dict
@@ -16,7 +17,9 @@ from typing import List
 from typing import Optional
 from typing import Tuple
 from typing import TYPE_CHECKING
+from typing import Union
 
+from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.worker import Worker
 from mephisto.tools.data_browser import DataBrowser
 from mephisto.utils.logger_core import get_logger
@@ -28,6 +31,14 @@ if TYPE_CHECKING:
 
 logger = get_logger(name=__name__)
 
+# Units whose status is checked with the crowd provider at once
+DEFAULT_STATUS_REFRESH_WORKERS = 8
+WORKER_STATS_STATUSES = [
+    AssignmentState.ACCEPTED,
+    AssignmentState.SOFT_REJECTED,
+    AssignmentState.REJECTED,
+]
+
 
 def _get_and_format_data(
     data_browser: "DataBrowser",
@@ -129,19 +140,54 @@ def get_worker_stats(units: List["Unit"]) -> Dict[str, Dict[str, List["Unit"]]]:
     return previous_work_by_worker
 
 
+def get_worker_stats_from_db(
+    db: "MephistoDB", task_ids: Optional[List[str]] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Create a mapping from worker id to the number of their units in each
+    reviewed status, counted by the database. Covers every task unless
+    `task_ids` are given.
+    """
+    counts_by_worker = db.get_unit_counts_by_worker(
+        task_ids=task_ids, statuses=WORKER_STATS_STATUSES
+    )
+    return {
+        w_id: {status: counts.get(status, 0) for status in WORKER_STATS_STATUSES}
+        for w_id, counts in counts_by_worker.items()
+    }
+
+
+def refresh_unit_statuses(
+    units: List["Unit"], max_workers: int = DEFAULT_STATUS_REFRESH_WORKERS
+) -> None:
+    """
+    Sync the stored status of the given units with the crowd provider, checking
+    a few units at a time. Units in a terminal status are left as they are.
+    """
+    units_to_refresh = [u for u in units if u.db_status not in AssignmentState.final_unit()]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda u: u.get_status(), units_to_refresh))
+
+
 def format_worker_stats(
-    worker_id: str, previous_work_by_worker: Dict[str, Dict[str, List["Unit"]]]
+    worker_id: str,
+    previous_work_by_worker: Dict[str, Dict[str, Union[int, List["Unit"]]]],
 ) -> str:
     """
     When given a worker id and a list of worker stats, return a string
-    containing the proportion of accepted to rejected work.
+    containing the proportion of accepted to rejected work. Stats can either
+    hold the units in each status, or just their count.
     """
     prev_work = previous_work_by_worker.get(worker_id)
     if prev_work is None:
         return "(First time worker!)"
-    accepted_work = len(prev_work["accepted"])
-    soft_rejected_work = len(prev_work["soft_rejected"])
-    rejected_work = len(prev_work["rejected"])
+
+    def count(work: Union[int, List["Unit"]]) -> int:
+        return work if isinstance(work, int) else len(work)
+
+    accepted_work = count(prev_work["accepted"])
+    soft_rejected_work = count(prev_work["soft_rejected"])
+    rejected_work = count(prev_work["rejected"])
     return (
         f"({accepted_work} | "
         f"{rejected_work + soft_rejected_work}({soft_rejected_work}) / "
@@ -155,10 +201,14 @@ def run_examine_by_worker(
     task_name: Optional[str] = None,
     block_qualification: Optional[str] = None,
     approve_qualification: Optional[str] = None,
+    refresh_statuses: bool = True,
 ):
     """
     Basic script for reviewing work, grouped by worker for convenience. First gets
     the required information to run a review, then
+
+    Unit statuses are synced with the crowd provider before the review unless
+    `refresh_statuses` is False, in which case the stored statuses are used.
     """
     data_browser = DataBrowser(db=db)
 
@@ -202,12 +252,14 @@ def run_examine_by_worker(
         "**************\n"
     )
 
-    units = data_browser.get_units_for_task_name(task_name)
+    task_id = tasks[0].db_id
+    units = db.find_units(task_id=task_id)
+    if refresh_statuses:
+        refresh_unit_statuses(units)
 
-    others = [u for u in units if u.get_status() != "completed"]
-    units = [u for u in units if u.get_status() == "completed"]
+    units = [u for u in units if u.db_status == AssignmentState.COMPLETED]
     reviews_left = len(units)
-    previous_work_by_worker = get_worker_stats(others)
+    previous_work_by_worker = get_worker_stats_from_db(db, task_ids=[task_id])
 
     # Determine allowed options
     options = ["a", "p", "r", "v"]
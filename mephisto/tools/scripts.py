@@ -8,10 +8,16 @@
 Utilities that are useful for Mephisto-related scripts.
 """
 
-from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database import (
+    LocalMephistoDB,
+    CONCURRENCY_MODE_LOCKED,
+)
 from mephisto.abstractions.providers.mturk.mturk_utils import try_prerun_cleanup
 from mephisto.operations.operator import Operator
-from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.abstractions.databases.local_singleton_database import (
+    DEFAULT_CACHE_SIZE,
+    MephistoSingletonDB,
+)
 from mephisto.utils.logger_core import format_loud
 from mephisto.utils.testing import get_mock_requester
 from mephisto.utils.dirs import get_root_data_dir, get_run_file_dir
@@ -137,11 +143,16 @@ def get_db_from_config(cfg: DictConfig) -> "MephistoDB":
     database_path = os.path.join(datapath, "database.db")
 
     database_type = cfg.mephisto.database._database_type
+    concurrency_mode = cfg.mephisto.database.get("concurrency_mode", CONCURRENCY_MODE_LOCKED)
 
     if database_type == "local":
-        return LocalMephistoDB(database_path=database_path)
+        return LocalMephistoDB(database_path=database_path, concurrency_mode=concurrency_mode)
     elif database_type == "singleton":
-        return MephistoSingletonDB(database_path=database_path)
+        return MephistoSingletonDB(
+            database_path=database_path,
+            concurrency_mode=concurrency_mode,
+            cache_size=cfg.mephisto.database.get("cache_size", DEFAULT_CACHE_SIZE),
+        )
     else:
         raise AssertionError(f"Provided database_type {database_type} is not valid")
 
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+In-process publish/subscribe bus for data model status transitions.
+
+Units and agents publish an event here whenever their status changes, so that
+components tracking a run (like the TaskLauncher) can update their own state
+from the transitions instead of re-querying every status on a timer.
+"""
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, DefaultDict, List, Optional
+
+from mephisto.abstractions._subcomponents.agent_state import AgentState
+from mephisto.utils.logger_core import get_logger
+
+logger = get_logger(name=__name__)
+
+STATUS_EVENT_UNIT = "unit"
+STATUS_EVENT_AGENT = "agent"
+
+# Agent statuses that move the agent's unit out of LAUNCHED/ASSIGNED
+UNIT_RELEASING_AGENT_STATUSES = [
+    AgentState.STATUS_COMPLETED,
+    AgentState.STATUS_SOFT_REJECTED,
+    AgentState.STATUS_EXPIRED,
+    AgentState.STATUS_APPROVED,
+    AgentState.STATUS_REJECTED,
+]
+
+
+@dataclass(frozen=True)
+class StatusChangeEvent:
+    """A single status transition for a unit or an agent"""
+
+    entity_type: str  # STATUS_EVENT_UNIT or STATUS_EVENT_AGENT
+    db_id: str
+    task_run_id: str
+    unit_id: str
+    old_status: str
+    new_status: str
+    worker_id: Optional[str] = None
+
+
+def event_releases_unit(event: StatusChangeEvent, unit_statuses: List[str]) -> bool:
+    """
+    Determine if the event moves its unit out of the given (in progress) unit
+    statuses, either directly or through the unit's agent reaching a final status
+    """
+    if event.entity_type == STATUS_EVENT_UNIT:
+        return event.new_status not in unit_statuses
+    # An agent that already was in a final status may no longer be the
+    # one assigned to its unit, so only its first final status counts
+    return (
+        event.new_status in UNIT_RELEASING_AGENT_STATUSES
+        and event.old_status not in AgentState.complete()
+    )
+
+
+StatusEventCallback = Callable[[StatusChangeEvent], None]
+
+
+class StatusEventBus:
+    """
+    Routes status change events to the callbacks subscribed to the
+    task run they belong to. Callbacks run synchronously on the thread
+    that made the status change, so they should be quick and non-blocking.
+    """
+
+    def __init__(self):
+        self._subscribers: DefaultDict[str, List[StatusEventCallback]] = defaultdict(list)
+        self._subscriber_lock = threading.Lock()
+
+    def subscribe(self, task_run_id: str, callback: StatusEventCallback) -> None:
+        """Register the callback for all status events of the given task run"""
+        with self._subscriber_lock:
+            self._subscribers[task_run_id].append(callback)
+
+    def unsubscribe(self, task_run_id: str, callback: StatusEventCallback) -> None:
+        """Remove a callback, if it was subscribed to the given task run"""
+        with self._subscriber_lock:
+            callbacks = self._subscribers.get(task_run_id, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if len(callbacks) == 0:
+                self._subscribers.pop(task_run_id, None)
+
+    def publish(self, event: StatusChangeEvent) -> None:
+        """Deliver the event to every subscriber of its task run"""
+        with self._subscriber_lock:
+            callbacks = list(self._subscribers.get(event.task_run_id, []))
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception(f"Status event subscriber failed to handle {event}")
+
+
+# Process-wide bus that all data model status changes are published to
+status_event_bus = StatusEventBus()
@@ -286,7 +286,12 @@ function useMephistoSocket({
     // other reasonable domain. If that succeeds, assume the server died.
 
     socket.current.onmessage = (event) => {
-      parseSocketMessage(JSON.parse(event.data));
+      // A frame holds either a single packet or an array of batched packets
+      let packets = JSON.parse(event.data);
+      if (!Array.isArray(packets)) {
+        packets = [packets];
+      }
+      packets.forEach((packet) => parseSocketMessage(packet));
     };
 
     socket.current.onopen = () => {
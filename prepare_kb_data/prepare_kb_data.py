@@ -2,6 +2,7 @@ import sys
 import logging
 import os
 import re
+from itertools import chain
 from pathlib import Path
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -11,12 +12,15 @@ from dotenv import load_dotenv, find_dotenv
 from langchain_community.document_loaders.recursive_url_loader import (
     RecursiveUrlLoader,  # noqa
 )
+from langchain_core.documents import Document
 from unstructured.documents.html import HTMLListItem, HTMLNarrativeText, HTMLTitle
 from unstructured.partition.html import partition_html
 from unstructured.partition.text_type import sentence_count
 
 from utils import save_docs_as_json, save_docs_as_md
 from scrapper import APRScrapper
+from scrapper.crawler import Crawler
+from scrapper.pipeline import run_pipeline
 
 load_dotenv()
 
@@ -25,6 +29,9 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 
 ROOT_DIR = Path(find_dotenv()).parent
 DATA_DIR = ROOT_DIR / "data"
+# fetched pages and the checkpoints of interrupted crawls
+CRAWL_CACHE_DIR = DATA_DIR / "kb" / "crawl_cache"
+PREPROCESS_CACHE_DIR = CRAWL_CACHE_DIR / "preprocessed"
 
 def format_parsed_html_as_md(parsed_html: list) -> str:
     """
@@ -78,6 +85,69 @@ def lc_markdown_split(text):
     #     if d.metadata
     # ]
 
+def split_airpassengerrights_ca_doc(doc) -> list:
+    """
+    Extract the content of an airpassengerrights.ca page, starting from the first title.
+    """
+    lc_docs = lc_html_split(doc.page_content)
+
+    if len(lc_docs) > 1:
+        return [
+            {**doc.metadata, "text": lc_doc.page_content, **lc_doc.metadata}
+            for lc_doc in lc_docs
+        ]
+
+    elements = partition_html(text=doc.page_content, skip_headers_and_footers=True)
+
+    start_idx = 0
+    for i, e in enumerate(elements):
+        if isinstance(e, HTMLTitle):
+            start_idx = i
+            break
+
+    end_idx = len(elements)
+    for i, e in enumerate(reversed(elements)):
+        if (
+            isinstance(e, HTMLTitle)
+            and e.text in ["Tweet", "Pin it", "Work in progress:"]
+            or any(
+                e.text.startswith(prefix)
+                for prefix in [
+                    "Step by Step Guide					",
+                    "Step by Step Guide Follow ",
+                    "FAQ Find answers",
+                    "Glossary List of terms",
+                ]
+            )
+        ):
+            end_idx = len(elements) - i - 1
+
+    # fix merged enumerated items in titles by inserting a space
+    pattern = r"(\s*\d+|\b\d+)([A-Za-z])|(\b[A-Za-z]+)([A-Z][a-z])"
+
+    def replacement(match):
+        if match.group(1):
+            return match.group(1) + ' ' + match.group(2)
+        return match.group(3) + ' ' + match.group(4)
+
+    for e in elements[start_idx:end_idx]:
+        if isinstance(e, HTMLTitle):
+            e.text = re.sub(pattern, replacement, e.text)
+
+    text = format_parsed_html_as_md(elements[start_idx:end_idx])
+
+    lc_docs = lc_markdown_split(text)
+
+    if len(lc_docs) >= 1:
+        return [
+            {**doc.metadata, "text": lc_doc.page_content, **lc_doc.metadata}
+            for lc_doc in lc_docs
+        ]
+
+    print("Count not split the document: ", doc.metadata["source"])
+    return []
+
+
 def scrape_airpassengerrights_ca() -> pd.DataFrame:
     """
     Scrape the airpassengerrights.ca website for practical guides.
@@ -93,80 +163,69 @@ def scrape_airpassengerrights_ca() -> pd.DataFrame:
         "https://airpassengerrights.ca/en/practical-guides/denied-boarding/canada-pre-appr",
     ]
 
-    loader = RecursiveUrlLoader(URL, max_depth=99999, use_async=False, timeout=99)
+    pages = Crawler([URL], cache_dir=CRAWL_CACHE_DIR).run()
+
+    docs = (Document(page.html, metadata=page.metadata) for page in pages)
+    docs = (doc for doc in docs if doc.metadata['source'] not in EXCLUDE_URLS)
 
     # extract the content from the pages starting from the first title
-    docs_list = []
-    for doc in loader.lazy_load():
-        if doc.metadata['source'] in EXCLUDE_URLS:
-            continue
-
-        lc_docs = lc_html_split(doc.page_content)
-
-        if len(lc_docs) > 1:
-            docs_list.extend(
-                [
-                    {**doc.metadata, "text": lc_doc.page_content, **lc_doc.metadata}
-                    for lc_doc in lc_docs
-                ]
-            )
-            continue
-
-        elements = partition_html(text=doc.page_content, skip_headers_and_footers=True)
-
-        start_idx = 0
-        for i, e in enumerate(elements):
-            if isinstance(e, HTMLTitle):
-                start_idx = i
-                break
-
-        end_idx = len(elements)
-        for i, e in enumerate(reversed(elements)):
-            if (
-                isinstance(e, HTMLTitle)
-                and e.text in ["Tweet", "Pin it", "Work in progress:"]
-                or any(
-                    e.text.startswith(prefix)
-                    for prefix in [
-                        "Step by Step Guide					",
-                        "Step by Step Guide Follow ",
-                        "FAQ Find answers",
-                        "Glossary List of terms",
-                    ]
-                )
-            ):
-                end_idx = len(elements) - i - 1
-
-        # fix merged enumerated items in titles by inserting a space
-        pattern = r"(\s*\d+|\b\d+)([A-Za-z])|(\b[A-Za-z]+)([A-Z][a-z])"
-
-        def replacement(match):
-            if match.group(1):
-                return match.group(1) + ' ' + match.group(2)
-            return match.group(3) + ' ' + match.group(4)
-
-        for e in elements[start_idx:end_idx]:
-            if isinstance(e, HTMLTitle):
-                e.text = re.sub(pattern, replacement, e.text)
-
-        text = format_parsed_html_as_md(elements[start_idx:end_idx])
-
-        lc_docs = lc_markdown_split(text)
-
-        if len(lc_docs) >= 1:
-            docs_list.extend(
-                [
-                    {**doc.metadata, "text": lc_doc.page_content, **lc_doc.metadata}
-                    for lc_doc in lc_docs
+    docs_list = list(
+        chain.from_iterable(
+            run_pipeline(docs, [split_airpassengerrights_ca_doc], cache_dir=PREPROCESS_CACHE_DIR)
+        )
+    )
+
+    logging.info(f"Scraped {len(docs_list)} documents from airpassengerrights.ca")
+
+    return pd.DataFrame(docs_list)
+
+
+def split_rppa_appr_ca_doc(doc) -> list:
+    """
+    Extract the content of a rppa-appr.ca page, without its navigation elements.
+    """
+    lc_docs = lc_html_split(doc.page_content)
+
+    if len(lc_docs) > 1:
+        return [
+            {**doc.metadata, "text": lc_doc.page_content, **lc_doc.metadata}
+            for lc_doc in lc_docs
+        ]
+
+    elements = partition_html(text=doc.page_content, skip_headers_and_footers=True)
+
+    to_remove = ["This node", "Make a complaint", "MP3", "Listen to text"]
+    elements = [e for e in elements if not any(e.text.startswith(prefix) for prefix in to_remove)]
+
+    end_idx = len(elements)
+    for i, e in enumerate(reversed(elements)):
+        if (
+            any(
+                e.text.startswith(prefix)
+                for prefix in [
+                    "Notices",
+                    "Related Links",
+                    "Reference: ",
+                    "Resource Guides",
+                    "Resource guide",
                 ]
             )
-            continue
+            and len(elements) - i - 1 < end_idx
+        ):
+            end_idx = len(elements) - i - 1
 
-        print("Count not split the document: ", doc.metadata["source"])
+    text = format_parsed_html_as_md(elements[:end_idx])
 
-    logging.info(f"Scraped {len(docs_list)} documents from airpassengerrights.ca")
+    lc_docs = lc_markdown_split(text)
 
-    return pd.DataFrame(docs_list)
+    if len(lc_docs) >= 1:
+        return [
+            {**doc.metadata, "text": lc_doc.page_content, **lc_doc.metadata}
+            for lc_doc in lc_docs
+        ]
+
+    print("Count not split the document: ", doc.metadata["source"])
+    return []
 
 
 def scrape_rppa_appr_ca() -> pd.DataFrame:
@@ -182,58 +241,12 @@ def scrape_rppa_appr_ca() -> pd.DataFrame:
 
     loader = RecursiveUrlLoader(URL, max_depth=3, use_async=True, timeout=99)
 
-    docs_list = []
-    for doc in loader.lazy_load():
-        if doc.metadata['source'] in EXCLUDE_URLS:
-            continue
-
-        lc_docs = lc_html_split(doc.page_content)
-
-        if len(lc_docs) > 1:
-            docs_list.extend(
-                [
-                    {**doc.metadata, "text": lc_doc.page_content, **lc_doc.metadata}
-                    for lc_doc in lc_docs
-                ]
-            )
-            continue
-
-        elements = partition_html(text=doc.page_content, skip_headers_and_footers=True)
-
-        to_remove = ["This node", "Make a complaint", "MP3", "Listen to text"]
-        elements = [e for e in elements if not any(e.text.startswith(prefix) for prefix in to_remove)]
-
-        end_idx = len(elements)
-        for i, e in enumerate(reversed(elements)):
-            if (
-                any(
-                    e.text.startswith(prefix)
-                    for prefix in [
-                        "Notices",
-                        "Related Links",
-                        "Reference: ",
-                        "Resource Guides",
-                        "Resource guide",
-                    ]
-                )
-                and len(elements) - i - 1 < end_idx
-            ):
-                end_idx = len(elements) - i - 1
-
-        text = format_parsed_html_as_md(elements[:end_idx])
-
-        lc_docs = lc_markdown_split(text)
-
-        if len(lc_docs) >= 1:
-            docs_list.extend(
-                [
-                    {**doc.metadata, "text": lc_doc.page_content, **lc_doc.metadata}
-                    for lc_doc in lc_docs
-                ]
-            )
-            continue
-
-        print("Count not split the document: ", doc.metadata["source"])
+    docs = (doc for doc in loader.lazy_load() if doc.metadata['source'] not in EXCLUDE_URLS)
+    docs_list = list(
+        chain.from_iterable(
+            run_pipeline(docs, [split_rppa_appr_ca_doc], cache_dir=PREPROCESS_CACHE_DIR)
+        )
+    )
 
     logging.info(f"Scraped {len(docs_list)} documents from rppa-appr.ca")
 
@@ -262,7 +275,7 @@ def main():
     SAVE_PATH = DATA_DIR / "kb" / "docs"
 
     docs_df = pd.DataFrame(
-            APRScrapper().scrap()
+            APRScrapper(cache_dir=CRAWL_CACHE_DIR).scrap()
             # scrape_airpassengerrights_ca(),
             # scrape_rppa_appr_ca(),
     )
@@ -1,15 +1,16 @@
+import functools
 import re
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 
 from scrapper import BaseScrapper
-from langchain_community.document_loaders.recursive_url_loader import (
-    RecursiveUrlLoader,  # noqa
-)
 from langchain_core.documents import Document
 
 from unstructured.documents.html import HTMLTitle
 from unstructured.partition.html import partition_html
 
+from scrapper.crawler import Crawler
+from scrapper.pipeline import DEFAULT_CHUNK_SIZE
 from scrapper.preprocessors import filter_by_url, split_by_html_headers, split_by_markdown_headers
 from utils import format_parsed_html_as_md
 
@@ -120,9 +121,28 @@ class APRScrapper(BaseScrapper):
     """
     A scrapper for https://airpassengerrights.ca/en/
     """
-    def __init__(self):
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_concurrency: int = 8,
+        requests_per_second: float = 2.0,
+        num_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Pages are cached and the crawl checkpointed under cache_dir, if given,
+        along with the preprocessed documents.
+        """
+        self.cache_dir = cache_dir
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        if cache_dir is not None:
+            self.preprocess_cache_dir = Path(cache_dir) / "preprocessed"
+        # preprocessors run in a process pool, so they can't be lambdas
         self.preprocessors = [
-            lambda doc: filter_by_url(doc, EXCLUDE_URLS),
+            functools.partial(filter_by_url, exclude_urls=EXCLUDE_URLS),
             # split_by_headers,
             # html_doc_to_md,
             clean_by_html_elements
@@ -132,21 +152,26 @@ class APRScrapper(BaseScrapper):
         """
         Scrape the APR website.
         """
-        docs_list = []
-        for url in urls:
-            loader = RecursiveUrlLoader(url, max_depth=99999, use_async=False, timeout=99)
-
-            # load and preprocess the documents
-            docs = [self.preprocess(doc) for doc in loader.lazy_load()]
-
-            # merge list of lists if any
-            if any(isinstance(doc, list) for doc in docs):
-                docs = sum(docs, [])
-
-            # flatten docs into a list of dictionaries and store them
-            docs_list += [
-                {"text": doc.page_content, **doc.metadata}
-                for doc in docs if doc
-            ]
-
-        return docs_list
+        crawler = Crawler(
+            urls,
+            cache_dir=self.cache_dir,
+            max_concurrency=self.max_concurrency,
+            requests_per_second=self.requests_per_second,
+        )
+
+        # load and preprocess the documents
+        docs = list(
+            self.preprocess_all(
+                Document(page.html, metadata=page.metadata) for page in crawler.run()
+            )
+        )
+
+        # merge list of lists if any
+        if any(isinstance(doc, list) for doc in docs):
+            docs = sum(docs, [])
+
+        # flatten docs into a list of dictionaries
+        return [
+            {"text": doc.page_content, **doc.metadata}
+            for doc in docs if doc
+        ]
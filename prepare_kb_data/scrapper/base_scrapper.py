@@ -1,12 +1,20 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from scrapper.pipeline import DEFAULT_CHUNK_SIZE, apply_preprocessors, run_pipeline
 
 class BaseScrapper(ABC):
     """
     The Strategy interface declares operations common to all data scrappers.
     """
     preprocessors = []
+    # process pool workers for preprocess_all (None for one per CPU) and documents per task
+    num_workers: Optional[int] = None
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    # where preprocessed documents are cached by content hash, if anywhere
+    preprocess_cache_dir: Optional[Path] = None
 
     @abstractmethod
     def scrap(self, urls: List) -> List:
@@ -19,6 +27,16 @@ class BaseScrapper(ABC):
         """
         Apply all preprocessors to the text.
         """
-        for preprocessor in self.preprocessors:
-            doc = preprocessor(doc)
-        return doc
+        return apply_preprocessors(self.preprocessors, doc)
+
+    def preprocess_all(self, docs: Iterable) -> Iterator:
+        """
+        Apply all preprocessors to each document in a process pool, yielding the results in order.
+        """
+        return run_pipeline(
+            docs,
+            self.preprocessors,
+            num_workers=self.num_workers,
+            chunk_size=self.chunk_size,
+            cache_dir=self.preprocess_cache_dir,
+        )
@@ -0,0 +1,320 @@
+"""
+Asynchronous, resumable crawler used by the scrappers.
+
+Pages are fetched by a bounded pool of workers, with a minimum interval between
+requests to the same host. Fetched pages are kept in an on-disk HTTP cache and
+revalidated with their ETag/Last-Modified on the next crawl, and the crawl
+frontier is checkpointed to the cache directory so an interrupted crawl resumes
+where it stopped.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from email.message import Message
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+USER_AGENT = "Mozilla/5.0 (compatible; prepare-kb-data crawler)"
+
+
+@dataclass
+class CrawledPage:
+    """
+    A fetched HTML page and the metadata extracted from it.
+    """
+    url: str
+    html: str
+    depth: int
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+
+class PageParser(HTMLParser):
+    """
+    Collect the links, title, description and language of an HTML page.
+    """
+    def __init__(self):
+        super().__init__()
+        self.links = []
+        self.metadata = {}
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "a" and attrs.get("href"):
+            self.links.append(attrs["href"])
+        elif tag == "title" and "title" not in self.metadata:
+            self._in_title = True
+            self.metadata["title"] = ""
+        elif tag == "meta" and attrs.get("name") == "description":
+            self.metadata["description"] = attrs.get("content") or "No description found."
+        elif tag == "html":
+            self.metadata["language"] = attrs.get("lang") or "No language found."
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.metadata["title"] += data
+
+
+def parse_page(html: str, url: str) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Return the absolute, fragment-less links of a page and its metadata.
+    """
+    parser = PageParser()
+    parser.feed(html)
+    parser.close()
+    links = []
+    for link in parser.links:
+        link = urldefrag(urljoin(url, link.strip()))[0]
+        if urlparse(link).scheme in ("http", "https"):
+            links.append(link)
+    return links, {"source": url, **parser.metadata}
+
+
+class HttpCache:
+    """
+    On-disk cache of page bodies and the validators needed to revalidate them.
+    """
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.html"
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, str], str]]:
+        """
+        Return the cached validators and body of a url, if any.
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, encoding="utf-8") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, body: str, headers: Message) -> None:
+        """
+        Store the body of a url along with its ETag and Last-Modified headers.
+        """
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        # the body goes first, so that metadata on disk always has a full body
+        _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta))
+
+
+class HostRateLimiter:
+    """
+    Space out the requests to each host by a minimum interval.
+    """
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_request: Dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            delay = self._last_request.get(host, float("-inf")) + self.min_interval
+            delay -= time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last_request[host] = time.monotonic()
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class Crawler:
+    """
+    Crawl every page reachable from the start urls that stays under one of them.
+
+    With a cache_dir, fetched pages are cached and the frontier is checkpointed
+    there every checkpoint_every pages (and when the crawl is interrupted). The
+    checkpoint is removed once a crawl finishes.
+    """
+    def __init__(
+        self,
+        start_urls: List[str],
+        cache_dir: Optional[Path] = None,
+        max_depth: Optional[int] = None,
+        max_concurrency: int = 8,
+        requests_per_second: float = 2.0,
+        timeout: float = 99,
+        checkpoint_every: int = 10,
+    ):
+        self.start_urls = list(dict.fromkeys(start_urls))
+        self.max_depth = max_depth
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.checkpoint_every = checkpoint_every
+        self.rate_limiter = HostRateLimiter(1 / requests_per_second if requests_per_second else 0)
+        self.cache = HttpCache(cache_dir) if cache_dir is not None else None
+        self.checkpoint_path = None
+        if cache_dir is not None:
+            crawl_key = hashlib.sha256(json.dumps(self.start_urls).encode()).hexdigest()[:16]
+            self.checkpoint_path = Path(cache_dir) / f"frontier-{crawl_key}.json"
+
+        # url -> depth of every url queued so far, and the urls that were handled
+        self._seen: Dict[str, int] = {}
+        self._done: Set[str] = set()
+        self._pages: Dict[str, CrawledPage] = {}
+        self._since_checkpoint = 0
+
+    def in_scope(self, url: str) -> bool:
+        return any(url.startswith(start_url) for start_url in self.start_urls)
+
+    def run(self) -> List[CrawledPage]:
+        """
+        Crawl synchronously, see crawl.
+        """
+        return asyncio.run(self.crawl())
+
+    async def crawl(self) -> List[CrawledPage]:
+        """
+        Crawl the site and return the fetched pages ordered by url.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for url, depth in self._load_checkpoint().items():
+            queue.put_nowait((url, depth))
+        for url in self.start_urls:
+            self._enqueue(queue, url, 0)
+
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.max_concurrency)]
+        try:
+            await queue.join()
+        except BaseException:
+            self._save_checkpoint()
+            raise
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+        logging.info(f"Crawled {len(self._pages)} pages from {', '.join(self.start_urls)}")
+        return [self._pages[url] for url in sorted(self._pages)]
+
+    def _enqueue(self, queue: asyncio.Queue, url: str, depth: int) -> None:
+        if url in self._seen or not self.in_scope(url):
+            return
+        if self.max_depth is not None and depth > self.max_depth:
+            return
+        self._seen[url] = depth
+        queue.put_nowait((url, depth))
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            url, depth = await queue.get()
+            try:
+                html = await self._fetch(url)
+                if html is not None:
+                    links, metadata = parse_page(html, url)
+                    self._pages[url] = CrawledPage(url, html, depth, metadata)
+                    for link in links:
+                        self._enqueue(queue, link, depth + 1)
+            except Exception as e:
+                logging.warning(f"Unable to crawl {url}: {e}")
+            finally:
+                self._done.add(url)
+                self._since_checkpoint += 1
+                if self._since_checkpoint >= self.checkpoint_every:
+                    self._save_checkpoint()
+                queue.task_done()
+
+    async def _fetch(self, url: str) -> Optional[str]:
+        """
+        Return the HTML of a page, revalidating the cached copy if there is one.
+        """
+        cached = self.cache.get(url) if self.cache is not None else None
+        headers = {"User-Agent": USER_AGENT}
+        if cached is not None:
+            validators, _ = cached
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        await self.rate_limiter.wait(url)
+        status, response_headers, body = await asyncio.to_thread(self._request, url, headers)
+        if status == 304 and cached is not None:
+            return cached[1]
+        if "html" not in response_headers.get_content_type():
+            return None
+        if self.cache is not None:
+            self.cache.put(url, body, response_headers)
+        return body
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, Message, str]:
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                charset = response.headers.get_content_charset() or "utf-8"
+                body = response.read().decode(charset, errors="replace")
+                return response.status, response.headers, body
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, e.headers, ""
+            raise
+
+    def _load_checkpoint(self) -> Dict[str, int]:
+        """
+        Restore the frontier of an interrupted crawl and return the urls left to fetch.
+        """
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return {}
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+
+        pending = {}
+        for url, depth in checkpoint["seen"].items():
+            self._seen[url] = depth
+            cached = self.cache.get(url) if url in checkpoint["done"] else None
+            if cached is not None:
+                # handled before the interruption, so its links are already in the frontier
+                self._pages[url] = CrawledPage(url, cached[1], depth, parse_page(cached[1], url)[1])
+                self._done.add(url)
+            else:
+                pending[url] = depth
+        logging.info(
+            f"Resuming crawl from {self.checkpoint_path}: "
+            f"{len(self._done)} pages done, {len(pending)} pending"
+        )
+        return pending
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint_path is None:
+            return
+        # only pages that made it to the cache can be restored on resume
+        checkpoint = {
+            "start_urls": self.start_urls,
+            "seen": self._seen,
+            "done": sorted(url for url in self._done if url in self._pages),
+        }
+        _atomic_write(self.checkpoint_path, json.dumps(checkpoint))
+        self._since_checkpoint = 0
@@ -0,0 +1,169 @@
+"""
+Streaming pipeline that applies a chain of preprocessors to documents.
+
+Documents are read in chunks and fanned out to a process pool, keeping a bounded
+number of chunks in flight, and the results are yielded in the input order. With
+a cache_dir, the result for each document is cached under a hash of its content,
+metadata and the preprocessor chain, so unchanged pages skip re-parsing. The hash
+covers the names of the preprocessors but not their code, so clear the cache
+after changing what a preprocessor does.
+"""
+import functools
+import hashlib
+import json
+import os
+import pickle
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+DEFAULT_CHUNK_SIZE = 8
+# chunks waiting in the pool per worker, bounding how far ahead of the consumer it runs
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+_MISSING = object()
+
+# preprocessors of the current pool worker, set by _init_worker
+_worker_preprocessors: List[Callable] = []
+
+
+def preprocessor_name(preprocessor: Callable) -> str:
+    """
+    Return a name for the preprocessor that is stable across runs.
+    """
+    if isinstance(preprocessor, functools.partial):
+        func_name = preprocessor_name(preprocessor.func)
+        return f"{func_name}(*{preprocessor.args!r}, **{preprocessor.keywords!r})"
+    return f"{preprocessor.__module__}.{preprocessor.__qualname__}"
+
+
+def apply_preprocessors(preprocessors: List[Callable], doc):
+    """
+    Apply the preprocessors to the document in sequence, stopping if one drops it
+    by returning None.
+    """
+    for preprocessor in preprocessors:
+        doc = preprocessor(doc)
+        if doc is None:
+            break
+    return doc
+
+
+class PreprocessCache:
+    """
+    On-disk cache of preprocessed documents, keyed by content hash.
+    """
+    def __init__(self, cache_dir: Path, preprocessors: List[Callable]):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.pipeline_name = json.dumps([preprocessor_name(p) for p in preprocessors])
+
+    def key(self, doc) -> str:
+        content_hash = hashlib.sha256(self.pipeline_name.encode())
+        content_hash.update(doc.page_content.encode())
+        content_hash.update(json.dumps(doc.metadata, sort_keys=True, default=str).encode())
+        return content_hash.hexdigest()
+
+    def get(self, key: str) -> Any:
+        """
+        Return the cached result, or _MISSING if there is none.
+        """
+        try:
+            with open(self.cache_dir / f"{key}.pkl", "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return _MISSING
+
+    def put(self, key: str, result: Any) -> None:
+        path = self.cache_dir / f"{key}.pkl"
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f)
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class _Chunk:
+    results: List[Any]
+    keys: List[Optional[str]]
+    # indices of the documents that weren't cached, and the future preprocessing them
+    missing: List[int]
+    future: Optional[Future] = None
+
+
+def _init_worker(preprocessors: List[Callable]) -> None:
+    global _worker_preprocessors
+    _worker_preprocessors = preprocessors
+
+
+def _preprocess_docs(docs: List) -> List:
+    return [apply_preprocessors(_worker_preprocessors, doc) for doc in docs]
+
+
+def _chunked(docs: Iterable, chunk_size: int) -> Iterator[List]:
+    docs = iter(docs)
+    while True:
+        chunk = list(islice(docs, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_pipeline(
+    docs: Iterable,
+    preprocessors: List[Callable],
+    num_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache_dir: Optional[Path] = None,
+) -> Iterator:
+    """
+    Apply the preprocessors to each document, yielding the results in order.
+
+    num_workers defaults to the number of CPUs, with 0 or 1 the documents are
+    preprocessed in this process. The preprocessors and documents must be picklable
+    to go to the pool, so use functools.partial rather than lambdas to bind arguments.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    cache = PreprocessCache(cache_dir, preprocessors) if cache_dir is not None else None
+
+    def submit(executor: Optional[ProcessPoolExecutor], docs: List) -> _Chunk:
+        keys = [cache.key(doc) if cache is not None else None for doc in docs]
+        results = [cache.get(key) if cache is not None else _MISSING for key in keys]
+        chunk = _Chunk(results, keys, [i for i, r in enumerate(results) if r is _MISSING])
+        missing_docs = [docs[i] for i in chunk.missing]
+        if not missing_docs:
+            return chunk
+        if executor is None:
+            chunk.future = Future()
+            chunk.future.set_result([apply_preprocessors(preprocessors, d) for d in missing_docs])
+        else:
+            chunk.future = executor.submit(_preprocess_docs, missing_docs)
+        return chunk
+
+    def collect(chunk: _Chunk) -> List:
+        if chunk.future is not None:
+            for i, result in zip(chunk.missing, chunk.future.result()):
+                chunk.results[i] = result
+                if cache is not None:
+                    cache.put(chunk.keys[i], result)
+        return chunk.results
+
+    if num_workers <= 1:
+        for docs_chunk in _chunked(docs, chunk_size):
+            yield from collect(submit(None, docs_chunk))
+        return
+
+    with ProcessPoolExecutor(
+        num_workers, initializer=_init_worker, initargs=(preprocessors,)
+    ) as executor:
+        in_flight = deque()
+        for docs_chunk in _chunked(docs, chunk_size):
+            in_flight.append(submit(executor, docs_chunk))
+            if len(in_flight) > num_workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                yield from collect(in_flight.popleft())
+        while in_flight:
+            yield from collect(in_flight.popleft())
@@ -0,0 +1,199 @@
+import asyncio
+import functools
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from scrapper.crawler import Crawler, HostRateLimiter
+
+FIXTURE_SITE_DIR = Path(__file__).parent / "fixtures" / "site"
+START_PATH = "/en/practical-guides/baggage/"
+SITE_PAGES = [
+    "/en/practical-guides/baggage/",
+    "/en/practical-guides/baggage/delay/",
+    "/en/practical-guides/baggage/delay/faq/",
+    "/en/practical-guides/baggage/lost/",
+]
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serve the fixture site, with an ETag for the pages listed in server.etags,
+    and record every request made to the server.
+    """
+    def send_head(self):
+        etag = self.server.etags.get(self.path)
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.end_headers()
+            return None
+        return super().send_head()
+
+    def end_headers(self):
+        etag = self.server.etags.get(self.path)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        super().end_headers()
+
+    def log_request(self, code="-", size="-"):
+        self.server.requests.append((self.path, int(code)))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCrawler(unittest.TestCase):
+    """
+    Crawl a local copy of saved pages, without any network access.
+    """
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.site_dir = self.data_dir / "site"
+        self.cache_dir = self.data_dir / "cache"
+        shutil.copytree(FIXTURE_SITE_DIR, self.site_dir)
+
+        handler = functools.partial(FixtureRequestHandler, directory=str(self.site_dir))
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.etags = {START_PATH: '"v1"'}
+        self.server.requests = []
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def get_crawler(self, **kwargs) -> Crawler:
+        kwargs = {"cache_dir": self.cache_dir, "requests_per_second": 0, **kwargs}
+        return Crawler([self.base_url + START_PATH], **kwargs)
+
+    def get_page_paths(self, pages):
+        return [urlparse(page.url).path for page in pages]
+
+    def test_crawl_stays_under_start_url(self):
+        pages = self.get_crawler().run()
+
+        self.assertEqual(self.get_page_paths(pages), SITE_PAGES)
+        requested_paths = sorted(path for path, _ in self.server.requests)
+        self.assertEqual(requested_paths, SITE_PAGES, "Pages should be fetched exactly once")
+
+        start_page = pages[0]
+        self.assertEqual(start_page.depth, 0)
+        self.assertEqual(start_page.metadata["source"], self.base_url + START_PATH)
+        self.assertEqual(start_page.metadata["title"], "Baggage | Air Passenger Rights")
+        self.assertEqual(
+            start_page.metadata["description"], "Practical guides for baggage issues"
+        )
+        self.assertEqual(start_page.metadata["language"], "en")
+        self.assertIn("<h1>Baggage</h1>", start_page.html)
+        self.assertFalse(list(self.cache_dir.glob("frontier-*.json")))
+
+    def test_crawl_respects_max_depth(self):
+        pages = self.get_crawler(max_depth=1).run()
+
+        self.assertEqual(
+            self.get_page_paths(pages),
+            [
+                "/en/practical-guides/baggage/",
+                "/en/practical-guides/baggage/delay/",
+                "/en/practical-guides/baggage/lost/",
+            ],
+        )
+
+    def test_recrawl_revalidates_cached_pages(self):
+        first_pages = self.get_crawler().run()
+        self.server.requests.clear()
+
+        second_pages = self.get_crawler().run()
+
+        self.assertEqual(
+            [page.html for page in second_pages], [page.html for page in first_pages]
+        )
+        self.assertEqual(
+            sorted(self.server.requests),
+            [(path, HTTPStatus.NOT_MODIFIED) for path in SITE_PAGES],
+        )
+
+        # Changed pages are fetched again, by ETag and by modification time
+        self.server.etags[START_PATH] = '"v2"'
+        lost_page_path = self.site_dir / "en/practical-guides/baggage/lost/index.html"
+        lost_page_path.write_text(lost_page_path.read_text().replace("Lost", "Missing"))
+        modified_time = time.time() + 10
+        os.utime(lost_page_path, (modified_time, modified_time))
+        self.server.requests.clear()
+
+        third_pages = self.get_crawler().run()
+
+        self.assertEqual(
+            sorted(self.server.requests),
+            [
+                ("/en/practical-guides/baggage/", HTTPStatus.OK),
+                ("/en/practical-guides/baggage/delay/", HTTPStatus.NOT_MODIFIED),
+                ("/en/practical-guides/baggage/delay/faq/", HTTPStatus.NOT_MODIFIED),
+                ("/en/practical-guides/baggage/lost/", HTTPStatus.OK),
+            ],
+        )
+        self.assertIn("<h1>Missing Baggage</h1>", third_pages[-1].html)
+
+    def test_interrupted_crawl_resumes_from_checkpoint(self):
+        crawler = self.get_crawler(max_concurrency=1, checkpoint_every=1)
+        fetch = crawler._fetch
+        fetched_urls = []
+
+        async def interrupted_crawl():
+            crawl_task = asyncio.current_task()
+
+            async def fetch_then_interrupt(url):
+                html = await fetch(url)
+                fetched_urls.append(url)
+                if len(fetched_urls) == 2:
+                    crawl_task.cancel()
+                return html
+
+            crawler._fetch = fetch_then_interrupt
+            return await crawler.crawl()
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(interrupted_crawl())
+        self.assertEqual(len(list(self.cache_dir.glob("frontier-*.json"))), 1)
+        self.server.requests.clear()
+
+        pages = self.get_crawler().run()
+
+        self.assertEqual(self.get_page_paths(pages), SITE_PAGES)
+        requested_paths = sorted(path for path, _ in self.server.requests)
+        expected_paths = sorted(set(SITE_PAGES) - {urlparse(url).path for url in fetched_urls})
+        self.assertEqual(requested_paths, expected_paths, "Only pending pages should be fetched")
+        self.assertFalse(list(self.cache_dir.glob("frontier-*.json")))
+
+    def test_rate_limiter_spaces_requests_to_a_host(self):
+        rate_limiter = HostRateLimiter(min_interval=0.1)
+
+        async def wait_for_requests():
+            request_times = {}
+            for url in ["http://a.test/1", "http://b.test/1", "http://a.test/2"]:
+                await rate_limiter.wait(url)
+                request_times[url] = time.monotonic()
+            return request_times
+
+        request_times = asyncio.run(wait_for_requests())
+
+        first_request_time = request_times["http://a.test/1"]
+        self.assertGreaterEqual(request_times["http://a.test/2"] - first_request_time, 0.1)
+        self.assertLess(request_times["http://b.test/1"] - first_request_time, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
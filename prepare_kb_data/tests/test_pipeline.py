@@ -0,0 +1,123 @@
+import functools
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from scrapper.pipeline import run_pipeline
+
+
+@dataclass
+class FakeDocument:
+    page_content: str
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+
+def slow_upper(doc):
+    # later documents finish first, so results only come back in order if reordered
+    time.sleep(0.02 / (1 + int(doc.metadata["index"])))
+    return FakeDocument(doc.page_content.upper(), doc.metadata)
+
+
+def log_call(doc, log_path):
+    with open(log_path, "a") as f:
+        f.write(doc.metadata["index"] + "\n")
+    return doc
+
+
+def drop_odd(doc):
+    return doc if int(doc.metadata["index"]) % 2 == 0 else None
+
+
+def get_docs(num_docs):
+    return [FakeDocument(f"document {i}", {"index": str(i)}) for i in range(num_docs)]
+
+
+class TestPipeline(unittest.TestCase):
+    """
+    Preprocess documents in a process pool, with and without the cache.
+    """
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.cache_dir = self.data_dir / "cache"
+        self.log_path = self.data_dir / "calls.log"
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def get_logged_calls(self):
+        if not self.log_path.exists():
+            return []
+        calls = self.log_path.read_text().split()
+        self.log_path.unlink()
+        return sorted(calls, key=int)
+
+    def test_results_are_yielded_in_order(self):
+        docs = get_docs(30)
+
+        results = list(run_pipeline(docs, [slow_upper], num_workers=3, chunk_size=4))
+
+        self.assertEqual(
+            [result.page_content for result in results], [f"DOCUMENT {i}" for i in range(30)]
+        )
+        serial_results = list(run_pipeline(docs, [slow_upper], num_workers=1, chunk_size=4))
+        self.assertEqual(results, serial_results)
+
+    def test_dropped_documents_skip_later_preprocessors(self):
+        preprocessors = [drop_odd, functools.partial(log_call, log_path=self.log_path)]
+
+        results = list(run_pipeline(get_docs(6), preprocessors, num_workers=2, chunk_size=2))
+
+        self.assertEqual([result is None for result in results], [False, True] * 3)
+        self.assertEqual(self.get_logged_calls(), ["0", "2", "4"])
+
+    def test_pipeline_streams_documents(self):
+        docs = (FakeDocument(f"document {i}", {"index": str(i)}) for i in itertools.count())
+
+        results = list(itertools.islice(run_pipeline(docs, [slow_upper], num_workers=2), 5))
+
+        self.assertEqual(
+            [result.page_content for result in results], [f"DOCUMENT {i}" for i in range(5)]
+        )
+
+    def test_cache_skips_unchanged_documents(self):
+        preprocessors = [functools.partial(log_call, log_path=self.log_path), slow_upper]
+        docs = get_docs(10)
+
+        first_results = list(
+            run_pipeline(docs, preprocessors, num_workers=2, chunk_size=3, cache_dir=self.cache_dir)
+        )
+        self.assertEqual(self.get_logged_calls(), [str(i) for i in range(10)])
+
+        second_results = list(
+            run_pipeline(docs, preprocessors, num_workers=2, chunk_size=3, cache_dir=self.cache_dir)
+        )
+        self.assertEqual(second_results, first_results)
+        self.assertEqual(self.get_logged_calls(), [], "Unchanged documents were parsed again")
+
+        # Only the changed documents are parsed again
+        docs[4] = FakeDocument("changed document 4", {"index": "4"})
+        third_results = list(
+            run_pipeline(docs, preprocessors, num_workers=2, chunk_size=3, cache_dir=self.cache_dir)
+        )
+        self.assertEqual(self.get_logged_calls(), ["4"])
+        self.assertEqual(third_results[4].page_content, "CHANGED DOCUMENT 4")
+        del third_results[4], first_results[4]
+        self.assertEqual(third_results, first_results)
+
+        # As is every document once the preprocessors change
+        list(run_pipeline(docs, [slow_upper], num_workers=1, cache_dir=self.cache_dir))
+        list(run_pipeline(docs, preprocessors[:1], num_workers=1, cache_dir=self.cache_dir))
+        self.assertEqual(self.get_logged_calls(), [str(i) for i in range(10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
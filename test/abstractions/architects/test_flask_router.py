@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint as flask_blueprint
+from mephisto.abstractions.architects.router.flask.mephisto_flask_blueprint import (
+    MephistoRouter,
+    PACKET_TYPE_REQUEST_STATUSES,
+    PACKET_TYPE_RETURN_STATUSES,
+    PACKET_TYPE_UPDATE_STATUS,
+    STATUS_DISCONNECTED,
+    STATUS_IN_TASK,
+    STATUS_WAITING,
+    SYSTEM_CHANNEL_ID,
+)
+
+
+class TestFlaskRouterStatuses(unittest.TestCase):
+    """
+    Unit testing for the status sync between the Flask router and Mephisto
+    """
+
+    def setUp(self):
+        flask_blueprint.mephisto_router_state = None
+        self.router = MephistoRouter(MagicMock())
+        self.sent_packets: List[Dict[str, Any]] = []
+        self.router._send_message = lambda socket, packet: self.sent_packets.append(packet)
+
+    def tearDown(self):
+        flask_blueprint.mephisto_router_state = None
+
+    def update_status(self, agent_id: str, status: str) -> None:
+        self.router._handle_packet(
+            {
+                "packet_type": PACKET_TYPE_UPDATE_STATUS,
+                "subject_id": agent_id,
+                "data": {"status": status},
+            }
+        )
+
+    def request_statuses(self, since_status_seq: Optional[int]) -> Dict[str, Any]:
+        self.sent_packets.clear()
+        self.router._handle_packet(
+            {
+                "packet_type": PACKET_TYPE_REQUEST_STATUSES,
+                "subject_id": SYSTEM_CHANNEL_ID,
+                "data": {"since_status_seq": since_status_seq},
+                "server_timestamp": 0,
+            }
+        )
+        self.assertEqual(len(self.sent_packets), 1)
+        packet = self.sent_packets[0]
+        self.assertEqual(packet["packet_type"], PACKET_TYPE_RETURN_STATUSES)
+        return packet["data"]
+
+    def test_status_deltas(self):
+        """Ensure only changed statuses are returned after the first full snapshot"""
+        for agent_id in ["agent_1", "agent_2", "agent_3"]:
+            self.update_status(agent_id, STATUS_WAITING)
+
+        full_response = self.request_statuses(None)
+        self.assertTrue(full_response["full_snapshot"])
+        self.assertEqual(
+            full_response["agent_statuses"],
+            {"agent_1": STATUS_WAITING, "agent_2": STATUS_WAITING, "agent_3": STATUS_WAITING},
+        )
+        status_seq = full_response["status_seq"]
+
+        empty_response = self.request_statuses(status_seq)
+        self.assertFalse(empty_response["full_snapshot"])
+        self.assertEqual(empty_response["agent_statuses"], {})
+        self.assertEqual(empty_response["status_seq"], status_seq)
+
+        # Repeating a status isn't a change
+        self.update_status("agent_1", STATUS_WAITING)
+        self.update_status("agent_2", STATUS_IN_TASK)
+        self.update_status("agent_3", STATUS_DISCONNECTED)
+        self.update_status("agent_2", STATUS_DISCONNECTED)
+        self.update_status("agent_4", STATUS_WAITING)
+        delta_response = self.request_statuses(status_seq)
+        self.assertEqual(
+            delta_response["agent_statuses"],
+            {
+                "agent_2": STATUS_DISCONNECTED,
+                "agent_3": STATUS_DISCONNECTED,
+                "agent_4": STATUS_WAITING,
+            },
+        )
+
+        # Unacknowledged changes are returned again
+        self.assertEqual(self.request_statuses(status_seq), delta_response)
+        self.assertEqual(self.request_statuses(delta_response["status_seq"])["agent_statuses"], {})
+
+    def test_unknown_sequence_returns_full_snapshot(self):
+        """Ensure a sequence number from a previous router gets every status"""
+        self.update_status("agent_1", STATUS_IN_TASK)
+        response = self.request_statuses(1000)
+        self.assertTrue(response["full_snapshot"])
+        self.assertEqual(response["agent_statuses"], {"agent_1": STATUS_IN_TASK})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,7 @@ from typing import Type, ClassVar
 from mephisto.abstractions.test.architect_tester import ArchitectTests
 from mephisto.abstractions.architects.mock_architect import (
     MockArchitect,
+    MockArchitectArgs,
     MOCK_DEPLOY_URL,
 )
 
@@ -22,6 +23,9 @@ from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.abstractions.blueprints.mock.mock_blueprint import MockBlueprint
 from mephisto.abstractions.blueprints.mock.mock_task_builder import MockTaskBuilder
 from mephisto.abstractions.blueprints.mock.mock_task_runner import MockTaskRunner
+from mephisto.abstractions.test.architect_tester import EMPTY_STATE
+from mephisto.operations.hydra_config import MephistoConfig
+from omegaconf import OmegaConf
 
 
 class MockArchitectTests(ArchitectTests):
@@ -56,6 +60,19 @@ class MockArchitectTests(ArchitectTests):
         """Note that the server is down"""
         return self.curr_architect.did_shutdown
 
+    def test_channels_use_batch_settings(self) -> None:
+        """Ensure the socket batching arguments are passed on to the architect's channels"""
+        arch_args = MockArchitectArgs(
+            batch_socket_sends=True, max_socket_batch_size=10, max_socket_batch_delay=0.05
+        )
+        args = OmegaConf.structured(MephistoConfig(architect=arch_args))
+        architect = MockArchitect(self.db, args, EMPTY_STATE, self.task_run, self.build_dir)
+        channels = architect.get_channels(lambda _: None, lambda _: None, lambda _, __: None)
+        self.assertEqual(len(channels), 1)
+        self.assertTrue(channels[0].batch_sends)
+        self.assertEqual(channels[0].max_batch_size, 10)
+        self.assertEqual(channels[0].max_batch_delay, 0.05)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+import tempfile
+import os
+import shutil
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.blueprints.parlai_chat.parlai_chat_agent_state import (
+    ParlAIChatAgentState,
+    STATE_STORAGE_JSON,
+    STATE_STORAGE_JSONL,
+)
+from mephisto.data_model.agent import Agent
+from mephisto.utils.testing import get_test_agent
+
+NUM_TEST_MESSAGES = 5
+
+
+class TestParlAIChatAgentState(unittest.TestCase):
+    """
+    Unit testing for saving and loading ParlAI chat agent states
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path)
+        self.agent = Agent.get(self.db, get_test_agent(self.db))
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def run_conversation(self, state: ParlAIChatAgentState) -> None:
+        state.set_init_state({"context": "test context"})
+        for idx in range(NUM_TEST_MESSAGES):
+            state.update_data({"text": f"message {idx}", "task_data": {}})
+        state.update_submit({"rating": 5})
+
+    def test_json_storage(self):
+        """Ensure the default storage keeps writing the full state.json"""
+        state = ParlAIChatAgentState(self.agent)
+        self.assertEqual(state.storage_mode, STATE_STORAGE_JSON)
+        self.run_conversation(state)
+
+        self.assertTrue(os.path.exists(state._get_expected_data_file()))
+        self.assertFalse(os.path.exists(state._get_message_log_file()))
+        loaded_state = ParlAIChatAgentState(self.agent)
+        self.assertEqual(loaded_state.storage_mode, STATE_STORAGE_JSON)
+        self.assertEqual(loaded_state.get_data(), state.get_data())
+
+    def test_jsonl_storage(self):
+        """Ensure the jsonl storage appends messages and replays them on load"""
+        state = ParlAIChatAgentState(self.agent)
+        state.storage_mode = STATE_STORAGE_JSONL
+        self.run_conversation(state)
+
+        self.assertFalse(os.path.exists(state._get_expected_data_file()))
+        with open(state._get_message_log_file()) as log_file:
+            self.assertEqual(len(log_file.readlines()), NUM_TEST_MESSAGES)
+        loaded_state = ParlAIChatAgentState(self.agent)
+        self.assertEqual(loaded_state.storage_mode, STATE_STORAGE_JSONL)
+        self.assertEqual(loaded_state.get_data(), state.get_data())
+        self.assertEqual(loaded_state.final_submission, {"rating": 5})
+
+        # Continuing the loaded state only appends the new messages
+        loaded_state.update_data({"text": "late message", "task_data": {}})
+        with open(state._get_message_log_file()) as log_file:
+            self.assertEqual(len(log_file.readlines()), NUM_TEST_MESSAGES + 1)
+
+    def test_jsonl_storage_drops_partial_message(self):
+        """Ensure a message log cut short mid-write still loads"""
+        state = ParlAIChatAgentState(self.agent)
+        state.storage_mode = STATE_STORAGE_JSONL
+        self.run_conversation(state)
+        with open(state._get_message_log_file(), "a") as log_file:
+            log_file.write('{"text": "cut sho')
+
+        loaded_state = ParlAIChatAgentState(self.agent)
+        self.assertEqual(len(loaded_state.messages), NUM_TEST_MESSAGES)
+
+        # Messages appended after the partial one are kept
+        for idx in range(2):
+            loaded_state.update_data({"text": f"late message {idx}", "task_data": {}})
+        reloaded_state = ParlAIChatAgentState(self.agent)
+        self.assertEqual(reloaded_state.get_data(), loaded_state.get_data())
+        self.assertEqual(
+            [m["text"] for m in reloaded_state.messages[NUM_TEST_MESSAGES:]],
+            ["late message 0", "late message 1"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+from omegaconf import OmegaConf
+
+from mephisto.abstractions.blueprints.remote_procedure.remote_procedure_agent_state import (
+    RemoteProcedureAgentState,
+)
+from mephisto.abstractions.blueprints.remote_procedure.remote_procedure_blueprint import (
+    SharedRemoteProcedureTaskState,
+)
+from mephisto.abstractions.blueprints.remote_procedure.remote_procedure_task_runner import (
+    RemoteProcedureTaskRunner,
+)
+
+WAIT_TIMEOUT = 5
+
+
+class TestRemoteProcedureDispatch(unittest.TestCase):
+    """
+    Unit testing for running remote procedure requests as they arrive
+    """
+
+    def make_runner(self, function_registry, **blueprint_args) -> RemoteProcedureTaskRunner:
+        task_run = MagicMock()
+        task_run.get_task_args().assignment_duration_in_seconds = 60
+        args = OmegaConf.create({"blueprint": {"async_dispatch": True, **blueprint_args}})
+        shared_state = SharedRemoteProcedureTaskState(function_registry=function_registry)
+        runner = RemoteProcedureTaskRunner(task_run, args, shared_state)
+        self.addCleanup(runner.shutdown)
+        return runner
+
+    def make_agent(self) -> MagicMock:
+        agent = MagicMock()
+        agent.state = MagicMock(spec=RemoteProcedureAgentState)
+        agent.observed = []
+        agent.observe.side_effect = agent.observed.append
+        return agent
+
+    def make_request(self, target: str, request_id: str, args: Any = None) -> Dict[str, Any]:
+        return {"request_id": request_id, "target": target, "args": json.dumps(args)}
+
+    def wait_for_responses(self, agent: MagicMock, count: int) -> List[Dict[str, Any]]:
+        start_time = time.time()
+        while len(agent.observed) < count and time.time() - start_time < WAIT_TIMEOUT:
+            time.sleep(0.01)
+        self.assertEqual(len(agent.observed), count)
+        return agent.observed
+
+    def test_dispatch_on_arrival(self):
+        """Ensure requests are run right away, and other updates are left for the agent"""
+        runner = self.make_runner({"echo": lambda request_id, args, state: {"echo": args}})
+        agent = self.make_agent()
+
+        self.assertTrue(runner.handle_live_update(agent, self.make_request("echo", "1", "hi")))
+        self.assertFalse(runner.handle_live_update(agent, {"text": "not a request"}))
+        self.assertEqual(
+            self.wait_for_responses(agent, 1),
+            [{"handles": "1", "response": json.dumps({"echo": "hi"})}],
+        )
+
+        polling_runner = self.make_runner({}, async_dispatch=False)
+        self.assertFalse(polling_runner.handle_live_update(agent, self.make_request("echo", "2")))
+
+    def test_requests_recorded_in_agent_state(self):
+        """Ensure dispatched requests are still saved to the agent's state"""
+        runner = self.make_runner({"echo": lambda request_id, args, state: {"echo": args}})
+        agent = self.make_agent()
+        agent.get_data_dir.return_value = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, agent.get_data_dir.return_value)
+        agent.db.key_exists.return_value = False
+        agent.state = RemoteProcedureAgentState(agent)
+
+        runner.handle_live_update(agent, self.make_request("echo", "1", "hi"))
+        self.wait_for_responses(agent, 1)
+        self.assertIn("1", agent.state.requests)
+        self.assertEqual(agent.state.requests["1"].target, "echo")
+        self.assertEqual(agent.state.requests["1"].args_json, json.dumps("hi"))
+
+    def test_concurrency_limit_per_target(self):
+        """Ensure requests over a target's limit wait for earlier ones, in order"""
+        release = threading.Event()
+        running = []
+        max_running = []
+        lock = threading.Lock()
+
+        def slow(request_id, args, state):
+            with lock:
+                running.append(request_id)
+                max_running.append(len(running))
+            release.wait(WAIT_TIMEOUT)
+            with lock:
+                running.remove(request_id)
+            return request_id
+
+        runner = self.make_runner(
+            {"slow": slow, "fast": lambda request_id, args, state: request_id},
+            max_concurrent_requests_per_target=2,
+        )
+        agent = self.make_agent()
+        for request_id in ["1", "2", "3", "4"]:
+            runner.handle_live_update(agent, self.make_request("slow", request_id))
+        # Other targets aren't held up
+        runner.handle_live_update(agent, self.make_request("fast", "5"))
+        self.assertEqual(self.wait_for_responses(agent, 1)[0]["handles"], "5")
+
+        release.set()
+        responses = self.wait_for_responses(agent, 5)
+        self.assertEqual(sorted(r["handles"] for r in responses[1:]), ["1", "2", "3", "4"])
+        self.assertEqual(max(max_running), 2)
+
+    def test_coroutine_target(self):
+        """Ensure async functions are run on the event loop that receives requests"""
+        loop_threads = []
+
+        async def fetch(request_id, args, state):
+            loop_threads.append(threading.current_thread())
+            await asyncio.sleep(0)
+            return {"fetched": args}
+
+        runner = self.make_runner({"fetch": fetch})
+        agent = self.make_agent()
+
+        async def receive_request():
+            runner.handle_live_update(agent, self.make_request("fetch", "1", 3))
+            while not agent.observed:
+                await asyncio.sleep(0.01)
+
+        asyncio.run(asyncio.wait_for(receive_request(), WAIT_TIMEOUT))
+        self.assertEqual(agent.observed, [{"handles": "1", "response": json.dumps({"fetched": 3})}])
+        self.assertEqual(loop_threads, [threading.current_thread()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,9 +8,17 @@ import unittest
 import shutil
 import os
 import tempfile
+import threading
+from typing import List
 
+from mephisto.abstractions.database import MephistoDBException
 from mephisto.abstractions.test.data_model_database_tester import BaseDatabaseTests
-from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database import (
+    LocalMephistoDB,
+    CONCURRENCY_MODE_WAL,
+)
+from mephisto.data_model.unit import Unit
+from mephisto.utils.testing import get_test_unit
 
 
 class TestLocalMephistoDB(BaseDatabaseTests):
@@ -35,5 +43,52 @@ class TestLocalMephistoDB(BaseDatabaseTests):
     # TODO(#97) are there any other unit tests we'd like to have?
 
 
+class TestLocalMephistoDBWALMode(BaseDatabaseTests):
+    """
+    Unit testing for the LocalMephistoDB running with lock-free reads
+    in SQLite's WAL mode
+    """
+
+    is_base = False
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path, concurrency_mode=CONCURRENCY_MODE_WAL)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_journal_mode_is_wal(self) -> None:
+        """Ensure the database file was switched into WAL mode"""
+        conn = self.db._get_connection()
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()["journal_mode"]
+        self.assertEqual(journal_mode, "wal")
+
+    def test_reads_do_not_wait_for_writer(self) -> None:
+        """Ensure reads from another thread proceed while the write lock is held"""
+        db = self.db
+        unit_id = get_test_unit(db)
+        found_units: List[Unit] = []
+
+        def read_units():
+            found_units.extend(db.find_units())
+            db.get_unit(unit_id)
+
+        with db.table_access_condition:
+            reader = threading.Thread(target=read_units)
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive(), "Read blocked on the held write lock")
+        self.assertEqual(len(found_units), 1)
+
+    def test_invalid_concurrency_mode(self) -> None:
+        """Ensure unknown concurrency modes are rejected"""
+        database_path = os.path.join(self.data_dir, "other.db")
+        with self.assertRaises(MephistoDBException):
+            LocalMephistoDB(database_path, concurrency_mode="fast")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -8,9 +8,12 @@ import unittest
 import shutil
 import os
 import tempfile
+import gc
 
+from prometheus_client import REGISTRY  # type: ignore
 from mephisto.abstractions.test.data_model_database_tester import BaseDatabaseTests
 from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.data_model.worker import Worker
 
 
 class TestMephistoSingletonDB(BaseDatabaseTests):
@@ -18,7 +21,7 @@ class TestMephistoSingletonDB(BaseDatabaseTests):
     Unit testing for the MephistoSingletonDB
 
     Inherits all tests directly from BaseDataModelTests, and
-    writes no additional tests.
+    adds tests for the singleton caches.
     """
 
     is_base = False
@@ -32,7 +35,38 @@ class TestMephistoSingletonDB(BaseDatabaseTests):
         self.db.shutdown()
         shutil.rmtree(self.data_dir)
 
-    # TODO(#97) are there any other unit tests we'd like to have?
+    def get_cache_events(self, event: str) -> float:
+        value = REGISTRY.get_sample_value(
+            "singleton_db_cache_events_total", {"cache": "Worker", "event": event}
+        )
+        return value or 0
+
+    def test_singleton_cache_is_bounded(self):
+        """Ensure only the most recently used objects are kept, and in use ones stay singletons"""
+        db = MephistoSingletonDB(os.path.join(self.data_dir, "bounded.db"), cache_size=2)
+        try:
+            worker_ids = [db.new_worker(f"worker_{i}", "mock") for i in range(5)]
+            evictions_before = self.get_cache_events("eviction")
+            hits_before = self.get_cache_events("hit")
+            misses_before = self.get_cache_events("miss")
+
+            first_worker = Worker.get(db, worker_ids[0])
+            for worker_id in worker_ids[1:]:
+                Worker.get(db, worker_id)
+            gc.collect()
+
+            worker_cache = db._singleton_cache[Worker]
+            self.assertEqual(len(worker_cache), 3, "Only the two recent and one used worker")
+            self.assertEqual(self.get_cache_events("miss") - misses_before, 5)
+            self.assertEqual(self.get_cache_events("eviction") - evictions_before, 3)
+            self.assertIs(Worker.get(db, worker_ids[0]), first_worker)
+            self.assertIs(Worker.get(db, worker_ids[4]), Worker.get(db, worker_ids[4]))
+            self.assertEqual(self.get_cache_events("hit") - hits_before, 3)
+
+            # Evicted workers that aren't in use are loaded again
+            self.assertEqual(Worker.get(db, worker_ids[1]).worker_name, "worker_1")
+        finally:
+            db.shutdown()
 
 
 if __name__ == "__main__":
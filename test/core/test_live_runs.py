@@ -11,6 +11,7 @@ import os
 import tempfile
 import time
 import asyncio
+from unittest.mock import patch
 
 from typing import List, Callable
 
@@ -34,6 +35,8 @@ from mephisto.abstractions.architects.mock_architect import (
     MockArchitect,
     MockArchitectArgs,
 )
+from mephisto.abstractions.architects.channels.websocket_channel import WebsocketChannel
+from mephisto.data_model.packet import Packet, PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE
 from mephisto.operations.hydra_config import MephistoConfig
 from mephisto.abstractions.providers.mock.mock_provider import (
     MockProvider,
@@ -52,6 +55,7 @@ if TYPE_CHECKING:
     from mephisto.abstractions.database import MephistoDB
 
 EMPTY_STATE = MockSharedState()
+NUM_BATCHED_PACKETS = 50
 
 
 class BaseTestLiveRuns:
@@ -229,6 +233,42 @@ class BaseTestLiveRuns:
         channel.close()
         self.assertTrue(channel.is_closed())
 
+    def test_channel_batched_sends(self):
+        """
+        Ensure a channel with batched sends delivers every packet,
+        coalesced into fewer frames
+        """
+        channel = WebsocketChannel(
+            "batched_channel",
+            on_channel_open=self.client_io._on_channel_open,
+            on_catastrophic_disconnect=self.client_io._on_catastrophic_disconnect,
+            on_message=self.client_io._on_message,
+            socket_url=self.url,
+            batch_sends=True,
+            max_batch_size=10,
+            max_batch_delay=0.05,
+        )
+        self.client_io._register_channel(channel)
+        server = self.architect.server
+        self.assert_server_subbed_in_time(server)
+        frames_before = server.frames_observed
+
+        for idx in range(NUM_BATCHED_PACKETS):
+            packet = Packet(
+                packet_type=PACKET_TYPE_CLIENT_BOUND_LIVE_UPDATE,
+                subject_id="test_agent",
+                data={"idx": idx},
+            )
+            self.assertTrue(channel.enqueue_send(packet))
+
+        start_time = time.time()
+        while server.actions_observed < NUM_BATCHED_PACKETS and time.time() - start_time < 5:
+            time.sleep(0.1)
+        self.assertEqual(server.actions_observed, NUM_BATCHED_PACKETS)
+        num_frames = server.frames_observed - frames_before
+        self.assertGreaterEqual(num_frames, NUM_BATCHED_PACKETS // 10)
+        self.assertLess(num_frames, NUM_BATCHED_PACKETS, "Packets were not batched")
+
     def test_register_concurrent_run(self):
         """Test registering and running a run that requires multiple workers"""
         # Handle baseline setup
@@ -434,6 +474,37 @@ class BaseTestLiveRuns:
         live_run.shutdown()
         self.assertTrue(channel.is_closed())
 
+    def test_register_run_with_reserved_units(self):
+        """Ensure workers get a free unit when the units they're offered first are reserved"""
+        TaskRunnerClass = MockBlueprint.TaskRunnerClass
+        args = MockBlueprint.ArgsClass()
+        args.timeout_time = 5
+        config = OmegaConf.structured(MephistoConfig(blueprint=args))
+        task_runner = TaskRunnerClass(self.task_run, config, EMPTY_STATE)
+        blueprint = self.task_run.get_blueprint(args=config)
+        live_run = self.get_mock_run(blueprint, task_runner)
+        self.live_run = live_run
+        self.task_run.start_unit_availability_tracking()
+        live_run.client_io.launch_channels()
+        self.assert_server_subbed_in_time(self.architect.server)
+
+        # Reserved by a registration that was offered the same units, which the
+        # availability index only learns of when reserving it fails
+        reserved_unit = self.launcher.units[0]
+        reservation_dir = os.path.join(self.task_run.get_run_dir(), "reservations")
+        os.makedirs(reservation_dir, exist_ok=True)
+        with open(os.path.join(reservation_dir, f"unit_res_{reserved_unit.db_id}"), "x"):
+            pass
+
+        with patch("mephisto.data_model.task_run.AVAILABLE_UNITS_BATCH_SIZE", 1):
+            self.architect.server.register_mock_agent("MOCK_WORKER", "FAKE_ASSIGNMENT")
+            self.await_channel_requests(live_run)
+        agents = self.db.find_agents()
+        self.assertEqual(len(agents), 1, "Agent was not created on a free unit")
+        self.assertNotEqual(agents[0].unit_id, reserved_unit.db_id)
+
+        live_run.shutdown()
+
     def test_register_concurrent_run_with_onboarding(self):
         """Test registering and running a run with onboarding"""
         # Handle baseline setup
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+
+from mephisto.scripts.benchmarks.live_server import run_live_benchmark
+from mephisto.scripts.benchmarks.live_server import STEPS
+
+TIMEOUT_TIME = 30
+
+
+class TestLiveServerBenchmark(unittest.TestCase):
+    """
+    Unit testing for driving simulated workers through a live task run
+    """
+
+    def test_workers_complete_units(self):
+        """Ensure every simulated worker gets through onboarding and submits a unit"""
+        num_workers = 5
+        report = run_live_benchmark(
+            num_workers=num_workers,
+            arrival_rate=0,
+            live_updates=2,
+            sample_interval=0.1,
+            timeout=TIMEOUT_TIME,
+        )
+
+        self.assertEqual(report["workers"], {"submitted": 5, "failed": {}, "unfinished": 0})
+        self.assertEqual(report["units_completed"], num_workers)
+        for step in STEPS:
+            self.assertEqual(report["latency"][step]["count"], num_workers)
+        # A registration, onboarding, live updates and a submission from every worker
+        self.assertEqual(report["packets"]["sent"], num_workers * 5)
+        self.assertGreater(report["packets"]["received"], num_workers * 3)
+        self.assertEqual(report["database"]["new_agent"]["count"], num_workers)
+        self.assertGreater(report["peak_rss_mb"], 0)
+        self.assertGreater(len(report["samples"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ import os
 import tempfile
 from typing import List, Iterable
 import time
+from unittest.mock import patch
 
 from mephisto.utils.testing import get_test_task_run
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
@@ -20,7 +21,10 @@ from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.task_run import TaskRun
 
 from mephisto.abstractions.providers.mock.mock_provider import MockProvider
-from mephisto.abstractions.blueprints.mock.mock_blueprint import MockBlueprint
+from mephisto.abstractions.providers.mock.mock_unit import MockUnit
+from mephisto.abstractions.providers.mock.mock_agent import MockAgent
+from mephisto.abstractions.providers.mock.mock_worker import MockWorker
+from mephisto.abstractions.blueprints.mock.mock_blueprint import MockBlueprint, MockSharedState
 from mephisto.abstractions.blueprints.mock.mock_task_runner import MockTaskRunner
 
 from typing import Type, ClassVar, TYPE_CHECKING
@@ -32,6 +36,8 @@ MAX_WAIT_TIME_UNIT_LAUNCH = 15
 NUM_GENERATED_ASSIGNMENTS = 10
 WAIT_TIME_TILL_NEXT_ASSIGNMENT = 1
 WAIT_TIME_TILL_NEXT_UNIT = 0.01
+NUM_STATUS_TRACKING_UNITS = 300
+MAX_WAIT_TIME_STATUS_TRACKING = 60
 
 
 class LimitedDict(dict):
@@ -121,6 +127,35 @@ class BaseTestTaskLauncher:
         for assignment in launcher.assignments:
             self.assertEqual(assignment.get_status(), AssignmentState.EXPIRED)
 
+    def test_create_assignments_in_batches(self):
+        """Ensure data arrays larger than a batch create all assignments and units"""
+        num_assignments = 5
+        mock_data_array = self.get_mock_assignment_data_array() * num_assignments
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array)
+        with patch(
+            "mephisto.operations.task_launcher.ASSIGNMENT_CREATION_BATCH_SIZE", 2
+        ), patch.object(
+            self.db, "get_assignment", wraps=self.db.get_assignment
+        ) as mock_get_assignment, patch.object(
+            self.db, "get_unit", wraps=self.db.get_unit
+        ) as mock_get_unit:
+            launcher.create_assignments()
+        # The created rows are returned by the batch inserts rather than loaded one by one
+        self.assertEqual(mock_get_assignment.call_count, 0)
+        self.assertEqual(mock_get_unit.call_count, 0)
+
+        units_per_assignment = len(mock_data_array[0].unit_data)
+        self.assertEqual(len(launcher.assignments), num_assignments)
+        self.assertEqual(len(launcher.units), num_assignments * units_per_assignment)
+        self.assertEqual(len(launcher.unlaunched_units), len(launcher.units))
+        for assignment in launcher.assignments:
+            self.assertEqual(len(assignment.get_units()), units_per_assignment)
+            self.assertEqual(
+                assignment.get_assignment_data().unit_data, mock_data_array[0].unit_data
+            )
+        for unit in launcher.units:
+            self.assertEqual(unit.get_db_status(), AssignmentState.CREATED)
+
     def test_launch_assignments_with_concurrent_unit_cap(self):
         """Initialize a launcher on a task run, then create the assignments"""
         cap_values = [1, 2, 3, 4, 5]
@@ -149,6 +184,165 @@ class BaseTestTaskLauncher:
             self.tearDown()
             self.setUp()
 
+    def test_launch_tracks_units_from_status_events(self):
+        """Ensure launched units are tracked from status events, without querying statuses"""
+        num_assignments = NUM_STATUS_TRACKING_UNITS // 10
+        max_num_units = 100
+        mock_data_array = [InitializationData(shared={}, unit_data=[{}] * 10)] * num_assignments
+        launcher = TaskLauncher(
+            self.db,
+            self.task_run,
+            mock_data_array,
+            max_num_concurrent_units=max_num_units,
+        )
+        launcher.create_assignments()
+        self.assertEqual(len(launcher.units), NUM_STATUS_TRACKING_UNITS)
+
+        with patch.object(
+            MockUnit, "get_status", autospec=True, side_effect=MockUnit.get_status
+        ) as mock_get_status, patch(
+            "mephisto.operations.task_launcher.UNIT_GENERATOR_WAIT_SECONDS", 0.01
+        ):
+            launcher.launch_units("dummy-url:3000")
+            num_completed = 0
+            start_time = time.time()
+            while num_completed < NUM_STATUS_TRACKING_UNITS:
+                with launcher.launched_units_access_condition:
+                    launched_units = list(launcher.launched_units.values())
+                self.assertLessEqual(len(launched_units), max_num_units)
+                for unit in launched_units:
+                    if unit.db_status == AssignmentState.LAUNCHED:
+                        unit.set_db_status(AssignmentState.COMPLETED)
+                        num_completed += 1
+                self.assertLessEqual(time.time() - start_time, MAX_WAIT_TIME_STATUS_TRACKING)
+            launcher.shutdown()
+
+            self.assertEqual(len(launcher.unlaunched_units), 0)
+            self.assertEqual(len(launcher.launched_units), 0)
+            self.assertEqual(mock_get_status.call_count, 0)
+
+    def test_task_run_tracks_completion_from_status_events(self):
+        """Ensure a tracked task run only queries unit statuses to seed its completion count"""
+        mock_data_array = [InitializationData(shared={}, unit_data=[{}] * 10)] * 10
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array)
+        launcher.create_assignments()
+        self.task_run.start_completion_tracking()
+
+        with patch.object(
+            MockUnit, "get_status", autospec=True, side_effect=MockUnit.get_status
+        ) as mock_get_status:
+            self.task_run.update_completion_progress(task_launcher=launcher)
+            self.assertFalse(self.task_run.get_is_completed())
+            self.assertEqual(mock_get_status.call_count, len(launcher.units))
+
+            for unit in launcher.units:
+                unit.set_db_status(AssignmentState.LAUNCHED)
+            for unit in launcher.units[:-1]:
+                unit.set_db_status(AssignmentState.COMPLETED)
+                self.assertFalse(self.task_run.get_is_completed())
+            launcher.units[-1].set_db_status(AssignmentState.EXPIRED)
+            self.assertTrue(self.task_run.get_is_completed())
+            self.assertEqual(mock_get_status.call_count, len(launcher.units))
+
+    def test_task_run_indexes_available_units(self):
+        """Ensure the unit availability index finds the same units as loading the whole run"""
+        mock_data_array = [MockTaskRunner.get_mock_assignment_data()] * 20
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array)
+        launcher.create_assignments()
+        self.task_run.start_unit_availability_tracking()
+        for unit in launcher.units:
+            unit.set_db_status(AssignmentState.LAUNCHED)
+        worker_1 = MockWorker.get(self.db, self.db.new_worker("MOCK_WORKER_1", "mock"))
+        worker_2 = MockWorker.get(self.db, self.db.new_worker("MOCK_WORKER_2", "mock"))
+
+        def get_valid_unit_ids(worker):
+            with patch.object(self.db, "find_units", wraps=self.db.find_units) as mock_find:
+                units = self.task_run.get_valid_units_for_worker(worker)
+            self.assertEqual(mock_find.call_count, 0)
+            unit_ids = [u.db_id for u in units]
+            loaded_ids = [u.db_id for u in self.task_run._find_launched_units_for_worker(worker)]
+            self.assertEqual(sorted(unit_ids), sorted(loaded_ids))
+            return unit_ids
+
+        self.assertEqual(len(get_valid_unit_ids(worker_1)), len(launcher.units))
+
+        # A worker can't be given another unit of an assignment they're working on
+        agent = MockAgent.new(self.db, worker_1, launcher.units[0])
+        self.assertEqual(len(get_valid_unit_ids(worker_1)), len(launcher.units) - 2)
+        self.assertEqual(len(get_valid_unit_ids(worker_2)), len(launcher.units) - 1)
+
+        # Completed units stay out of the assignment and the available units
+        launcher.units[2].set_db_status(AssignmentState.COMPLETED)
+        self.assertEqual(len(get_valid_unit_ids(worker_1)), len(launcher.units) - 3)
+
+        # Clearing the agent frees the unit and the assignment again
+        agent.get_unit().clear_assigned_agent()
+        self.assertEqual(len(get_valid_unit_ids(worker_1)), len(launcher.units) - 1)
+        self.assertEqual(len(get_valid_unit_ids(worker_2)), len(launcher.units) - 1)
+
+        self.task_run.stop_unit_availability_tracking()
+
+    def test_task_run_offers_batch_of_available_units(self):
+        """Ensure the unit availability index only offers a worker a batch of the units"""
+        mock_data_array = [MockTaskRunner.get_mock_assignment_data()] * 20
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array)
+        launcher.create_assignments()
+        self.task_run.start_unit_availability_tracking()
+        for unit in launcher.units:
+            unit.set_db_status(AssignmentState.LAUNCHED)
+        worker = MockWorker.get(self.db, self.db.new_worker("MOCK_WORKER_1", "mock"))
+        launched_ids = {u.db_id for u in launcher.units}
+
+        with patch("mephisto.data_model.task_run.AVAILABLE_UNITS_BATCH_SIZE", 4):
+            units = self.task_run.get_valid_units_for_worker(worker)
+            self.assertEqual(len(units), 4)
+            self.assertTrue({u.db_id for u in units} <= launched_ids)
+
+            # Larger batches are offered while the worker can't do any unit of them
+            last_unit_id = launcher.units[-1].db_id
+            shared_state = MockSharedState(
+                worker_can_do_unit=lambda _worker, unit: unit.db_id == last_unit_id
+            )
+            self.task_run.get_blueprint(args=self.task_run.args, shared_state=shared_state)
+            units = self.task_run.get_valid_units_for_worker(worker)
+            self.assertEqual([u.db_id for u in units], [last_unit_id])
+
+        self.task_run.stop_unit_availability_tracking()
+
+    def test_task_run_hides_reserved_units(self):
+        """Ensure reserved and excluded units aren't offered from the availability index"""
+        mock_data_array = [MockTaskRunner.get_mock_assignment_data()] * 5
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array)
+        launcher.create_assignments()
+        self.task_run.start_unit_availability_tracking()
+        for unit in launcher.units:
+            unit.set_db_status(AssignmentState.LAUNCHED)
+        worker = MockWorker.get(self.db, self.db.new_worker("MOCK_WORKER_1", "mock"))
+
+        with patch("mephisto.data_model.task_run.AVAILABLE_UNITS_BATCH_SIZE", 4):
+            offered = self.task_run.get_valid_units_for_worker(worker)
+            for unit in offered:
+                self.assertIsNotNone(self.task_run.reserve_unit(unit))
+            next_offered = self.task_run.get_valid_units_for_worker(worker)
+            self.assertEqual(len(next_offered), 4)
+            self.assertFalse({u.db_id for u in offered} & {u.db_id for u in next_offered})
+
+            # Units can also be passed over by the caller
+            excluded_ids = {u.db_id for u in next_offered}
+            remaining = self.task_run.get_valid_units_for_worker(
+                worker, exclude_unit_ids=excluded_ids
+            )
+            self.assertEqual(len(remaining), len(launcher.units) - 8)
+
+            # Clearing a reservation offers the unit again
+            self.task_run.clear_reservation(offered[0])
+            remaining = self.task_run.get_valid_units_for_worker(
+                worker, exclude_unit_ids=excluded_ids
+            )
+            self.assertIn(offered[0].db_id, [u.db_id for u in remaining])
+
+        self.task_run.stop_unit_availability_tracking()
+
     def test_assignments_generator(self):
         """Initialize a launcher on a task run, then try generate the assignments"""
         mock_data_array = self.get_mock_assignment_data_generator()
@@ -9,6 +9,7 @@ from copy import deepcopy
 from unittest.mock import patch
 
 from mephisto.client.cli import FORM_COMPOSER__DATA_CONFIG_NAME
+from mephisto.client.cli import FORM_COMPOSER__DATA_JSONL_CONFIG_NAME
 from mephisto.client.cli import FORM_COMPOSER__FORM_CONFIG_NAME
 from mephisto.client.cli import FORM_COMPOSER__SEPARATE_TOKEN_VALUES_CONFIG_NAME
 from mephisto.client.cli import FORM_COMPOSER__TOKEN_SETS_VALUES_CONFIG_NAME
@@ -21,12 +22,18 @@ from mephisto.generators.form_composer.config_validation.task_data_config import
 from mephisto.generators.form_composer.config_validation.task_data_config import (
     _combine_extrapolated_form_configs,
 )
+from mephisto.generators.form_composer.config_validation.task_data_config import (
+    _compile_form_config_template,
+)
 from mephisto.generators.form_composer.config_validation.task_data_config import (
     _extrapolate_tokens_in_form_config,
 )
 from mephisto.generators.form_composer.config_validation.task_data_config import (
     _extrapolate_tokens_values,
 )
+from mephisto.generators.form_composer.config_validation.task_data_config import (
+    _render_form_config_template,
+)
 from mephisto.generators.form_composer.config_validation.task_data_config import (
     _set_tokens_in_form_config_item,
 )
@@ -45,6 +52,9 @@ from mephisto.generators.form_composer.config_validation.task_data_config import
 from mephisto.generators.form_composer.config_validation.task_data_config import (
     verify_form_composer_configs,
 )
+from mephisto.generators.form_composer.config_validation.utils import (
+    read_config_items_from_jsonl_file,
+)
 
 CORRECT_CONFIG_DATA_WITH_TOKENS = {
     "form": {
@@ -374,6 +384,57 @@ class TestTaskDataConfig(unittest.TestCase):
             },
         )
 
+    def test__render_form_config_template_success(self, *args, **kwargs):
+        config_data = deepcopy(CORRECT_CONFIG_DATA_WITH_TOKENS)
+        config_data["form"]["title"] = "{Form} {{ token_1 }} and {{token_2}} {{ token_1 }}"
+        config_data["form"]["submit_button"]["tooltip"] = 'With {{ getUrl("{a}") }}'
+        tokens_values = {
+            "token_1": "value 1",
+            "token_2": 2,
+            "token_3": "value {3}",
+            "token_4": "value 4",
+            "token_5": "value 5",
+            'getUrl("{a}")': "https://example.com/a",
+        }
+
+        template = _compile_form_config_template(config_data, tokens_values.keys())
+        result = _render_form_config_template(config_data, template, tokens_values)
+
+        self.assertEqual(
+            result,
+            _extrapolate_tokens_in_form_config(deepcopy(config_data), tokens_values),
+        )
+        self.assertEqual(result["form"]["title"], "{Form} value 1 and 2 value 1")
+        self.assertEqual(
+            result["form"]["sections"][0]["title"],
+            "Section title value {3}",
+        )
+
+    def test__render_form_config_template_shares_items_without_tokens(self, *args, **kwargs):
+        config_data = deepcopy(CORRECT_CONFIG_DATA_WITH_TOKENS)
+        row = config_data["form"]["sections"][0]["fieldsets"][0]["rows"][0]
+        row["fields"].append(
+            {
+                "help": "Field without tokens",
+                "id": "id_field_2",
+                "label": "Field label",
+                "name": "field_name_2",
+                "type": "input",
+                "value": "",
+            }
+        )
+        initial_config_data = deepcopy(config_data)
+        tokens_values = {f"token_{i}": f"value {i}" for i in [1, 2, 3, 4, 5]}
+
+        template = _compile_form_config_template(config_data, tokens_values.keys())
+        result = _render_form_config_template(config_data, template, tokens_values)
+
+        self.assertEqual(config_data, initial_config_data)
+        result_row = result["form"]["sections"][0]["fieldsets"][0]["rows"][0]
+        self.assertIsNot(result_row["fields"][0], row["fields"][0])
+        self.assertEqual(result_row["fields"][0]["help"], "Field help value 5")
+        self.assertIs(result_row["fields"][1], row["fields"][1])
+
     def test__validate_tokens_in_both_configs_success(self, *args, **kwargs):
         config_data = deepcopy(CORRECT_CONFIG_DATA_WITH_TOKENS)
         token_sets_values_config_data = [
@@ -660,6 +721,46 @@ class TestTaskDataConfig(unittest.TestCase):
             ],
         )
 
+    def test_create_extrapolated_config_jsonl_success(self, *args, **kwargs):
+        form_config_data = deepcopy(CORRECT_CONFIG_DATA_WITH_TOKENS)
+        token_sets_values_config_data = [
+            {
+                "tokens_values": {
+                    f"token_{i}": f"value {i} of set {token_set}" for i in [1, 2, 3, 4, 5]
+                },
+            }
+            for token_set in [1, 2]
+        ]
+
+        form_config_path = os.path.join(self.data_dir, FORM_COMPOSER__FORM_CONFIG_NAME)
+        token_sets_values_config_path = os.path.join(
+            self.data_dir,
+            FORM_COMPOSER__TOKEN_SETS_VALUES_CONFIG_NAME,
+        )
+        task_data_config_path = os.path.join(self.data_dir, FORM_COMPOSER__DATA_JSONL_CONFIG_NAME)
+
+        with open(form_config_path, "w") as f:
+            f.write(json.dumps(form_config_data))
+        with open(token_sets_values_config_path, "w") as f:
+            f.write(json.dumps(token_sets_values_config_data))
+
+        create_extrapolated_config(
+            form_config_path,
+            token_sets_values_config_path,
+            task_data_config_path,
+        )
+
+        task_config_data = list(read_config_items_from_jsonl_file(task_data_config_path))
+        self.assertEqual(
+            task_config_data,
+            _combine_extrapolated_form_configs(form_config_data, token_sets_values_config_data),
+        )
+        self.assertEqual(task_config_data[1]["form"]["title"], "Form title value 1 of set 2")
+        self.assertEqual(
+            validate_task_data_config(read_config_items_from_jsonl_file(task_data_config_path)),
+            (True, []),
+        )
+
     def test_validate_task_data_config_success(self, *args, **kwargs):
         task_config_data = [deepcopy(CORRECT_CONFIG_DATA_WITH_TOKENS)]
 
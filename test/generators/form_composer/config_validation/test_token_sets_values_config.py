@@ -6,6 +6,9 @@ import unittest
 
 from mephisto.client.cli import FORM_COMPOSER__SEPARATE_TOKEN_VALUES_CONFIG_NAME
 from mephisto.client.cli import FORM_COMPOSER__TOKEN_SETS_VALUES_CONFIG_NAME
+from mephisto.generators.form_composer.config_validation.token_sets_values_config import (
+    _iter_premutated_separate_tokens,
+)
 from mephisto.generators.form_composer.config_validation.token_sets_values_config import (
     _premutate_separate_tokens,
 )
@@ -112,6 +115,17 @@ class TestTokenSetsValuesConfig(unittest.TestCase):
             ],
         )
 
+    def test__iter_premutated_separate_tokens_is_lazy(self, *args, **kwargs):
+        # A billion permutations, only the first ones are generated
+        config_data = {f"token {i}": [f"value {v}" for v in range(10)] for i in range(9)}
+        result = _iter_premutated_separate_tokens(config_data)
+
+        self.assertEqual(
+            next(result)["tokens_values"],
+            {f"token {i}": "value 0" for i in range(9)},
+        )
+        self.assertEqual(next(result)["tokens_values"]["token 8"], "value 1")
+
     def test_update_token_sets_values_config_with_premutated_data_error(self, *args, **kwargs):
         separate_token_values_config_path = os.path.join(
             self.data_dir,
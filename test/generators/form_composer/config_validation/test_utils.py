@@ -19,6 +19,10 @@ from mephisto.generators.form_composer.config_validation.utils import get_s3_pre
 from mephisto.generators.form_composer.config_validation.utils import is_s3_url
 from mephisto.generators.form_composer.config_validation.utils import make_error_message
 from mephisto.generators.form_composer.config_validation.utils import read_config_file
+from mephisto.generators.form_composer.config_validation.utils import (
+    read_config_items_from_jsonl_file,
+)
+from mephisto.generators.form_composer.config_validation.utils import write_config_items_to_file
 from mephisto.generators.form_composer.config_validation.utils import write_config_to_file
 from mephisto.generators.form_composer.constants import CONTENTTYPE_BY_EXTENSION
 
@@ -64,6 +68,28 @@ class TestUtils(unittest.TestCase):
 
         self.assertEqual(config_data, expected_data)
 
+    def test_write_config_items_to_file_success(self, *args, **kwargs):
+        for expected_data in [[], [{"test": "value"}, {"test": {"nested": ["value\n"]}}]]:
+            config_path = os.path.join(self.data_dir, "test.json")
+            write_config_items_to_file(iter(expected_data), config_path)
+            expected_config_path = os.path.join(self.data_dir, "expected.json")
+            write_config_to_file(expected_data, expected_config_path)
+
+            with open(config_path) as f, open(expected_config_path) as expected_f:
+                self.assertEqual(f.read(), expected_f.read())
+
+    def test_write_config_items_to_jsonl_file_success(self, *args, **kwargs):
+        expected_data = [{"test": "value 1"}, {"test": "value 2"}]
+
+        config_path = os.path.join(self.data_dir, "test.jsonl")
+        write_config_items_to_file(iter(expected_data), config_path)
+
+        with open(config_path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        result = read_config_items_from_jsonl_file(config_path)
+        self.assertEqual(next(result), expected_data[0])
+        self.assertEqual(list(result), expected_data[1:])
+
     def test_read_config_file_non_existent_config_path_without_exit(self, *args, **kwargs):
         non_existent_config_path = os.path.join(self.data_dir, "test.json")
         result = read_config_file(non_existent_config_path, exit_if_no_file=False)
@@ -1,14 +1,33 @@
+import threading
+import time
 import unittest
 from unittest.mock import patch
 from urllib.parse import quote
+from urllib.parse import urlparse
+
+from prometheus_client import REGISTRY  # type: ignore
 
 from mephisto.generators.form_composer.constants import CONTENTTYPE_BY_EXTENSION
 from mephisto.generators.form_composer.remote_procedures import _get_multiple_presigned_urls
 from mephisto.generators.form_composer.remote_procedures import _get_presigned_url
 from mephisto.generators.form_composer.remote_procedures import _get_presigned_url_for_thread
+from mephisto.generators.form_composer.remote_procedures import presigned_url_service
+from mephisto.generators.form_composer.remote_procedures import PresignedUrlService
+
+try:
+    import boto3
+    from botocore.config import Config
+    from moto import mock_aws  # type: ignore
+
+    MOTO_INSTALLED = True
+except ImportError:
+    MOTO_INSTALLED = False
 
 
 class TestRemoteProcedures(unittest.TestCase):
+    def setUp(self):
+        presigned_url_service.clear()
+
     @patch("botocore.signers.RequestSigner.generate_presigned_url")
     def test__get_presigned_url_success(self, mock_generate_presigned_url, *args, **kwargs):
         presigned_url_expected = "presigned_url"
@@ -143,3 +162,108 @@ class TestRemoteProcedures(unittest.TestCase):
         result = _get_multiple_presigned_urls("random-string", [test_url], None)
 
         self.assertEqual(result, [(test_url, presigned_url_expected)])
+
+    @patch("mephisto.generators.form_composer.remote_procedures.get_s3_presigned_url")
+    def test__get_multiple_presigned_urls_cached(
+        self,
+        mock_get_s3_presigned_url,
+        *args,
+        **kwargs,
+    ):
+        test_urls = [
+            "https://test-bucket-private.s3.amazonaws.com/path/image.png",
+            "https://test-bucket-private.s3.amazonaws.com/path/video.mp4",
+        ]
+
+        mock_get_s3_presigned_url.side_effect = lambda url, expires_in_mins: f"{url}?signed"
+
+        for _ in range(3):
+            result = _get_multiple_presigned_urls("random-string", test_urls, None)
+            self.assertEqual(result, [(url, f"{url}?signed") for url in test_urls])
+        self.assertEqual(_get_presigned_url("random-string", test_urls[0], None), result[0][1])
+
+        self.assertEqual(mock_get_s3_presigned_url.call_count, 2)
+
+
+class TestPresignedUrlService(unittest.TestCase):
+    def setUp(self):
+        self.service = PresignedUrlService(max_workers=4, max_size=2, expires_in_mins=60)
+        self.addCleanup(self.service.shutdown)
+
+    def get_cache_events(self, event: str) -> float:
+        value = REGISTRY.get_sample_value(
+            "form_composer_presigned_url_cache_events_total", {"event": event}
+        )
+        return value or 0
+
+    @patch("mephisto.generators.form_composer.remote_procedures.get_s3_presigned_url")
+    def test_cache_expiration_and_size(self, mock_get_s3_presigned_url, *args, **kwargs):
+        """Ensure URLs are presigned again when close to expiring, or evicted"""
+        test_urls = [f"https://test-bucket.s3.amazonaws.com/image_{i}.png" for i in range(3)]
+        mock_get_s3_presigned_url.side_effect = lambda url, expires_in_mins: f"{url}?signed"
+        hits_before = self.get_cache_events("hit")
+        misses_before = self.get_cache_events("miss")
+        evictions_before = self.get_cache_events("eviction")
+
+        for url in test_urls:
+            self.assertEqual(self.service.get(url), (url, f"{url}?signed", None))
+        # The least recently used URL was evicted
+        self.service.get(test_urls[0])
+        self.service.get(test_urls[2])
+        self.assertEqual(mock_get_s3_presigned_url.call_count, 4)
+        self.assertEqual(self.get_cache_events("hit") - hits_before, 1)
+        self.assertEqual(self.get_cache_events("miss") - misses_before, 4)
+        self.assertEqual(self.get_cache_events("eviction") - evictions_before, 2)
+
+        # Presigned URLs expire after an hour, less the safety margin
+        with patch("time.monotonic", return_value=time.monotonic() + 54 * 60):
+            self.service.get(test_urls[2])
+        self.assertEqual(mock_get_s3_presigned_url.call_count, 4)
+        with patch("time.monotonic", return_value=time.monotonic() + 56 * 60):
+            self.service.get(test_urls[2])
+        self.assertEqual(mock_get_s3_presigned_url.call_count, 5)
+
+    @patch("mephisto.generators.form_composer.remote_procedures.get_s3_presigned_url")
+    def test_concurrent_requests_presign_once(self, mock_get_s3_presigned_url, *args, **kwargs):
+        """Ensure requests for a URL being presigned share its result, and errors aren't kept"""
+        test_url = "https://test-bucket.s3.amazonaws.com/image.png"
+        release = threading.Event()
+
+        def presign(url, expires_in_mins):
+            release.wait(5)
+            raise Exception("Error")
+
+        mock_get_s3_presigned_url.side_effect = presign
+        futures = [self.service.submit(test_url) for _ in range(5)]
+        release.set()
+        self.assertEqual(
+            [f.result() for f in futures],
+            [(test_url, None, "Error")] * 5,
+        )
+        self.assertEqual(mock_get_s3_presigned_url.call_count, 1)
+
+        mock_get_s3_presigned_url.side_effect = None
+        mock_get_s3_presigned_url.return_value = "presigned_url"
+        self.assertEqual(self.service.get(test_url), (test_url, "presigned_url", None))
+        self.assertEqual(mock_get_s3_presigned_url.call_count, 2)
+
+    @unittest.skipIf(not MOTO_INSTALLED, "moto is not installed")
+    def test_presign_with_local_s3(self, *args, **kwargs):
+        """Ensure URLs presigned against a local S3 stand-in are reused"""
+        with mock_aws():
+            s3_client = boto3.client(
+                "s3", region_name="us-east-1", config=Config(signature_version="s3v4")
+            )
+            s3_client.create_bucket(Bucket="test-bucket-private")
+            s3_client.put_object(Bucket="test-bucket-private", Key="path/image.png", Body=b"")
+            test_url = "https://test-bucket-private.s3.amazonaws.com/path/image.png"
+
+            with patch(
+                "mephisto.generators.form_composer.config_validation.utils.s3_client",
+                s3_client,
+            ):
+                url, presigned_url, error = self.service.get(test_url)
+                self.assertIsNone(error)
+                self.assertTrue(urlparse(presigned_url).path.endswith("/path/image.png"))
+                self.assertIn("X-Amz-Expires=3600", presigned_url)
+                self.assertEqual(self.service.get(test_url), (url, presigned_url, None))
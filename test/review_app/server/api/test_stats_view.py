@@ -5,6 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 import unittest
+from unittest.mock import patch
 
 from flask import url_for
 
@@ -47,6 +48,40 @@ class TestStatsView(BaseTestApiViewCase):
             },
         )
 
+    def test_stats_cached_until_review_changes(self, *args, **kwargs):
+        get_test_task_run(self.db)
+        _, worker_id = get_test_worker(self.db)
+        unit_ids = [make_completed_unit(self.db) for _ in range(3)]
+        for unit_id in unit_ids:
+            Unit.get(self.db, unit_id).set_db_status(AssignmentState.COMPLETED)
+        task_id = Unit.get(self.db, unit_ids[0]).task_id
+        self.db.new_unit_review(unit_ids[0], task_id, worker_id, AgentState.STATUS_APPROVED)
+
+        stats = self.db.get_unit_review_stats(task_id=task_id)
+        self.assertEqual(stats["total_count"], 3)
+        self.assertEqual(stats["approved_count"], 1)
+        self.assertEqual(self.db.get_unit_review_stats(task_id=task_id, limit=2)["total_count"], 2)
+
+        with patch.object(self.db, "_get_connection", wraps=self.db._get_connection) as get_conn:
+            self.assertEqual(self.db.get_unit_review_stats(task_id=task_id), stats)
+            self.assertEqual(get_conn.call_count, 0, "Unchanged stats were queried again")
+
+        self.db.new_unit_review(unit_ids[1], task_id, worker_id, AgentState.STATUS_REJECTED)
+        self.db.new_unit_review(unit_ids[2], task_id, worker_id, AgentState.STATUS_SOFT_REJECTED)
+        self.assertEqual(
+            self.db.get_unit_review_stats(task_id=task_id),
+            {
+                "approved_count": 1,
+                "rejected_count": 1,
+                "reviewed_count": 3,
+                "soft_rejected_count": 1,
+                "total_count": 3,
+            },
+        )
+
+        Unit.get(self.db, unit_ids[2]).set_db_status(AssignmentState.LAUNCHED)
+        self.assertEqual(self.db.get_unit_review_stats(task_id=task_id)["total_count"], 2)
+
 
 if __name__ == "__main__":
     unittest.main()
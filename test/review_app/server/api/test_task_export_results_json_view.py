@@ -4,13 +4,14 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import json
 import unittest
 from unittest.mock import patch
 
 from flask import url_for
 
 from mephisto.abstractions.providers.prolific.api import status
-from mephisto.review_app.server.api.views.task_export_results_view import get_result_file_path
+from mephisto.review_app.server.results_export import get_results_file_path
 from test.review_app.server.api.base_test_api_view_case import BaseTestApiViewCase
 
 
@@ -21,19 +22,22 @@ class TestTaskExportResultsJsonView(BaseTestApiViewCase):
         task_id = 1
         n_units = 1
 
-        results_file_data = "Test JS"
+        units_results = [{"unit_id": "1", "data": {"text": "Test"}}, {"unit_id": "2"}]
 
-        results_file_path = get_result_file_path(self.data_dir, task_id, n_units)
-        f = open(results_file_path, "w")
-        f.write(results_file_data)
-        f.close()
+        results_file_path = get_results_file_path(self.data_dir, task_id, "jsonl")
+        with open(results_file_path, "w") as f:
+            for unit_results in units_results:
+                f.write(json.dumps(unit_results) + "\n")
 
         with self.app_context:
             url = url_for("task_export_results_json", task_id=task_id, n_units=n_units)
             response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, results_file_data.encode())
+        self.assertEqual(
+            json.loads(response.data),
+            {unit_results["unit_id"]: unit_results for unit_results in units_results},
+        )
         self.assertEqual(response.mimetype, "application/json")
 
     def test_task_export_result_json_not_found_error(self, *args, **kwargs):
@@ -42,7 +46,7 @@ class TestTaskExportResultsJsonView(BaseTestApiViewCase):
             response1 = self.client.get(url)
 
         with self.app_context:
-            url = url_for("task_export_results_json", task_id=1, n_units=99)
+            url = url_for("task_export_results_file", task_id=1, results_format="parquet")
             response2 = self.client.get(url)
 
         self.assertEqual(response1.status_code, status.HTTP_404_NOT_FOUND)
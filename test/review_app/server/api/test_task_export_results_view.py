@@ -4,15 +4,18 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import json
+import time
 import unittest
 from unittest.mock import patch
 
 from flask import url_for
 
 from mephisto.abstractions.providers.prolific.api import status
-from mephisto.review_app.server.api.views.task_export_results_view import get_result_file_path
 from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.unit import Unit
+from mephisto.review_app.server.results_export import get_results_file_path
+from mephisto.review_app.server.results_export import read_results
 from mephisto.utils.testing import get_test_qualification
 from mephisto.utils.testing import get_test_unit
 from mephisto.utils.testing import get_test_worker
@@ -20,6 +23,15 @@ from test.review_app.server.api.base_test_api_view_case import BaseTestApiViewCa
 
 
 class TestTaskExportResultsView(BaseTestApiViewCase):
+    def wait_for_export(self, task_id: str) -> dict:
+        url = url_for("task_export_results_progress", task_id=task_id)
+        for _ in range(100):
+            progress = self.client.get(url).json["progress"]
+            if progress["status"] != "running":
+                return progress
+            time.sleep(0.1)
+        self.fail("Results export did not finish")
+
     @patch("mephisto.review_app.server.api.views.task_export_results_view.get_results_dir")
     def test_task_export_result_success(self, mock_get_results_dir, *args, **kwargs):
         mock_get_results_dir.return_value = self.data_dir
@@ -39,21 +51,51 @@ class TestTaskExportResultsView(BaseTestApiViewCase):
         self.db.new_unit_review(unit_id, unit.task_id, worker_id, unit.db_status)
         self.db.update_unit_review(unit_id, qualification_id, worker_id)
 
-        results_file_data = "Test JS"
-
-        results_file_path = get_result_file_path(self.data_dir, unit.task_id, 1)
-        f = open(results_file_path, "w")
-        f.write(results_file_data)
-        f.close()
-
         with self.app_context:
             url = url_for("task_export_results", task_id=unit.task_id)
             response = self.client.get(url)
             result = response.json
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(result, {"file_created": True})
         self.assertEqual(response.mimetype, "application/json")
+        self.assertTrue("file_created" in result)
+        self.assertTrue("progress" in result)
+
+        progress = self.wait_for_export(unit.task_id)
+        self.assertEqual(
+            progress,
+            {"status": "finished", "exported_count": 1, "total_count": 1, "error": None},
+        )
+        results_file_path = get_results_file_path(self.data_dir, unit.task_id, "jsonl")
+        self.assertEqual([r["unit_id"] for r in read_results(results_file_path)], [unit_id])
+
+    @patch("mephisto.review_app.server.api.views.task_export_results_view.get_results_dir")
+    def test_task_export_result_resumes(self, mock_get_results_dir, *args, **kwargs):
+        mock_get_results_dir.return_value = self.data_dir
+
+        unit_id = get_test_unit(self.db)
+        unit: Unit = Unit.get(self.db, unit_id)
+        unit.set_db_status(AssignmentState.ACCEPTED)
+
+        # A previous export of the unit that was interrupted halfway through a line
+        results_file_path = get_results_file_path(self.data_dir, unit.task_id, "jsonl")
+        with open(results_file_path, "w") as f:
+            f.write(json.dumps({"unit_id": "999"}) + "\n" + '{"unit_id": ')
+
+        with self.app_context:
+            url = url_for("task_export_results", task_id=unit.task_id)
+            self.client.get(url)
+            self.assertEqual(self.wait_for_export(unit.task_id)["exported_count"], 1)
+
+            # Units that were already exported are skipped
+            with patch.object(Unit, "get", side_effect=AssertionError("Unit exported again")):
+                self.client.get(url)
+                self.assertEqual(self.wait_for_export(unit.task_id)["status"], "finished")
+
+        self.assertEqual(
+            [r["unit_id"] for r in read_results(results_file_path)],
+            ["999", unit_id],
+        )
 
     def test_task_export_result_not_found_error(self, *args, **kwargs):
         with self.app_context:
@@ -9,6 +9,7 @@ import unittest
 from flask import url_for
 
 from mephisto.abstractions.providers.prolific.api import status
+from mephisto.data_model.unit import Unit
 from mephisto.utils.testing import get_test_unit
 from test.review_app.server.api.base_test_api_view_case import BaseTestApiViewCase
 
@@ -60,11 +61,44 @@ class TestUnitsDetailsView(BaseTestApiViewCase):
             "inputs",
             "outputs",
             "prepared_inputs",
+            "task_end",
+            "task_start",
             "unit_data_folder",
         ]
         for unit_field in unit_fields:
             self.assertTrue(unit_field in first_unit)
 
+    def test_units_pagination_success(self, *args, **kwargs):
+        unit_1_id = get_test_unit(self.db)
+        unit_1: Unit = Unit.get(self.db, unit_1_id)
+        unit_2_id = self.db.new_unit(
+            unit_1.task_id,
+            unit_1.task_run_id,
+            unit_1.requester_id,
+            unit_1.assignment_id,
+            2,
+            1,
+            unit_1.provider_type,
+            unit_1.task_type,
+        )
+
+        with self.app_context:
+            url = url_for("units_details") + f"?unit_ids={unit_1_id},{unit_2_id}&limit=1"
+            first_page = self.client.get(url).json
+            url += f"&after_id={first_page['next_after_id']}"
+            second_page = self.client.get(url).json
+
+        self.assertEqual([u["id"] for u in first_page["units"]], [int(unit_1_id)])
+        self.assertEqual([u["id"] for u in second_page["units"]], [int(unit_2_id)])
+        self.assertEqual(second_page["next_after_id"], int(unit_2_id))
+
+        with self.app_context:
+            url = url_for("units_details") + f"?unit_ids={unit_1_id},{unit_2_id}"
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.json["units"]), 2)
+        self.assertIsNone(response.json["next_after_id"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -130,6 +130,52 @@ class TestUnitsView(BaseTestApiViewCase):
         self.assertEqual(first_response_unit["id"], int(unit_1_id))
         self.assertEqual(second_response_unit["id"], int(unit_2_id))
 
+    def test_units_pagination_success(self, *args, **kwargs):
+        # Create 3 COMPLETED units and 1 LAUNCHED unit
+        unit_1_id = get_test_unit(self.db)
+        unit_1: Unit = Unit.get(self.db, unit_1_id)
+        unit_ids = [unit_1_id]
+        for unit_index in range(1, 4):
+            unit_ids.append(
+                self.db.new_unit(
+                    unit_1.task_id,
+                    unit_1.task_run_id,
+                    unit_1.requester_id,
+                    unit_1.assignment_id,
+                    unit_index,
+                    1,
+                    unit_1.provider_type,
+                    unit_1.task_type,
+                )
+            )
+        for unit_id in unit_ids[:3]:
+            Unit.get(self.db, unit_id).set_db_status(AssignmentState.COMPLETED)
+
+        pages = []
+        after_id = None
+        with self.app_context:
+            while True:
+                url = url_for("units") + f"?task_id={unit_1.task_id}&limit=2"
+                if after_id:
+                    url += f"&after_id={after_id}"
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                pages.append([u["id"] for u in response.json["units"]])
+                after_id = response.json["next_after_id"]
+                if after_id is None:
+                    break
+
+        self.assertEqual(pages, [[int(unit_ids[0]), int(unit_ids[1])], [int(unit_ids[2])]])
+
+    def test_units_pagination_arguments_error(self, *args, **kwargs):
+        with self.app_context:
+            url = url_for("units") + "?task_id=1&limit=wrong"
+            response = self.client.get(url)
+            result = response.json
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(result["error"], "`limit` must be an integer.")
+
 
 if __name__ == "__main__":
     unittest.main()
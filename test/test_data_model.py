@@ -5,6 +5,17 @@
 # LICENSE file in the root directory of this source tree.
 
 from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.abstractions.blueprint import AgentState
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.agent import Agent
+from mephisto.data_model.exceptions import AgentDisconnectedError
+from mephisto.utils.testing import get_test_agent
+from unittest.mock import patch
+import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 
 
@@ -40,5 +51,66 @@ class TestDataModel(unittest.TestCase):
                 )
 
 
+class TestAgentWaits(unittest.TestCase):
+    """
+    Unit testing for threads waiting on an Agent
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+        self.agent_id = get_test_agent(self.db)
+        self.agent = Agent.get(self.db, self.agent_id)
+        self.agent.update_status(AgentState.STATUS_IN_TASK)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def run_in_thread(self, target):
+        """Run the target in a thread, returning the thread and a dict for its outcome"""
+        outcome = {}
+
+        def run_target():
+            try:
+                outcome["result"] = target()
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run_target)
+        thread.start()
+        return thread, outcome
+
+    def test_idle_wait_reads_no_statuses(self):
+        """Ensure waiting for a live update doesn't read the status from the db"""
+        with patch.object(self.db, "get_agent", wraps=self.db.get_agent) as get_agent:
+            thread, outcome = self.run_in_thread(lambda: self.agent.get_live_update(timeout=10))
+            time.sleep(0.5)
+            self.assertTrue(thread.is_alive())
+            self.agent.handle_live_update({"text": "hello"})
+            thread.join(timeout=5)
+
+            self.assertEqual(outcome, {"result": {"text": "hello"}})
+            self.assertEqual(get_agent.call_count, 0, "Waiting read the agent status")
+
+    def test_status_change_wakes_wait(self):
+        """Ensure a disconnect through another object for the agent ends a wait"""
+        other_agent = Agent.get(self.db, self.agent_id)
+        self.assertIsNot(other_agent, self.agent)
+
+        with patch.object(self.db, "get_agent", wraps=self.db.get_agent) as get_agent:
+            start_time = time.time()
+            thread, outcome = self.run_in_thread(lambda: self.agent.await_submit(timeout=10))
+            time.sleep(0.5)
+            self.assertTrue(thread.is_alive())
+            other_agent.update_status(AgentState.STATUS_DISCONNECT)
+            thread.join(timeout=5)
+
+            self.assertLess(time.time() - start_time, 5)
+            self.assertIsInstance(outcome.get("error"), AgentDisconnectedError)
+            self.assertEqual(self.agent.db_status, AgentState.STATUS_DISCONNECT)
+            self.assertEqual(get_agent.call_count, 0, "Waiting read the agent status")
+
+
 if __name__ == "__main__":
     unittest.main()
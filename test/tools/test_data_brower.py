@@ -5,6 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 import unittest
+import unittest.mock
 import shutil
 import os
 import tempfile
@@ -13,9 +14,21 @@ import pytest
 
 
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
-from mephisto.tools.data_browser import DataBrowser
+from mephisto.tools.data_browser import DataBrowser, PANDAS_INSTALLED, UNIT_RECORD_COLUMNS
+from mephisto.abstractions._subcomponents.agent_state import AgentState
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
 from mephisto.data_model.worker import Worker
 from mephisto.utils.qualifications import find_or_create_qualification
+from mephisto.utils.testing import get_test_task_run, get_test_worker, make_completed_unit
+
+try:
+    import pyarrow  # type: ignore
+
+    PYARROW_INSTALLED = True
+except ImportError:
+    PYARROW_INSTALLED = False
 
 
 class TestMTurkComponents(unittest.TestCase):
@@ -81,6 +94,63 @@ class TestMTurkComponents(unittest.TestCase):
         )
         self.assertNotIn(worker_2.db_id, qualified_ids, "Worker 2 should not be in qualified list")
 
+    def make_completed_units(self, num_units: int) -> TaskRun:
+        task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        get_test_worker(self.db)
+        for _ in range(num_units):
+            unit = Unit.get(self.db, make_completed_unit(self.db))
+            unit.get_assigned_agent().update_status(AgentState.STATUS_COMPLETED)
+            unit.set_db_status(AssignmentState.COMPLETED)
+        return task_run
+
+    def test_unit_records_match_unit_data(self) -> None:
+        """Ensure the bulk unit records hold the same data as loading every unit"""
+        task_run = self.make_completed_units(3)
+        data_browser = DataBrowser(self.db)
+
+        records = data_browser.get_unit_records_for_task_runs([task_run])
+
+        units = data_browser.get_units_for_run_id(task_run.db_id)
+        self.assertEqual(len(records), 3)
+        self.assertEqual([r["unit_id"] for r in records], sorted(u.db_id for u in units))
+        for record, unit in zip(records, sorted(units, key=lambda u: int(u.db_id))):
+            self.assertEqual(list(record.keys()), UNIT_RECORD_COLUMNS)
+            self.assertEqual(record["unit_status"], unit.db_status)
+            self.assertEqual(
+                record["worker_name"], unit.get_assigned_agent().get_worker().worker_name
+            )
+            unit_data = data_browser.get_data_from_unit(unit)
+            for key, value in unit_data.items():
+                self.assertEqual(record[key], value, f"Unit record has a different {key}")
+
+        self.assertEqual(data_browser.get_unit_records_for_task_runs([task_run], ["expired"]), [])
+
+    @pytest.mark.skipif(
+        not (PANDAS_INSTALLED and PYARROW_INSTALLED), reason="Requires pandas and pyarrow"
+    )
+    def test_units_table_cache(self) -> None:
+        """Ensure cached unit tables are used until a unit changes"""
+        task_run = self.make_completed_units(2)
+        data_browser = DataBrowser(self.db)
+        cache_dir = os.path.join(self.data_dir, "cache")
+
+        table = data_browser.get_units_table_for_task_runs([task_run], cache_dir=cache_dir)
+        self.assertEqual(list(table.columns), UNIT_RECORD_COLUMNS)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        with unittest.mock.patch.object(
+            data_browser, "_get_agent_data", side_effect=AssertionError("Cache not used")
+        ):
+            cached_table = data_browser.get_units_table_for_task_runs(
+                [task_run], cache_dir=cache_dir
+            )
+        self.assertEqual(cached_table.to_dict("records"), table.to_dict("records"))
+
+        Unit.get(self.db, table["unit_id"][0]).set_db_status("accepted")
+        updated_table = data_browser.get_units_table_for_task_runs([task_run], cache_dir=cache_dir)
+        self.assertEqual(list(updated_table["unit_status"]), ["accepted", table["unit_status"][1]])
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
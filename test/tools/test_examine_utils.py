@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mephisto.abstractions._subcomponents.agent_state import AgentState
+from mephisto.abstractions.database import MephistoDB
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.unit import Unit
+from mephisto.tools.examine_utils import format_worker_stats
+from mephisto.tools.examine_utils import get_worker_stats
+from mephisto.tools.examine_utils import get_worker_stats_from_db
+from mephisto.tools.examine_utils import refresh_unit_statuses
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_worker
+from mephisto.utils.testing import make_completed_unit
+
+
+class TestExamineUtils(unittest.TestCase):
+    """
+    Unit testing for the worker stats used when reviewing work
+    """
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path)
+
+    def tearDown(self) -> None:
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def make_units(self, agent_statuses):
+        task_run_id = get_test_task_run(self.db)
+        _, worker_id = get_test_worker(self.db)
+        units = []
+        for agent_status in agent_statuses:
+            unit = Unit.get(self.db, make_completed_unit(self.db))
+            unit.get_assigned_agent().update_status(agent_status)
+            units.append(unit)
+        return task_run_id, worker_id, units
+
+    def test_worker_stats_from_db(self) -> None:
+        """Ensure the grouped database counts match counting every unit"""
+        _, worker_id, units = self.make_units(
+            [
+                AgentState.STATUS_APPROVED,
+                AgentState.STATUS_APPROVED,
+                AgentState.STATUS_SOFT_REJECTED,
+                AgentState.STATUS_REJECTED,
+                AgentState.STATUS_COMPLETED,
+            ]
+        )
+        refresh_unit_statuses(units)
+        self.assertEqual(
+            [u.db_status for u in units],
+            [
+                AssignmentState.ACCEPTED,
+                AssignmentState.ACCEPTED,
+                AssignmentState.SOFT_REJECTED,
+                AssignmentState.REJECTED,
+                AssignmentState.COMPLETED,
+            ],
+        )
+
+        stats = get_worker_stats_from_db(self.db)
+        self.assertEqual(stats, {worker_id: {"accepted": 2, "soft_rejected": 1, "rejected": 1}})
+        self.assertEqual(stats, get_worker_stats_from_db(self.db, [units[0].task_id]))
+        self.assertEqual(get_worker_stats_from_db(self.db, []), {})
+        self.assertEqual(
+            format_worker_stats(worker_id, stats),
+            format_worker_stats(worker_id, get_worker_stats(units)),
+        )
+        self.assertEqual(format_worker_stats(worker_id, stats), "(2 | 2(1) / 4)")
+
+        # The generic implementation agrees with the grouped query
+        self.assertEqual(
+            MephistoDB._get_unit_counts_by_worker(self.db),
+            self.db.get_unit_counts_by_worker(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()